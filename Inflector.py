@@ -6,6 +6,7 @@
 # See the end of this file for the free software, open source license (BSD-style).
 
 import re
+from rules.lexicon import Lexicon
 from Rules.English import English
 from Rules.Spanish import Spanish
 
@@ -17,21 +18,43 @@ class Inflector :
     based on naming conventions like on Ruby on Rails.
     """
     
-    def __init__( self, Inflector = English ) :
+    def __init__( self, Inflector = English, lexicon = None ) :
+        '''lexicon is a Lexicon, or the name of a file written by
+        rules/lexicon.py, holding precomputed plurals and singulars to
+        look words up in before running the rules of Inflector. It must
+        have been built for Inflector, or ValueError is raised.'''
         assert callable(Inflector), "Inflector should be a callable obj"
         self.Inflector = apply(Inflector);
+        if lexicon is not None and not isinstance(lexicon, Lexicon) :
+            lexicon = Lexicon(lexicon)
+        if lexicon is not None :
+            lexicon.check(self.Inflector.__class__)
+        self.lexicon = lexicon
         
     def pluralize(self, word) :
         '''Pluralizes nouns.'''
+        if self.lexicon is not None :
+            plural = self.lexicon.pluralize(word)
+            if plural is not None :
+                return plural
         return self.Inflector.pluralize(word)
     
     def singularize(self, word) :
         '''Singularizes nouns.'''
+        if self.lexicon is not None :
+            singular = self.lexicon.singularize(word)
+            if singular is not None :
+                return singular
         return self.Inflector.singularize(word)
     
     def conditionalPlural(self, numer_of_records, word) :
         '''Returns the plural form of a word if first parameter is greater than 1'''
         return self.Inflector.conditionalPlural(numer_of_records, word)
+    
+    def conditionalPlural_batch(self, counts, words) :
+        '''conditionalPlural() of every count, pluralizing every distinct
+        word once.'''
+        return self.Inflector.conditionalPlural_batch(counts, words)
 
     def titleize(self, word, uppercase = '') :
         '''Converts an underscored or CamelCase word into a sentence.
@@ -55,6 +78,16 @@ class Inflector :
         This can be really useful for creating friendly URLs.'''
         return self.Inflector.underscore(word)
     
+    def camelize_unicode(self, word) :
+        '''camelize() keeping the letters of every script, with no
+        unaccent() first.'''
+        return self.Inflector.camelize_unicode(word)
+    
+    def underscore_unicode(self, word) :
+        '''underscore() splitting words in every script where their case
+        changes, so "\xdcberName" becomes "\xfcber_name".'''
+        return self.Inflector.underscore_unicode(word)
+    
     def humanize(self, word, uppercase = '') :
         '''Returns a human-readable string from word
         Returns a human-readable string from word, by replacing
@@ -72,6 +105,12 @@ class Inflector :
         "who's online" will be converted to "whoSOnline"'''
         return self.Inflector.variablize(word)
     
+    def pipeline(self, *steps) :
+        '''Returns a function running a word through steps, like
+        pipeline('underscore', 'pluralize') for table names, compiled
+        once; see rules/pipeline.py.'''
+        return self.Inflector.pipeline(*steps)
+    
     def tableize(self, class_name) :
         ''' Converts a class name to its table name according to rails
         naming conventions. Example. Converts "Person" to "people" '''
@@ -87,6 +126,11 @@ class Inflector :
         This method converts 13 to 13th, 2 to 2nd ...'''
         return self.Inflector.ordinalize(number)
     
+    def ordinalize_batch(self, numbers) :
+        '''ordinalize() of every integer of numbers, vectorized for NumPy
+        arrays.'''
+        return self.Inflector.ordinalize_batch(numbers)
+    
     
     def unaccent(self, text) :
         '''Transforms a string to its unaccented version. 
@@ -98,6 +142,16 @@ class Inflector :
         version ready to be inserted in friendly URLs'''
         return self.Inflector.urlize(text)
     
+    def urlize_stream(self, source, chunk_size = 65536) :
+        '''Yields urlize() of the text of source, a file like object or
+        an iterable of strings, in pieces, with bounded memory.'''
+        return self.Inflector.urlize_stream(source, chunk_size)
+    
+    def underscore_stream(self, source, chunk_size = 65536) :
+        '''Yields underscore() of the text of source in pieces, like
+        urlize_stream().'''
+        return self.Inflector.underscore_stream(source, chunk_size)
+    
     
     def demodulize(self, module_name) :
         return self.Inflector.demodulize(module_name)
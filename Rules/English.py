@@ -4,10 +4,187 @@
 # See the end of this file for the free software, open source license (BSD-style).
 
 import re
-#from Base import Base
-
-#class English (Base):
-class English(object):
+from rules.engine import compiled_rules, whole_words, CustomRules
+from Rules.Base import Base
+from rules.cache import compile_patterns, Lazy
+
+
+_ascii = re.compile('[\\x00-\\x7f]*\\Z').match
+_letters = re.compile('[a-z]+\\Z').match
+# Endings of the stems of regular verbs no verb ending in "e" has, so
+# "walk(ed)", "kiss(ed)" and "open(ing)" keep no "e" when the "e" row of
+# tense_skel_normal, right for "creat(ed)" or "chang(ed)", finds them.
+regular_stem_endings = ('ck', 'sh', 'ss', 'll', 'ff', 'dd', 'lk', 'rk', 'nk', 'sk', 'mp', 'sp', 'lp', 'lm',
+                        'nd', 'ld', 'rd', 'nt', 'lt', 'rt', 'ft', 'pt', 'ct', 'ght', 'rn', 'rm', 'wn',
+                        'tch', 'rch', 'nch', 'each', 'ix', 'ex', 'ay', 'oy', 'llow', 'how',
+                        'pen', 'ten', 'ken', 'ffer', 'ber', 'der', 'ger', 'ter', 'ther', 'wer',
+                        'ail', 'ain', 'air', 'ait', 'aim', 'eak', 'eal', 'ean', 'ear', 'ead', 'eam', 'eap',
+                        'eed', 'eel', 'eem', 'eep', 'eet', 'oad', 'oak', 'oat', 'oid', 'oil', 'oin',
+                        'ook', 'ool', 'oom', 'oop', 'oot', 'our', 'uit', 'ee', 'oe', 'ye')
+
+
+def tense_source(prefix, ending):
+    '''Returns the pattern of a tense_skel row for one tense. Its "(?i)"
+    flags are moved to the front, where they apply to the whole pattern as
+    they did from anywhere in it before Python 3.11 refused them.'''
+    source = prefix + ending + '$'
+    if '(?i)' in source:
+        return '(?i)' + source.replace('(?i)', '')
+    return source
+
+
+class TenseTable(object):
+    '''The rows of a tense_skel table, a prefix followed by the endings of
+    the present, past, perfect, singular and continuous tenses, with the
+    prefix and each ending compiled into a pattern anchored at the end.
+
+    find() gives the first row whose pattern for a tense matches a word,
+    from its start, or anywhere with search. Every tense has an inverse
+    index from the words a pattern matched from the start can match, when
+    they can be listed, to its row, so "went" or "brought" is found with
+    one lookup. The other rows are indexed by their ending, so only those
+    whose ending the word has, and those whose ending is not plain
+    letters, are tried. The candidates of the last max_tails word endings
+    are remembered.'''
+
+    max_tails = 4096
+
+    def __init__(self, rows, search = False):
+        self.rows = rows
+        self.search = search
+        self.regexes = []
+        self.words = []
+        self.endings = []
+        self.depth = 0
+        for tense in range(1, 6):
+            tensed = [index for index, row in enumerate(rows) if len(row) > tense]
+            sources = [tense_source(rows[index][0], rows[index][tense]) for index in tensed]
+            regexes = [None] * len(rows)
+            for index, regex in zip(tensed, compile_patterns(sources)):
+                regexes[index] = regex
+            words = {}
+            endings = {}
+            always = []
+            for index, source in zip(tensed, sources):
+                listed = None
+                if not search:
+                    listed = whole_words(source)
+                if listed is not None:
+                    ignore_case = source.startswith('(?i)')
+                    for word in listed:
+                        # Words of case sensitive patterns are kept to be
+                        # compared as they are.
+                        words.setdefault(word.lower(), []).append((index, not ignore_case and word or None))
+                    continue
+                # An ending of letters and "$" ends the same words as the
+                # letters alone.
+                ending = rows[index][tense].lower().rstrip('$')
+                if _letters(ending):
+                    endings.setdefault(ending, []).append(index)
+                    self.depth = max(self.depth, len(ending))
+                else:
+                    always.append(index)
+            lengths = sorted(set([len(ending) for ending in endings]))
+            self.regexes.append(regexes)
+            self.words.append(words)
+            self.endings.append((endings, lengths, always, tensed))
+        self.found = [{} for tense in range(5)]
+
+    def candidates(self, word, tense):
+        '''Returns the indexes of the rows not in the inverse index that can
+        match word for tense.'''
+        endings, lengths, always, tensed = self.endings[tense - 1]
+        if not endings:
+            return always
+        # They only depend on the last characters, and a final new line,
+        # which "$" also matches before.
+        tail = word[-self.depth - 1:]
+        found = self.found[tense - 1].get(tail)
+        if found is not None:
+            return found
+        if tail[-1:] == '\n':
+            tail = tail[:-1]
+        tail = tail[-self.depth:].lower()
+        if not _ascii(tail):
+            # Other characters may match an ASCII letter ignoring case.
+            found = tensed
+        else:
+            found = list(always)
+            for length in lengths:
+                if length > len(tail):
+                    break
+                found += endings.get(tail[len(tail) - length:], [])
+            found.sort()
+        if len(self.found[tense - 1]) >= self.max_tails:
+            self.found[tense - 1].clear()
+        self.found[tense - 1][word[-self.depth - 1:]] = found
+        return found
+
+    def find(self, word, tense, to):
+        '''Returns (row, regex, match) for the first row with an ending for
+        to whose pattern for tense matches word, or None.'''
+        rows = self.rows
+        regexes = self.regexes[tense - 1]
+        listed = None
+        if self.words[tense - 1]:
+            if word[-1:] == '\n' or not _ascii(word):
+                # Other characters may match an ASCII letter ignoring
+                # case, so every row is tried.
+                candidates = self.endings[tense - 1][3]
+            else:
+                for index, exact in self.words[tense - 1].get(word.lower(), ()):
+                    if len(rows[index]) > to and (exact is None or exact == word):
+                        listed = index
+                        break
+                candidates = self.candidates(word, tense)
+        else:
+            candidates = self.candidates(word, tense)
+        if listed is not None:
+            candidates = [index for index in candidates if index < listed] + [listed]
+        for index in candidates:
+            regex = regexes[index]
+            if len(rows[index]) <= to:
+                continue
+            if self.search:
+                match = regex.search(word)
+            else:
+                match = regex.match(word)
+            if match:
+                return rows[index], regex, match
+        return None
+
+    def substitute(self, word, found, groups, to):
+        '''Returns word with what the pattern found by find() matched
+        replaced by groups, a tuple of group numbers, and the ending for
+        to, as regex.sub would replace it.'''
+        row, regex, match = found
+        if word[-1:] == '\n':
+            # "$" matches before and after a final new line.
+            return regex.sub(''.join(['\\%d' % group for group in groups]) + row[to], word)
+        return word[:match.start()] + ''.join([match.group(group) or '' for group in groups]) + row[to] + word[match.end():]
+
+
+def compiled_tenses(skel, search = False):
+    '''Class attribute holding the TenseTable of the skel table; it is
+    compiled, or loaded from the on-disk cache, the first time a tense is
+    looked up.'''
+    return Lazy(lambda cls: TenseTable(getattr(cls, skel), search))
+
+
+def tense_words(skel):
+    '''Class attribute holding, for every column of the skel table, a
+    dict from each word in it to the first row it is found in.'''
+    def words(cls):
+        columns = []
+        for column in range(6):
+            found = {}
+            for row in getattr(cls, skel):
+                found.setdefault(row[column], row)
+            columns.append(found)
+        return columns
+    return Lazy(words)
+
+class English(CustomRules, Base):
     """
     Inflector for pluralize and singularize English nouns.
     
@@ -60,34 +237,66 @@ class English(object):
         'vespers',
         'wampum',
         ]
-        
-    inflector_rules = [
-        ['(.*)',                        'eau',          'eaux'],
-        ['(.*)',                        'menon',        'mena'],
-        ['(.*)',                        'terion',       'teria'],
-        ['((.*)m|[^b]l)',               'ouse',         'ice'],
-        ['((.*)[dlr])',                 'ix',           'ices'],
-        ['((.*)[dpt])',                 'ex',           'ices'],
-        ['((.*)ar|f|oo)',               'f',            'fs'],
-        ['(.*)',                        '[f|fe]',       'ves'],
-#        ['((.*)pian|sol|temp)',         'o',            'os'],
-        ['((.*)[aeioulnp])',            'o' ,           'os'],
-        ['((.*)[o|x|z|ch|ss|sh])',      '',             'es'],
-        ['(.*)',                        '-in-law' ,     's-in-law'],
-        ['(.*)',                        'ful',          'sful'],
-        ['(.*)',                        'is',           'es'],
-        ['((.*)d|[aeiouy]n|p|pl|r|s|t)','us',           'uses'],
-        ['((.*)bu)',                    's',            'ses'],
-        ['(.*)',                        'us',           'i'],
-        ['((.*)a|b|dumd|e|g|h|k|(d|l|p|s|sy)l|o|r|s)',  'um',   'ums'],
-        ['(.*)',                        'um',           'a'],
-        ['(.*[aeiou])'                  'a',            'as'],
-        ['(.*)',                        'a' ,           'ae'],
-        ['((.*)[^aeiouy]|qu)',          'y',            'ies'],
-        ['(.*)',                        's',            'ses'],
-        ['(.*)',                        '',             's']
-    ]
-    to_plural_compiled= [re.compile('(?i)'+r[0]+r[1]+'$') for r in inflector_rules]
+
+    plural_rules = (
+        ('(?i)^(.*)eau$',                                      '\\1eaux'),
+        ('(?i)^(.*)menon$',                                    '\\1mena'),
+        ('(?i)^(.*)terion$',                                   '\\1teria'),
+        ('(?i)^((.*)m|[^b]l)ouse$',                            '\\1ice'),
+        ('(?i)^((.*)[dlr])ix$',                                '\\1ices'),
+        ('(?i)^((.*)[dpt])ex$',                                '\\1ices'),
+        ('(?i)^((.*)ar|f|oo)f$',                               '\\1fs'),
+        ('(?i)^(.*)[f|fe]$',                                   '\\1ves'),
+#       ('(?i)^((.*)pian|sol|temp)o$',                         '\\1os'),
+        ('(?i)^((.*)[aeioulnp])o$',                            '\\1os'),
+        ('(?i)^((.*)[o|x|z|ch|ss|sh])$',                       '\\1es'),
+        ('(?i)^(.*)-in-law$',                                  '\\1s-in-law'),
+        ('(?i)^(.*)ful$',                                      '\\1sful'),
+        ('(?i)^(.*)is$',                                       '\\1es'),
+        ('(?i)^((.*)d|[aeiouy]n|p|pl|r|s|t)us$',               '\\1uses'),
+        ('(?i)^((.*)bu)s$',                                    '\\1ses'),
+        ('(?i)^(.*)us$',                                       '\\1i'),
+        ('(?i)^((.*)a|b|dumd|e|g|h|k|(d|l|p|s|sy)l|o|r|s)um$', '\\1ums'),
+        ('(?i)^(.*)um$',                                       '\\1a'),
+        # written as ['(.*[aeiou])' 'a', 'as'], the missing comma makes it match "aas"
+        ('(?i)^(.*[aeiou])aas$',                               '\\1as'),
+        ('(?i)^(.*)a$',                                        '\\1ae'),
+        ('(?i)^((.*)[^aeiouy]|qu)y$',                          '\\1ies'),
+        ('(?i)^(.*)s$',                                        '\\1ses'),
+        ('(?i)^(.*)$',                                         '\\1s'),
+    )
+
+    plural_uncountable_words = uncountable_words
+    plural_irregular_words = irregular_words
+    plural_exact_words = reserve_words
+
+    singular_rules = (
+        ('(?i)eaux$' , 'eau'),
+        ('(?i)mena$' , 'menon'),
+        ('(?i)teria$' , 'terion'),
+        ('(?i)([m|l])ice$' , '\\1ouse'),
+        ('(?i)ices$' , '|ix|ex'),
+        ('(?i)ves$' , '|f|fe'),
+        ('(?i)os$' , 'o'),
+        ('(?i)(o|x|z|ch|ss|sh)es$' , '\\1'),
+        ('(?i)s-in-law$' , '-in-law'),
+        ('(?i)sful$' , 'ful'),
+        ('(?i)(d|(a|e|i|o|u)n|p|pl|r|s|t)uses$' , '\\1us'),
+        ('(?i)(a|b|dumd|e|g|h|k|(d|l|p|s|sy)l|o|r|s)ums$' , '\\1um'),
+        ('(?i)a$' , 'um'),
+        ('(?i)i$' , 'us'),
+        ('(?i)ses$' , 's'),
+        ('(?i)es$' , 'is'),
+        ('(?i)(a|e|i|o|u)as$' , '\\1a'),
+        ('(?i)ae$' , 'a'),
+        ('(?i)ies$' , 'y'),
+        ('(?i)s$' , '')
+    )
+
+    singular_uncountable_words = uncountable_words
+    singular_irregular_words = dict(zip(irregular_words.values(), irregular_words.keys()))
+    # singularize has always looked reserve words up by their singular form
+    singular_exact_words = reserve_words
 
     def pluralize(self, word) :
         '''Pluralizes English nouns.'''
@@ -96,88 +305,12 @@ class English(object):
         #http://web2.uvcs.uvic.ca/elc/studyzone/330/grammar/irrplu.htm
         #http://www2.gsu.edu/~wwwesl/egw/pluralsn.htm
         
-        lower_cased_word = word.lower();
-
-        for uncountable_word in self.uncountable_words:
-            if lower_cased_word[-1*len(uncountable_word):] == uncountable_word :
-                return word
-        
-        for res_word in self.reserve_words.keys():
-            if res_word == word:
-                return self.reserve_words[res_word]
-        
-        for irregular in self.irregular_words.keys():
-            match = re.search('('+irregular+')$',word, re.IGNORECASE)
-            if match:
-                return re.sub('(?i)'+irregular+'$', match.expand('\\1')[0]\
-                    +self.irregular_words[irregular][1:], word)
-
-        r = self.to_plural_compiled
-        for idx in range(len(r)):
-            if r[idx].match(word):
-                return r[idx].sub('\\1'+self.inflector_rules[idx][2], word)
-        
-        return word
+        return compiled_rules(self.__class__, 'plural').apply(word)
 
 
     def singularize (self, word) :
         '''Singularizes English nouns.'''
-        
-        rules = [
-            ['(?i)eaux$' , 'eau'],
-            ['(?i)mena$' , 'menon'],
-            ['(?i)teria$' , 'terion'],
-            ['(?i)([m|l])ice$' , '\\1ouse'],
-            ['(?i)ices$' , '|ix|ex'],
-            ['(?i)ves$' , '|f|fe'],
-            ['(?i)os$' , 'o'],
-            ['(?i)(o|x|z|ch|ss|sh)es$' , '\\1'],
-            ['(?i)s-in-law$' , '-in-law'],
-            ['(?i)sful$' , 'ful'],
-            ['(?i)(d|(a|e|i|o|u)n|p|pl|r|s|t)uses$' , '\\1us'],
-            ['(?i)(a|b|dumd|e|g|h|k|(d|l|p|s|sy)l|o|r|s)ums$' , '\\1um'],
-            ['(?i)a$' , 'um'],
-            ['(?i)i$' , 'us'],
-            ['(?i)ses$' , 's'],
-            ['(?i)es$' , 'is'],
-            ['(?i)(a|e|i|o|u)as$' , '\\1a'],
-            ['(?i)ae$' , 'a'],
-            ['(?i)ies$' , 'y'],
-            ['(?i)s$' , '']
-        ]
-    
-        irregular_words = dict(
-            [[self.irregular_words[i],i] for i in self.irregular_words.keys()] )
-    
-        reserve_words = dict(
-            [[self.reserve_words[i],i] for i in self.reserve_words.keys()] )
-
-        lower_cased_word = word.lower();
-    
-        for uncountable_word in self.uncountable_words:
-            if lower_cased_word[-1*len(uncountable_word):] == uncountable_word :
-                return word
-            
-        for irregular in irregular_words.keys():
-            match = re.search('('+irregular+')$',word, re.IGNORECASE)
-            if match:
-                return re.sub('(?i)'+irregular+'$', match.expand('\\1')[0]+irregular_words[irregular][1:], word)
-            
-        for res_word in self.reserve_words.keys():
-            if res_word == word:
-                return self.reserve_words[res_word]
-
-        for rule in range(len(rules)):
-            match = re.search(rules[rule][0], word, re.IGNORECASE)
-            if match :
-                groups = match.groups()
-                for k in range(0,len(groups)) :
-                    if groups[k] == None :
-                        rules[rule][1] = rules[rule][1].replace('\\'+str(k+1), '')
-                        
-                return re.sub(rules[rule][0], rules[rule][1], word)
-        
-        return word
+        return compiled_rules(self.__class__, 'singular').apply(word)
     
     tense_skel_aux = [
         #be
@@ -190,6 +323,7 @@ class English(object):
         ['',                'will', 'would','would','',  ''],
         ['',                'shall','should','should','',  ''],
     ]
+    t_aux_words = tense_words('tense_skel_aux')
 
     tense_skel_1 = [
         #present, past, perfect, singular, continuous
@@ -235,7 +369,7 @@ class English(object):
         ['(?i)([l])',         'earn', 'earn', 'earn', 'earns','earning'],
         #ear
         ['(?i)(b|sh|t|w)',  'ear',  'ore',  'orn', 'ears', 'earing'],
-        ['(?i)(h)',         'ear',  'eard', 'eard' 'ears', 'earing'],
+        ['(?i)(h)',         'ear',  'eard', 'eard', 'ears', 'earing'],
         #eat
         ['(?i)(sw)',        'eat',  'eat',  'eat', 'eats','eating'],
         ['(?i)(b)',         'eat',  'eat',  'eaten','eats','eating'],
@@ -352,11 +486,11 @@ class English(object):
         #oose
         ['(?i)(ch)',        'oose', 'ose',  'osen', 'ooses','oosing'],
         #ose
-        ['(?i)(l)',         'ose$', 'ost',  'ost',  'oses','osing'],
+        ['(?i)(l)',         'ose',  'ost',  'ost',  'oses','osing'],
         #ost
         ['(?i)(c)',         'ost',  'ost',  'ost',  'oses','osing'],
         #ove
-        ['(?i)(pr)',        'ove$', 'oved', 'oven', 'oves','oving'],
+        ['(?i)(pr)',        'ove',  'oved', 'oven', 'oves','oving'],
         #ow
         ['(?i)([^l]l|n|r)',   'ow',   'ew',   'own', 'ows', 'owing'],
         ['(?i)(.*[hms])',   'ow',   'owed', 'own', 'ows', 'owing'],
@@ -379,48 +513,82 @@ class English(object):
         #
     ]
 
-    t_compiled_1 = []
-    #for i in range(4):
-    #    t_compiled_1.append( [ re.compile(ts[0]+ts[i+1]+'$') for ts in tense_skel_1 ] )
-    t_compiled_1.append( [ re.compile(ts[0]+ts[1]+'$') for ts in tense_skel_1 ] )
-    t_compiled_1.append( [ re.compile(ts[0]+ts[2]+'$') for ts in tense_skel_1 ] )
-    t_compiled_1.append( [ re.compile(ts[0]+ts[3]+'$') for ts in tense_skel_1 ] )
-    t_compiled_1.append( [ re.compile(ts[0]+ts[4]+'$') for ts in tense_skel_1 ] )
+    t_compiled_1 = compiled_tenses('tense_skel_1')
 
 
     tense_skel_122 = [
         ['(?i)(.*[^aeiouy][aeiouy])([^aeiouy])','','ed', 'ed','s','ing'],
     ]
-    t_compiled_122 = []
-    #for i in range(4):
-    #    t_compiled_122.append( [ re.compile(ts[0]+ts[i+1]+'$') for ts in tense_skel_122 ] )
-    t_compiled_122.append( [ re.compile(ts[0]+ts[1]+'$') for ts in tense_skel_122 ] )
-    t_compiled_122.append( [ re.compile(ts[0]+ts[2]+'$') for ts in tense_skel_122 ] )
-    t_compiled_122.append( [ re.compile(ts[0]+ts[3]+'$') for ts in tense_skel_122 ] )
-    t_compiled_122.append( [ re.compile(ts[0]+ts[4]+'$') for ts in tense_skel_122 ] )
+    t_compiled_122 = compiled_tenses('tense_skel_122')
 
 
     tense_skel_122_reverse = [
-        ['(?i)([^aeiouy][aeiouy])([^aeiouy]{2})','','ed', 'ed','s','ing'],
+        ['(?i)(.*[^aeiouy][aeiouy])([^aeiouyflsz])\\2','','ed', 'ed','s','ing'],
     ]
-    t_compiled_122_reverse = []
-    #for i in range(4):
-    #    t_compiled_122_reverse.append( [ re.compile(ts[0]+ts[i+1]+'$') for ts in tense_skel_122_reverse ] )
-    t_compiled_122_reverse.append( [ re.compile(ts[0]+ts[1]+'$') for ts in tense_skel_122_reverse ] )
-    t_compiled_122_reverse.append( [ re.compile(ts[0]+ts[2]+'$') for ts in tense_skel_122_reverse ] )
-    t_compiled_122_reverse.append( [ re.compile(ts[0]+ts[3]+'$') for ts in tense_skel_122_reverse ] )
-    t_compiled_122_reverse.append( [ re.compile(ts[0]+ts[4]+'$') for ts in tense_skel_122_reverse ] )
+    t_compiled_122_reverse = compiled_tenses('tense_skel_122_reverse')
 
     tense_skel_12 = [
         ['(?i)(str[aeiouy])([^aeiouy])','','ed', 'ed','s','ing'],
     ]
+    t_compiled_12 = compiled_tenses('tense_skel_12', True)
 
     tense_skel_normal = [
         ['(?i)',            'e',    'ed',   'ed',   'es',   'ing'],
         ['(?i)',            '',     'ed',   'ed',   's',    'ing'],
     ]
+    t_compiled_normal = compiled_tenses('tense_skel_normal', True)
 
 
+    def find_tense(self,word,_from,_to):
+        """Returns (table, found) for the row of the tense tables word is
+        conjugated with, table being None and found the row for
+        tense_skel_aux, or None"""
+        row = self.t_aux_words[_from].get(word)
+        if row is not None:
+            return None, row
+
+        if _from == 1:
+            tables = (self.t_compiled_1, self.t_compiled_122, self.t_compiled_12, self.t_compiled_normal)
+        else:
+            tables = (self.t_compiled_1, self.t_compiled_122_reverse, self.t_compiled_12, self.t_compiled_normal)
+        for table in tables:
+            found = table.find(word, _from, _to)
+            if found:
+                if _from != 1 and table is self.t_compiled_normal:
+                    found = self.regular_row(word, _from, found)
+                return table, found
+        return None
+
+    def regular_row(self,word,_from,found):
+        """Returns found, or the row of tense_skel_normal taking the same
+        ending off without putting an "e" back when found is the "e" one
+        and what is left of word has one of regular_stem_endings.
+        """
+        row, regex, match = found
+        rows = self.tense_skel_normal
+        if row is rows[0] and rows[1][_from] == row[_from] and \
+                word[:match.start()].lower().endswith(regular_stem_endings):
+            return rows[1], regex, match
+        return found
+
+    def tensed(self,word,tense,_to):
+        """Conjugates word with the row find_tense() gave"""
+        table, found = tense
+        if table is None:
+            return found[_to]
+        if table is self.t_compiled_1:
+            groups = (1,)
+        elif table is self.t_compiled_122:
+            if _to == 4:
+                groups = (1, 2)
+            else:
+                groups = (1, 2, 2)
+        elif table is self.t_compiled_normal:
+            groups = ()
+        else:
+            groups = (1, 2)
+        return table.substitute(word, found, groups, _to)
+
     def get_tense(self,word,_from,_to):
         """Get tense from word"""
         #1=present,2=past,3=perfect,4=singular,5=continuous
@@ -428,54 +596,37 @@ class English(object):
         #trap
         if _from != 1: _to = 1
 
-        for rule in range(len(self.tense_skel_aux)):
-            if word == self.tense_skel_aux[rule][_from]:
-                return self.tense_skel_aux[rule][_to]
-
-        for rule in range(len(self.t_compiled_1[_from-1])):
-            if self.t_compiled_1[_from-1][rule].match(word):
-                t = self.tense_skel_1
-                reg = t[rule][0] + t[rule][_from] + '$'
-                return re.sub(reg, '\\1'+t[rule][_to], word)
-
-        if _from == 1:
-            for rule in range(len(self.t_compiled_122[_from-1])):
-                reg = self.t_compiled_122[rule][_from-1]
-                if self.t_compiled_122[_from-1][rule].match(word):
-                    t = self.tense_skel_122
-                    #reg = t[rule][0] + t[rule][_from] + '$'
-                    if _to == 4:
-                        #return re.sub(reg, '\\1\\2'+t[rule][_to], word)
-                        return reg.sub('\\1\\2'+t[rule][_to], word)
-                    else:
-                        #return re.sub(reg, '\\1\\2\\2'+t[rule][_to], word)
-                        return reg.sub('\\1\\2\\2'+t[rule][_to], word)
-        else:
-            for rule in range(len(self.t_compiled_122_reverse[_from-1])):
-                if self.t_compiled_122_reverse[_from-1][rule].match(word):
-                    t = self.tense.skel_122_reverse
-                    reg = t[rule][0] + t[rule][_from] + '$'
-                    if _to == 4:
-                        return re.sub(reg, '\\1\\2'+t[rule][_to], word)[:-1]
-                    else:
-                        return re.sub(reg, '\\1\\2'+t[rule][_to], word)[:-1]
-
-        for rule in range(len(self.tense_skel_12)):
-            reg = self.tense_skel_12[rule][0]+self.tense_skel_12[rule][_from]+'$'
-            match = re.search(reg, word, re.IGNORECASE)
-            if match :
-                return re.sub(reg, '\\1\\2'+self.tense_skel_12[rule][_to], word)
-
-        for rule in range(len(self.tense_skel_normal)):
-            reg = self.tense_skel_normal[rule][0]+self.tense_skel_normal[rule][_from]+'$'
-            match = re.search(reg, word, re.IGNORECASE)
-            if match :
-                return re.sub(reg, self.tense_skel_normal[rule][_to], word)
-
-        return word
+        tense = self.find_tense(word, _from, _to)
+        if tense is None:
+            return word
+        return self.tensed(word, tense, _to)
 
     def get_all(self,word):
-        return [word, self.to_past(word), self.to_perfect(word), self.to_singular(word), self.to_continuous(word)]
+        """Get the present, past, perfect, singular and continuous tenses
+        of word, finding its row of the tense tables once"""
+        forms = [word]
+        tense = self.find_tense(word, 1, 2)
+        for _to in range(2, 6):
+            if tense is not None and tense[0] is not None and len(tense[1][0]) <= _to:
+                # A row without the tense leaves it to a later one.
+                tense = self.find_tense(word, 1, _to)
+            if tense is None:
+                forms.append(word)
+            else:
+                forms.append(self.tensed(word, tense, _to))
+        return forms
+
+    def conjugate_many(self,words,batch_size=4096):
+        """Yields get_all() of each of words as they come, conjugating a
+        verb repeated within a batch of batch_size words once"""
+        conjugated = {}
+        for count, word in enumerate(words):
+            if count % batch_size == 0:
+                conjugated.clear()
+            forms = conjugated.get(word)
+            if forms is None:
+                forms = conjugated[word] = self.get_all(word)
+            yield list(forms)
 
     def to_past(self,word):
         return self.get_tense(word,1,2)
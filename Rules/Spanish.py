@@ -5,146 +5,15 @@
 # info at bermi dot org
 # See the end of this file for the free software, open source license (BSD-style).
 
-import re
 from Base import Base
+from rules import spanish
 
-class Spanish (Base):
+class Spanish (Base, spanish.Spanish):
     '''
     Inflector for pluralize and singularize Spanish nouns.
-    '''
-    
-    def pluralize(self, word) :
-        '''Pluralizes Spanish nouns.'''
-        rules = [
-            ['(?i)([aeiou])x$', '\\1x'], # This could fail if the word is oxytone.
-            ['(?i)([])([ns])$', '|1\\2es'],
-            ['(?i)(^[bcdfghjklmnpqrstvwxyz]*)an$', '\\1anes'], # clan->clanes
-            ['(?i)([])s$', '|1ses'],
-            ['(?i)(^[bcdfghjklmnpqrstvwxyz]*)([aeiou])([ns])$', '\\1\\2\\3es'], # tren->trenes
-            ['(?i)([aeiou])$', '\\1s'], # casa->casas, padre->padres, pap->paps
-            ['(?i)([aeiou])s$', '\\1s'], # atlas->atlas, virus->virus, etc.
-            ['(?i)([])(s)$', '|1\\2es'], # ingls->ingleses
-            ['(?i)z$', 'ces'],  # luz->luces
-            ['(?i)([])$', '\\1es'], # ceut->ceutes, tab->tabes
-            ['(?i)(ng|[wckgtp])$', '\\1s'], # Anglicismos como puenting, frac, crack, show (En que casos podra fallar esto?)
-            ['(?i)$', 'es']	# ELSE +es (v.g. rbol->rboles)
-        ]
-        
-        uncountable_words = ['tijeras','gafas', 'vacaciones','vveres','dficit']
-        ''' In fact these words have no singular form: you cannot say neither
-        "una gafa" nor "un vvere". So we should change the variable name to
-        onlyplural or something alike.'''
-        
-        irregular_words = {
-            'pas' : 'pases',
-            'champ' : 'champs',
-            'jersey' : 'jersis',
-            'carcter' : 'caracteres',
-            'espcimen' : 'especmenes',
-            'men' : 'mens',
-            'rgimen' : 'regmenes',
-            'curriculum'  :  'currculos',
-            'ultimtum'  :  'ultimatos',
-            'memorndum'  :  'memorandos',
-            'referndum'  :  'referendos'
-        }
-        
-        lower_cased_word = word.lower();
-        
-        for uncountable_word in uncountable_words:
-            if lower_cased_word[-1*len(uncountable_word):] == uncountable_word :
-                return word
-        
-        for irregular in irregular_words.keys():
-            match = re.search('(?i)('+irregular+')$',word, re.IGNORECASE)
-            if match:
-                return re.sub('(?i)'+irregular+'$', match.expand('\\1')[0]+irregular_words[irregular][1:], word)
-        
-        
-        for rule in range(len(rules)):
-            match = re.search(rules[rule][0], word, re.IGNORECASE)
-            
-            if match :
-                groups = match.groups()
-                replacement = rules[rule][1]
-                if re.match('\|', replacement) :
-                    for k in range(1, len(groups)) :
-                        replacement = replacement.replace('|'+str(k), self.string_replace(groups[k-1], '', 'AEIOUaeiou'))
-                
-                result = re.sub(rules[rule][0], replacement, word)
-                # Esto acentua los sustantivos que al pluralizarse se convierten en esdrjulos como esmquines, jvenes...
-                match = re.search('(?i)([aeiou]).{1,3}([aeiou])nes$',result)
-                
-                if match and len(match.groups()) > 1 and not re.search('(?i)[]', word) :
-                    result = result.replace(match.group(0), self.string_replace(match.group(1), 'AEIOUaeiou', '') + match.group(0)[1:])
-                    
-                return result
-        
-        return word
-
 
-    def singularize (self, word) :
-        '''Singularizes Spanish nouns.'''
-        
-        rules = [
-            ['(?i)^([bcdfghjklmnpqrstvwxyz]*)([aeiou])([ns])es$', '\\1\\2\\3'],
-            ['(?i)([aeiou])([ns])es$',  '~1\\2'],
-            ['(?i)oides$',  'oide'], # androides->androide
-            ['(?i)(ces)$/i', 'z'],
-            ['(?i)(sis|tis|xis)+$',  '\\1'], # crisis, apendicitis, praxis
-            ['(?i)()s$',  '\\1'], # bebs->beb
-            ['(?i)([^e])s$',  '\\1'], # casas->casa
-            ['(?i)([bcdfghjklmnprstvwxyz]{2,}e)s$', '\\1'], # cofres->cofre
-            ['(?i)([ghpv]e)s$', '\\1'], # 24-01 llaves->llave
-            ['(?i)es$', ''] # ELSE remove _es_  monitores->monitor
-        ];
-    
-        uncountable_words = ['paraguas','tijeras', 'gafas', 'vacaciones', 'vveres','lunes','martes','mircoles','jueves','viernes','cumpleaos','virus','atlas','sms']
-        
-        irregular_words = {
-            'jersey':'jersis',
-            'espcimen':'especmenes',
-            'carcter':'caracteres',
-            'rgimen':'regmenes',
-            'men':'mens',
-            'rgimen':'regmenes',
-            'curriculum' : 'currculos',
-            'ultimtum' : 'ultimatos',
-            'memorndum' : 'memorandos',
-            'referndum' : 'referendos',
-            'sndwich' : 'sndwiches'
-        }
-    
-        lower_cased_word = word.lower();
-    
-        for uncountable_word in uncountable_words:
-            if lower_cased_word[-1*len(uncountable_word):] == uncountable_word :
-                return word
-            
-        for irregular in irregular_words.keys():
-            match = re.search('('+irregular+')$',word, re.IGNORECASE)
-            if match:
-                return re.sub('(?i)'+irregular+'$', match.expand('\\1')[0]+irregular_words[irregular][1:], word)
-            
-        for rule in range(len(rules)):
-            match = re.search(rules[rule][0], word, re.IGNORECASE)
-            if match :
-                groups = match.groups()
-                replacement = rules[rule][1]
-                if re.match('~', replacement) :
-                    for k in range(1, len(groups)) :
-                        replacement = replacement.replace('~'+str(k), self.string_replace(groups[k-1], 'AEIOUaeiou', ''))
-                
-                result = re.sub(rules[rule][0], replacement, word)
-                # Esta es una posible solucin para el problema de dobles acentos. Un poco guarrillo pero funciona
-                match = re.search('(?i)([]).*([])',result)
-                
-                if match and len(match.groups()) > 1 and not re.search('(?i)[]', word) :
-                    result = self.string_replace(result, '', 'AEIOUaeiou')
-                
-                return result
-        
-        return word
+    The noun rules are declared once, in rules/spanish.py.
+    '''
 
 
 # Copyright (c) 2006 Bermi Ferrer Martinez
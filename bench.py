@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+#
+# bermi a-t bermilabs - com
+#
+# Micro benchmarks for the inflector engines. Run with "python bench.py".
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+from rules.english import English
+from rules.spanish import Spanish
+from rules.engine import compiled_rules, rule_data, translate, translation, Accent, RuleSet
+from rules.ordering import record, reordered_rules
+from rules.compiler import load
+from Rules.English import English as LegacyEnglish
+from Rules.Base import Base, unaccent_table
+from rules.batch import numpy
+
+words = ['search', 'switch', 'fix', 'box', 'process', 'address', 'case',
+         'stack', 'wish', 'category', 'query', 'ability', 'agency', 'movie',
+         'archive', 'index', 'wife', 'half', 'salesperson', 'spokesman',
+         'basis', 'datum', 'node_child', 'experience', 'day', 'comment',
+         'foobar', 'newsletter', 'quiz', 'perspective', 'ox', 'photo',
+         'buffalo', 'dwarf', 'information', 'bus', 'status', 'mouse',
+         'octopus', 'alias', 'vertex', 'axis', 'crisis', 'shoe', 'edge']
+
+
+def bench(label, function, words, number = 200) :
+    '''Prints the mean time per call of function over words.'''
+    seconds = timeit.timeit(lambda: [function(word) for word in words], number = number)
+    per_call = seconds / (number * len(words)) * 1e6
+    print('%-44s %8.2f us/call' % (label, per_call))
+    return per_call
+
+
+def linear_scan(rules, uncountable_words, irregular_words, word) :
+    '''The per-call rule interpretation the locale classes used before
+    their rules were compiled, kept as the baseline to compare against.'''
+    rules = [list(rule) for rule in rules]
+    lower_cased_word = word.lower()
+    for uncountable_word in uncountable_words:
+        if lower_cased_word[-1*len(uncountable_word):] == uncountable_word :
+            return word
+    for irregular in irregular_words.keys():
+        match = re.search('('+irregular+')$', word, re.IGNORECASE)
+        if match:
+            return re.sub('(?i)'+irregular+'$', match.expand('\\1')[0]+irregular_words[irregular][1:], word)
+    for rule in range(len(rules)):
+        match = re.search(rules[rule][0], word, re.IGNORECASE)
+        if match :
+            groups = match.groups()
+            for k in range(0,len(groups)) :
+                if groups[k] == None :
+                    rules[rule][1] = rules[rule][1].replace('\\'+str(k+1), '')
+            return re.sub(rules[rule][0], rules[rule][1], word)
+    return word
+
+
+def bench_compiled_rules() :
+    english = English()
+    plural = lambda word: linear_scan(English.plural_rules, English.plural_uncountable_words,
+                                      English.plural_irregular_words, word)
+    singular = lambda word: linear_scan(English.singular_rules, English.singular_uncountable_words,
+                                        English.singular_irregular_words, word)
+    plurals = [english.pluralize(word) for word in words]
+    # RuleSet.inflect evaluates the rules on every call, where pluralize()
+    # would return the results it remembers.
+    before = bench('pluralize, per-call rule lists', plural, words)
+    after = bench('pluralize, compiled RuleSet', compiled_rules(English, 'plural').inflect, words)
+    print('%44s %8.1fx' % ('speedup', before / after))
+    before = bench('singularize, per-call rule lists', singular, plurals)
+    after = bench('singularize, compiled RuleSet', compiled_rules(English, 'singular').inflect, plurals)
+    print('%44s %8.1fx' % ('speedup', before / after))
+
+
+def bench_rule_modes() :
+    spanish_words = ['casa', 'cami\xf3n', 'tren', '\xe1rbol', 'luz', 'ingl\xe9s', 'joven', 'crisis', 'show', 'clan']
+    for locale, samples in ((English, words), (Spanish, spanish_words)) :
+        for kind in ('plural', 'singular') :
+            for mode in ('linear', 'alternation') :
+                rule_set = compiled_rules(locale, kind, mode)
+                bench('%s %s, %s' % (locale.__name__, kind, mode), rule_set.apply, samples)
+
+
+def bench_legacy_exceptions() :
+    '''Times the legacy English noun path, which Inflector.py uses, on its
+    irregular, reserve and uncountable words, against inverting the word
+    maps and scanning them and the rules on every call as it used to.'''
+    english = LegacyEnglish()
+    singulars = sorted(LegacyEnglish.irregular_words) + sorted(LegacyEnglish.reserve_words) + \
+                list(LegacyEnglish.uncountable_words[:10])
+    plurals = [english.pluralize(word) for word in singulars]
+
+    def plural(word) :
+        for res_word in LegacyEnglish.reserve_words.keys() :
+            if res_word == word :
+                return LegacyEnglish.reserve_words[res_word]
+        return linear_scan(LegacyEnglish.plural_rules, LegacyEnglish.uncountable_words,
+                           LegacyEnglish.irregular_words, word)
+
+    def singular(word) :
+        irregular_words = dict([[plural, singular] for singular, plural in LegacyEnglish.irregular_words.items()])
+        reserve_words = dict([[plural, singular] for singular, plural in LegacyEnglish.reserve_words.items()])
+        for res_word in LegacyEnglish.reserve_words.keys() :
+            if res_word == word :
+                return LegacyEnglish.reserve_words[res_word]
+        return linear_scan(LegacyEnglish.singular_rules, LegacyEnglish.uncountable_words, irregular_words, word)
+
+    before = bench('Rules.English pluralize, per-call maps', plural, singulars)
+    after = bench('Rules.English pluralize, exception words', english.pluralize, singulars)
+    print('%44s %8.1fx' % ('speedup', before / after))
+    before = bench('Rules.English singularize, per-call maps', singular, plurals)
+    after = bench('Rules.English singularize, exception words', english.singularize, plurals)
+    print('%44s %8.1fx' % ('speedup', before / after))
+
+
+def bench_accents() :
+    '''Times moving the accents of Spanish words with one str.translate
+    table, against the re.sub per character of Base.string_replace.'''
+    spanish = Spanish()
+    find, replace = Spanish.plural_placeholders['|']
+    table = translation(dict(zip(find, replace)))
+    samples = ['ingl\xe9s', 'cami\xf3n', 'jard\xedn', 'cora\xe7\xf3n', 'AND\xc9N', '\xe1rbol']
+    before = bench('accents, re.sub per character', lambda word: spanish.string_replace(word, find, replace), samples)
+    after = bench('accents, translate table', lambda word: translate(word, table), samples)
+    print('%44s %8.1fx' % ('speedup', before / after))
+    plurals = [spanish.pluralize(word) for word in samples]
+    bench('Spanish pluralize, accented words', spanish.pluralize, samples)
+    bench('Spanish singularize, accented words', spanish.singularize, plurals)
+
+
+def bench_stress() :
+    '''Times the Spanish plural accent fix over a few hundred made up
+    nouns, searching every plural for the stress pattern against only
+    the plurals ending with its "nes".'''
+    stems = ['cas', 'cami', 'jov', 'orig', 'tr', 'esm\xe1qu', 'ingl', 'coraz', 'l\xe1p', 'marr',
+             'volc', 'ex\xe1m', 'cancion', 'alem', 'cr\xe1t', 'jard', 'rat', 'mont', 'p\xe1j', 'fuent']
+    endings = ['a', 'o', 'e', 'en', 'on', '\xf3n', '\xe9s', 'es', 'or', 'al', '\xedn', 'ez', 'is', 'us', 'ing']
+    nouns = [stem + ending for stem in stems for ending in endings]
+    spanish = Spanish()
+    pairs = [(noun, spanish.pluralize(noun)) for noun in nouns]
+    after = Accent(*Spanish.plural_accents[0])
+    before = Accent(*Spanish.plural_accents[0])
+    before.suffix = None
+    assert [before.apply(*pair) for pair in pairs] == [after.apply(*pair) for pair in pairs]
+    seconds = [bench('Spanish plural accents, %s' % label, lambda pair: accent.apply(*pair), pairs, 20)
+               for label, accent in (('search every result', before), ('suffix checked first', after))]
+    print('%44s %8.1fx' % ('speedup', seconds[0] / seconds[1]))
+    bench('Spanish pluralize, made up nouns', spanish.pluralize, nouns, 20)
+
+
+def regex_chain_underscore(word) :
+    '''Base.underscore as four re.sub passes.'''
+    return re.sub('[^A-Z^a-z^0-9^\/]+', '_',
+                  re.sub('([a-z\d])([A-Z])', '\\1_\\2',
+                         re.sub('([A-Z]+)([A-Z][a-z])', '\\1_\\2', re.sub('::', '/', word)))).lower()
+
+
+def bench_identifiers() :
+    '''Times the case style methods of Base against the regex chains
+    they used to run.'''
+    identifiers = ['WelcomePage', 'welcome_page', 'HTMLParser', 'Admin::UserAccount', 'user_id',
+                   'who\'s online', 'sendEmailNow', 'XMLHttpRequest2Factory', 'node_child', 'ABC']
+    inflector = Base()
+    humanize = lambda word: re.sub('_id$', '', word).replace('_', ' ').title()
+    for label, before, after in (
+            ('underscore', regex_chain_underscore, inflector.underscore),
+            ('camelize', lambda word: ''.join(w[0].upper() + w[1:] for w in
+                                             re.sub('[^A-Z^a-z^0-9^:]+', ' ', word).split(' ')),
+             inflector.camelize),
+            ('humanize', humanize, inflector.humanize),
+            ('titleize', lambda word: humanize(regex_chain_underscore(word)).title(), inflector.titleize)) :
+        before = bench('%s, regex chain' % label, before, identifiers)
+        after = bench('%s, one pass' % label, after, identifiers)
+        print('%44s %8.1fx' % ('speedup', before / after))
+
+
+def bench_unicode_identifiers() :
+    '''Times underscore_unicode() and camelize_unicode() on ASCII
+    identifiers, against underscore() and camelize(), and on identifiers
+    in other scripts, against unaccenting them first; camelize() of
+    those is only timed on Latin ones, as it fails on the others.'''
+    inflector = Base()
+    identifiers = [u'WelcomePage', u'HTMLParser', u'Admin::UserAccount', u'sendEmailNow', u'node_child']
+    others = [u'\xdcberName', u'Caf\xe9Cr\xe8me', u'Stra\xdfenBahn',
+              u'\u041f\u0440\u0438\u0432\u0435\u0442\u041c\u0438\u0440', u'\u0394\u03ad\u03bb\u03c4\u03b1Name']
+    for method, samples in (('underscore', others), ('camelize', others[:3])) :
+        # The regexes are compiled with the first word needing them.
+        getattr(inflector, method + '_unicode')(others[0])
+        bench('%s, ASCII' % method, getattr(inflector, method), identifiers)
+        bench('%s_unicode, ASCII' % method, getattr(inflector, method + '_unicode'), identifiers)
+        before = bench('%s of unaccent, other scripts' % method,
+                       lambda word: getattr(inflector, method)(inflector.unaccent(word)), samples)
+        after = bench('%s_unicode, other scripts' % method, getattr(inflector, method + '_unicode'), samples)
+        print('%44s %8.1fx' % ('speedup', before / after))
+
+
+def bench_pipelines() :
+    '''Times the compound methods of Base, built on pipeline(), and the
+    pipelines themselves against calling the methods they chain one
+    after the other.'''
+    english = English()
+    class_names = ['Person', 'BlogPost', 'Admin::UserAccount', 'HTMLParser', 'Post2Comment',
+                   'Shop::Order::LineItem', 'Category', 'Octopus']
+    demodulize = lambda word: english.humanize(english.underscore(re.sub('^.*::', '', word)))
+    for label, before, samples in (
+            ('tableize', lambda word: english.pluralize(english.underscore(word)), class_names),
+            ('classify', lambda word: english.camelize(english.singularize(word)),
+             [english.tableize(word) for word in class_names]),
+            ('titleize', lambda word: english.humanize(english.underscore(word)).title(), class_names),
+            ('demodulize', demodulize, class_names),
+            ('foreignKey', lambda word: english.underscore(demodulize(word)) + '_id', class_names)) :
+        before = bench('%s, method calls' % label, before, samples)
+        bench('%s, Base method' % label, getattr(english, label), samples)
+        after = bench('%s, pipeline(%r)' % (label, label), english.pipeline(label), samples)
+        print('%44s %8.1fx' % ('speedup', before / after))
+
+
+def bench_unaccent() :
+    '''Times Base.unaccent, one translate pass over a memoized table,
+    against the re.sub per character of string_replace it used to run.'''
+    inflector = Base()
+    find = u''.join(sorted(unaccent_table.latin))
+    replace = u''.join([unaccent_table.latin[character] for character in find])
+    titles = [u'Cr\xe8me Br\xfbl\xe9e Set, \xc9dition Sp\xe9ciale', u'Caf\xe9 au Lait Mug 350ml',
+              u'Gew\xfcrztraminer Sp\xe4tlese 2019', u'Pi\xf1ata Fiesta Large', u'Plain ASCII Product Title',
+              u'\u0141\xf3d\u017a \u0160koda Fabia \u1ec7 \ufb01ne', u'Jalape\xf1o Hot Sauce 150ml']
+    before = bench('unaccent, re.sub per character', lambda title: inflector.string_replace(title, find, replace),
+                   titles, 20)
+    after = bench('unaccent, translate table', inflector.unaccent, titles)
+    print('%44s %8.1fx' % ('speedup', before / after))
+    bench('urlize, product titles', inflector.urlize, titles)
+
+
+def bench_stream() :
+    '''Times urlize_stream() reading a few megabytes of text in chunks
+    against urlize() of the whole text.'''
+    inflector = Base()
+    paragraph = (u'The Caf\xe9 M\xfcller review, by J\xfcrgen: HTMLParser tips for '
+                 u'XMLHttpRequest users -- see Admin::UserAccount!  \n')
+    text = paragraph * (4 * 1024 * 1024 // len(paragraph))
+    for label, function in (('urlize, whole text', inflector.urlize),
+                            ('urlize_stream, 64K chunks', lambda text: u''.join(inflector.urlize_stream([text[start:start + 65536]
+                                                                          for start in range(0, len(text), 65536)])))) :
+        seconds = min(timeit.repeat(lambda: function(text), number = 1, repeat = 3))
+        print('%-44s %8.1f MB/s' % (label + ', 4 MB', len(text) / seconds / 1e6))
+
+
+def bench_acronyms() :
+    '''Times camelize() and underscore() with acronyms registered, 8 and
+    400 of them, against the plain methods followed by one re.sub per
+    acronym putting it back.'''
+    known = ['HTTP', 'HTTPS', 'OAuth', 'IPv6', 'XML', 'JSON', 'SQL', 'UUID']
+    made_up = [a + b + c for a in 'BCDFGKMQ' for b in 'JVWXZ' for c in 'BCDFGKMQVWXZ'][:400 - len(known)]
+    identifiers = ['HTTPServer', 'OAuthToken', 'IPv6Address', 'WelcomePage', 'XMLParser',
+                   'Admin::UserAccount', 'JSONEncoder', 'send_email_now']
+    underscored = [Base().underscore(word) for word in identifiers]
+    for acronyms in (known, known + made_up) :
+        class Acronymic(Base) :
+            pass
+        for acronym in acronyms :
+            Acronymic.add_acronym(acronym)
+        inflector, plain = Acronymic(), Base()
+        # The acronyms are compiled with the first word needing them.
+        inflector.underscore(identifiers[0])
+        camelized = [(re.compile(acronym[0] + acronym[1:].lower() + '(?![a-z])'), acronym) for acronym in acronyms]
+        split = [(re.compile('(?<![a-z0-9])' + plain.underscore(acronym) + '(?![a-z0-9])'), acronym.lower())
+                 for acronym in acronyms]
+        def camelize(word) :
+            word = plain.camelize(word)
+            for regex, acronym in camelized :
+                word = regex.sub(acronym, word)
+            return word
+        def underscore(word) :
+            word = plain.underscore(word)
+            for regex, acronym in split :
+                word = regex.sub(acronym, word)
+            return word
+        for label, before, samples in (('camelize', camelize, underscored), ('underscore', underscore, identifiers)) :
+            before = bench('%s, re.sub per acronym, %d' % (label, len(acronyms)), before, samples, 20)
+            after = bench('%s, acronym trie, %d' % (label, len(acronyms)), getattr(inflector, label), samples, 20)
+            print('%44s %8.1fx' % ('speedup', before / after))
+
+
+def bench_batches() :
+    '''Times ordinalize_batch() and conditionalPlural_batch() against
+    calling ordinalize() and conditionalPlural() in a loop, per 100000
+    counts, given a list and, when NumPy is installed, an array.'''
+    english = English()
+    counts = [number * 7919 % 100003 for number in range(100000)]
+    words = ['item', 'box', 'query', 'person'] * (len(counts) // 4)
+    samples = [('list', counts)]
+    if numpy is not None :
+        samples.append(('array', numpy.array(counts)))
+    for name, detail, loop, batch in (
+            ('ordinalize', '', lambda counts: [english.ordinalize(count) for count in counts],
+             english.ordinalize_batch),
+            ('conditionalPlural', ', 1 word', lambda counts: [english.conditionalPlural(count, 'item') for count in counts],
+             lambda counts: english.conditionalPlural_batch(counts, 'item')),
+            ('conditionalPlural', ', 4 words', lambda counts: [english.conditionalPlural(count, word)
+                                                               for count, word in zip(counts, words)],
+             lambda counts: english.conditionalPlural_batch(counts, words))) :
+        before = bench('%s%s, loop' % (name, detail), loop, [counts], 3)
+        for kind, sample in samples :
+            after = bench('%s_batch%s, %s' % (name, detail, kind), batch, [sample], 3)
+            print('%44s %8.1fx' % ('speedup', before / after))
+
+
+def bench_long_words() :
+    sentence = 'the quick brown fox jumps over the lazy dog and its friends '
+    padding = (sentence * (10240 // len(sentence) + 1))[:10240]
+    long_words = [padding + word for word in words]
+    plural = lambda word: linear_scan(English.plural_rules, English.plural_uncountable_words,
+                                      English.plural_irregular_words, word)
+    bench('per-call rule lists, 10 KB words', plural, long_words, 5)
+    for label, function in (('rules.english pluralize', English().pluralize),
+                            ('rules.english singularize', English().singularize),
+                            ('rules.spanish pluralize', Spanish().pluralize),
+                            ('Rules.English pluralize', LegacyEnglish().pluralize)) :
+        bench(label + ', short words', function, words)
+        bench(label + ', 10 KB words', function, long_words, 20)
+
+
+def bench_generated_code() :
+    '''Times the generated code against RuleSet.inflect, which evaluates
+    the rules on every call, not remembering the results as pluralize()
+    and singularize() do.'''
+    spanish_words = ['casa', 'tren', 'luz', 'joven', 'crisis', 'show', 'clan', 'virus', 'papa', 'reloj']
+    for locale, samples in ((English, words), (Spanish, spanish_words)) :
+        plurals = [locale().pluralize(word) for word in samples]
+        for method, kind, inputs in (('pluralize', 'plural', samples), ('singularize', 'singular', plurals)) :
+            before = bench('%s %s, compiled RuleSet' % (locale.__name__, method),
+                           compiled_rules(locale, kind).inflect, inputs)
+            after = bench('%s %s, generated code' % (locale.__name__, method),
+                          getattr(load(locale)(), method), inputs)
+            print('%44s %8.1fx' % ('speedup', before / after))
+
+
+def bench_rule_dispatch() :
+    '''Times RuleSet.inflect, which skips the remembered results, trying
+    every rule, only those allowed by the last character of the word,
+    and those in the order reordered_rules gives for the words.'''
+    samples = [prefix + word for prefix in ('', 'sub', 'over', 'micro') for word in words]
+    for kind in ('plural', 'singular') :
+        inputs = [English().pluralize(word) for word in samples] if kind == 'singular' else samples
+        every_rule = RuleSet(*rule_data(English, kind))
+        every_rule.dispatch = {}
+        before = bench('English %s, every rule' % kind, every_rule.inflect, inputs)
+        after = bench('English %s, last character dispatch' % kind, RuleSet(*rule_data(English, kind)).inflect, inputs)
+        print('%44s %8.1fx' % ('speedup', before / after))
+        reordered = reordered_rules(English, kind, record(English, kind, inputs))
+        after = bench('English %s, dispatch and profiled order' % kind,
+                      RuleSet(reordered, *rule_data(English, kind)[1:]).inflect, inputs)
+        print('%44s %8.1fx' % ('speedup', before / after))
+
+
+verbs = ['walk', 'stop', 'be', 'go', 'run', 'fish', 'teach', 'bring', 'begin',
+         'strip', 'admit', 'play', 'try', 'make', 'prove', 'strut', 'fix']
+
+
+def bench_tenses() :
+    '''Times the legacy English tense methods, which try only the rows of
+    the tense tables whose ending the verb has, and get_all, which finds
+    the row of a verb once for every tense.'''
+    english = LegacyEnglish()
+    for method in ('to_past', 'to_perfect', 'to_singular', 'to_continuous') :
+        bench('Rules.English %s' % method, getattr(english, method), verbs)
+    for method, tense in (('from_past', 1), ('from_perfect', 2), ('from_continuous', 4)) :
+        bench('Rules.English %s' % method, getattr(english, method), [english.get_all(verb)[tense] for verb in verbs])
+    get_tense = lambda verb: [verb] + [english.get_tense(verb, 1, tense) for tense in range(2, 6)]
+    before = bench('Rules.English get_tense, every tense', get_tense, verbs)
+    after = bench('Rules.English get_all', english.get_all, verbs)
+    print('%44s %8.1fx' % ('speedup', before / after))
+    bench('Rules.English conjugate_many, %d verbs' % (len(verbs) * 20),
+          lambda verbs: list(english.conjugate_many(verbs)), [verbs * 20], 20)
+
+
+_first_calls = '''
+import sys, time
+start = time.time()
+sys.path.insert(0, %r)
+%s
+print('%%.2f' %% ((time.time() - start) * 1000))
+'''
+
+_python2_calls = '''from rules.english import English
+from rules.spanish import Spanish
+from Rules.English import English as LegacyEnglish
+from Rules.Base import Base, unaccent_table
+English().pluralize('octopus'), English().singularize('octopi'), Spanish().pluralize('camion')
+LegacyEnglish().pluralize('octopus'), LegacyEnglish().to_past('stop')'''
+
+_python3_calls = '''from english import English
+English().pluralize('octopus'), English().singularize('octopi')'''
+
+
+def bench_cold_start() :
+    '''Times a new interpreter importing the inflectors and making its
+    first calls, without the on-disk rule cache, with an empty one and
+    with the one the previous run filled in.'''
+    here = os.path.dirname(os.path.abspath(__file__))
+    directory = tempfile.mkdtemp()
+    try:
+        for label, cache_directory in (('no cache', ''), ('empty cache', directory),
+                                       ('warm cache', directory)) :
+            env = dict(os.environ, INFLECTOR_CACHE_DIR = cache_directory)
+            output = subprocess.check_output([sys.executable, '-c', _first_calls % (here, _python2_calls)], env = env)
+            print('%-44s %8.2f ms' % ('import and first calls, ' + label, float(output)))
+        # -X importtime needs Python 3.7+, where only the rules directory
+        # imports as top level modules.
+        env = dict(os.environ, INFLECTOR_CACHE_DIR = directory)
+        for label in ('empty cache', 'warm cache') :
+            try:
+                process = subprocess.Popen(['python3', '-X', 'importtime', '-c',
+                                            _first_calls % (os.path.join(here, 'rules'), _python3_calls)],
+                                           env = env, stdout = subprocess.PIPE, stderr = subprocess.PIPE,
+                                           universal_newlines = True)
+            except OSError:
+                print('python3 not found, skipping -X importtime')
+                return
+            output, importtime = process.communicate()
+            print('%-44s %8.2f ms' % ('python3 import and first calls, ' + label, float(output)))
+        for line in importtime.splitlines() :
+            fields = [field.strip() for field in line.split('|')]
+            if len(fields) == 3 and fields[2] in ('english', 'engine', 'cache') :
+                print('%-44s %8.2f ms' % ('python3 -X importtime, ' + fields[2], int(fields[1]) / 1000.0))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    bench_compiled_rules()
+    bench_rule_modes()
+    bench_accents()
+    bench_stress()
+    bench_identifiers()
+    bench_unicode_identifiers()
+    bench_pipelines()
+    bench_unaccent()
+    bench_stream()
+    bench_acronyms()
+    bench_batches()
+    bench_legacy_exceptions()
+    bench_long_words()
+    bench_generated_code()
+    bench_rule_dispatch()
+    bench_tenses()
+    bench_cold_start()
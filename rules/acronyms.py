@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# bermi a-t bermilabs - com
+# See the end of this file for the free software, open source license (BSD-style).
+
+'''Acronyms kept whole by underscore() and camelize().
+
+    English.add_acronym('HTTP')
+    English().camelize('http_server')    # 'HTTPServer', not 'HttpServer'
+    English().underscore('OAuthToken')   # 'oauth_token' once 'OAuth' is added
+
+The acronyms of a locale are stored in a trie of their characters, which
+is compiled into an alternation factored by prefix, H(?:TML|TTP(?:S)?),
+put first in the regex underscore() splits identifiers with. sre walks
+the trie from every position it tries, passing over a branch on its
+first character, so the identifier is still split in one pass however
+many acronyms are registered. An acronym is only taken where no capital
+comes before it and no lower case letter after it, so "UUIDField" is
+not split at an "ID".
+
+camelize() looks every word up in a dict of the lower cased acronyms.'''
+
+import re
+
+# What an acronym is matched in, with the letter or digit before it and
+# the capital after it, which is taken along: an empty match right after
+# the acronym would be dropped by re.sub before Python 3.7.
+acronym_pattern = '(?:(?<=([a-z0-9])))?(?<![A-Z])(%s)(?![a-z])([A-Z])?'
+
+
+def trie_pattern(node):
+    '''Returns a regex matching the words of a trie node, trying the
+    longest first.'''
+    branches = [re.escape(character) + trie_pattern(child)
+                for character, child in sorted(node.items()) if character]
+    if not branches:
+        return ''
+    if len(branches) == 1 and '' not in node:
+        return branches[0]
+    return '(?:%s)%s' % ('|'.join(branches), '' in node and '?' or '')
+
+
+def _separator(match):
+    acronym = match.group(2)
+    if acronym is None:
+        return '_'
+    return (match.group(1) and '_' or '') + acronym + (match.group(3) and '_' + match.group(3) or '')
+
+
+class Acronyms(object):
+    '''The acronyms of a locale, compiled with separators, the pattern of
+    the regex underscore() runs.'''
+
+    def __init__(self, acronyms = (), separators = ''):
+        self.separators = separators
+        self.trie = {}
+        self.words = {}
+        # Compiled the first time underscore() needs it after a change.
+        self.regex = None
+        for acronym in acronyms:
+            self.add(acronym)
+
+    def add(self, acronym):
+        node = self.trie
+        for character in acronym:
+            node = node.setdefault(character, {})
+        node[''] = True
+        self.words[acronym.lower()] = acronym
+        self.regex = None
+
+    def underscore(self, word):
+        '''underscore() of word, its acronyms being words of their own.'''
+        if self.regex is None:
+            self.regex = re.compile(acronym_pattern % trie_pattern(self.trie) + '|' + self.separators)
+        return self.regex.sub(_separator, word.replace('::', '/')).lower()
+
+    def camelize(self, words):
+        '''Joins words as camelize() does, spelling the acronyms among them
+        as they were registered.'''
+        acronyms = self.words
+        return ''.join([acronyms.get(w.lower()) or w[0].upper() + w[1:] for w in words])
+
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software to deal in this software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of this software, and to permit
+# persons to whom this software is furnished to do so, subject to the following
+# condition:
+#
+# THIS SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THIS SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THIS SOFTWARE.
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# bermi a-t bermilabs - com
+# See the end of this file for the free software, open source license (BSD-style).
+
+'''Static analysis of the noun rules of a locale class.
+
+analyze() returns (attribute, problem, entry, reason) findings, problem
+being one of
+
+    unreachable  a rule no word can match
+    shadowed     a rule an earlier one matches every word of, or a listed
+                 word ending with an uncountable word, which wins first
+    duplicate    a word listed twice, or a key given twice in a dict
+                 literal of the class, where Python keeps the last one
+
+None of them can change a result. RuleSet compiles only the rules
+reachable_rules() keeps, so both engines already run without the
+unreachable and shadowed ones; source() prints the pruned tables to
+replace those of the class.
+
+    python rules/analyzer.py english English'''
+
+import ast
+import os
+import sys
+
+from engine import Rule, reachable_rules, never_matches, shadows
+
+kinds = ('plural', 'singular')
+
+
+def _words(locale, name):
+    return list(getattr(locale, name, None) or ())
+
+
+def _rule_findings(locale, kind):
+    name = kind + '_rules'
+    placeholders = getattr(locale, kind + '_placeholders', None)
+    rules = [Rule(pattern, replacement, placeholders) for pattern, replacement in getattr(locale, name)]
+    findings = []
+    kept = []
+    for rule in rules:
+        if never_matches(rule.source):
+            findings.append((name, 'unreachable', rule.pattern, 'no word can match it'))
+            continue
+        earlier = [other for other in kept if shadows(other, rule)]
+        if earlier and earlier[0].source == rule.source:
+            findings.append((name, 'duplicate', rule.pattern, 'same pattern as an earlier rule'))
+        elif earlier:
+            findings.append((name, 'shadowed', rule.pattern, '%r matches every word it does' % earlier[0].pattern))
+        else:
+            kept.append(rule)
+    return findings
+
+
+def _uncountable(word, uncountable_words):
+    '''Returns the uncountable word word ends with, or None.'''
+    for uncountable in uncountable_words:
+        if word.lower().endswith(uncountable.lower()):
+            return uncountable
+    return None
+
+
+def _word_findings(locale, kind):
+    findings = []
+    name = kind + '_uncountable_words'
+    seen = []
+    for word in _words(locale, name):
+        if word.lower() in seen:
+            findings.append((name, 'duplicate', word, 'listed twice'))
+            continue
+        seen.append(word.lower())
+    for word in seen:
+        suffix = _uncountable(word, [other for other in seen if other != word])
+        if suffix is not None:
+            findings.append((name, 'shadowed', word, 'ends with the uncountable %r' % suffix))
+    for name in (kind + '_irregular_words', kind + '_exact_words'):
+        for word in sorted(_words(locale, name)):
+            suffix = _uncountable(word, seen)
+            if suffix is not None:
+                findings.append((name, 'shadowed', word, 'ends with the uncountable %r' % suffix))
+    return findings
+
+
+def _string(node):
+    if node.__class__.__name__ == 'Str':
+        return node.s
+    return getattr(node, 'value', None)
+
+
+def _literal_findings(locale):
+    '''Finds keys given twice in the dict literals of the class body.'''
+    module = sys.modules.get(locale.__module__)
+    try:
+        source = open(os.path.splitext(module.__file__)[0] + '.py', 'rb').read()
+        tree = ast.parse(source)
+    except (AttributeError, IOError, OSError, SyntaxError, ValueError):
+        return []
+    findings = []
+    for node in ast.walk(tree):
+        if node.__class__.__name__ != 'ClassDef' or node.name != locale.__name__:
+            continue
+        for statement in node.body:
+            if statement.__class__.__name__ != 'Assign' or statement.value.__class__.__name__ != 'Dict':
+                continue
+            keys = [_string(key) for key in statement.value.keys]
+            for position, key in enumerate(keys):
+                if key is not None and key in keys[:position]:
+                    for target in statement.targets:
+                        findings.append((getattr(target, 'id', '?'), 'duplicate', key, 'key given twice'))
+    return findings
+
+
+def analyze(locale):
+    '''Returns the findings for the rule data of locale.'''
+    findings = _literal_findings(locale)
+    for kind in kinds:
+        if getattr(locale, kind + '_rules', None) is not None:
+            findings += _rule_findings(locale, kind) + _word_findings(locale, kind)
+    return findings
+
+
+def pruned(locale, kind):
+    '''Returns the rules, uncountable words and irregular words of locale
+    for kind without the entries analyze() finds.'''
+    placeholders = getattr(locale, kind + '_placeholders', None)
+    rules = [Rule(pattern, replacement, placeholders) for pattern, replacement in getattr(locale, kind + '_rules')]
+    rules = tuple([(rule.pattern, rule.replacement) for rule in reachable_rules(rules)])
+    uncountable_words = []
+    for word in _words(locale, kind + '_uncountable_words'):
+        if word.lower() not in [other.lower() for other in uncountable_words]:
+            uncountable_words.append(word)
+    uncountable_words = [word for word in uncountable_words
+                         if _uncountable(word, [other for other in uncountable_words if other != word]) is None]
+    irregular_words = dict([(word, replacement) for word, replacement
+                            in (getattr(locale, kind + '_irregular_words', None) or {}).items()
+                            if _uncountable(word, uncountable_words) is None])
+    return rules, tuple(uncountable_words), irregular_words
+
+
+def source(locale):
+    '''Returns Python code declaring the pruned tables of locale.'''
+    lines = []
+    for kind in kinds:
+        if getattr(locale, kind + '_rules', None) is None:
+            continue
+        rules, uncountable_words, irregular_words = pruned(locale, kind)
+        width = max([len(repr(pattern)) for pattern, replacement in rules] + [0])
+        lines.append('    %s_rules = (' % kind)
+        for pattern, replacement in rules:
+            lines.append('        (%s %s),' % ((repr(pattern) + ',').ljust(width + 1), repr(replacement)))
+        lines.append('    )')
+        lines.append('')
+        lines.append('    %s_uncountable_words = %r' % (kind, uncountable_words))
+        lines.append('')
+        lines.append('    %s_irregular_words = {' % kind)
+        for word in sorted(irregular_words):
+            lines.append('        %r : %r,' % (word, irregular_words[word]))
+        lines.append('    }')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        sys.stderr.write('usage: python rules/analyzer.py <module> <class>\n')
+        sys.exit(2)
+    locale = getattr(__import__(sys.argv[1]), sys.argv[2])
+    for attribute, problem, entry, reason in analyze(locale):
+        sys.stderr.write('%s: %s %r, %s\n' % (attribute, problem, entry, reason))
+    sys.stdout.write(source(locale))
+
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software to deal in this software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of this software, and to permit
+# persons to whom this software is furnished to do so, subject to the following
+# condition:
+#
+# THIS SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THIS SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THIS SOFTWARE.
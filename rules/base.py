@@ -5,11 +5,57 @@
 # See the end of this file for the free software, open source license (BSD-style).
 
 import re
+from batch import conditional_plurals, ordinals
+from engine import CharacterClassTable, CustomRules, UnaccentTable, compiled_acronyms
+from pipeline import append, compile_pipeline, inherited, last_module
+from stream import read_chunks, underscored_chunks
 
-class Base:
+# Where underscore() puts an underscore: between a lower case letter or
+# a digit and a capital, before the capital starting a word after an
+# acronym ("HTML_Parser"), and for every run of other characters but "^"
+# and "/", so an identifier is split into its words in one pass.
+identifier_separators = re.compile('(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])|[^A-Za-z0-9^/]+')
+camelize_separators = re.compile('[^A-Z^a-z^0-9^:]+')
+# The same for words in any script, with sets of the classes of
+# rules.engine.CharacterClassTable: letters of no case, digits and marks
+# start a new word before a capital like lower case letters do.
+unicode_identifier_separators = u'(?<=[%(ldom)s])(?=[%(u)s])|(?<=[%(u)s])(?=[%(u)s][%(l)s])|[^%(ludom)s\\^/]+'
+unicode_camelize_separators = u'[^%(ludom)s\\^:]+'
+character_classes = CharacterClassTable()
+# Code points past the Basic Multilingual Plane are at least this.
+astral = u'\U00010000'
+ascii_word = getattr(str, 'isascii', None) or re.compile('[\\x00-\\x7f]*\\Z').match
+id_suffix = re.compile('_id$')
+# unaccent() swaps these Latin-1 characters, see rules.engine.UnaccentTable
+# for the others.
+unaccent_table = UnaccentTable(u'\u00C0\u00C1\u00C2\u00C3\u00C4\u00C5\u00C6\u00C7\u00C8\u00C9\u00CA\u00CB\u00CC\u00CD\u00CE\u00CF\u00D0\u00D1\u00D2\u00D3\u00D4\u00D5\u00D6\u00D8\u00D9\u00DA\u00DB\u00DC\u00DD\u00DE\u00DF\u00E0\u00E1\u00E2\u00E3\u00E4\u00E5\u00E6\u00E7\u00E8\u00E9\u00EA\u00EB\u00EC\u00ED\u00EE\u00EF\u00F0\u00F1\u00F2\u00F3\u00F4\u00F5\u00F6\u00F8\u00F9\u00FA\u00FB\u00FC\u00FD\u00FE\u00FF',
+                               u'AAAAAAACEEEEIIIIDNOOOOOOUUUUYTsaaaaaaaceeeeiiiienoooooouuuuyty')
+
+class Base (CustomRules):
     '''Locale inflectors must inherit from this base class inorder to provide
     the basic Inflector functionality'''
     
+    # Words like "HTTP" camelize() and underscore() keep whole, see
+    # add_acronym().
+    acronyms = ()
+    
+    # How compiled noun rules are evaluated, see rules.engine.RuleSet
+    rule_mode = 'linear'
+    
+    def pipeline(self, *steps) :
+        '''Returns a function running a word through steps, method names
+        like 'underscore', ('humanize', 'first') or functions of the word,
+        compiled once for this inflector. Compound methods are expanded
+        and redundant passes dropped, see rules/pipeline.py.'''
+        try:
+            return self._pipelines[steps]
+        except AttributeError:
+            self._pipelines = {}
+        except KeyError:
+            pass
+        self._pipelines[steps] = compile_pipeline(self, steps, Base)
+        return self._pipelines[steps]
+
     def conditionalPlural(self, numer_of_records, word) :
         '''Returns the plural form of a word if first parameter is greater than 1'''
         
@@ -17,6 +63,15 @@ class Base:
             return self.pluralize(word)
         else :
             return word
+    
+    def conditionalPlural_batch(self, counts, words) :
+        '''Returns conditionalPlural() of every count with words, a word for
+        all of them or a sequence of one word per count, pluralizing every
+        distinct word once. A NumPy array of counts gives a NumPy array of
+        strings, any other sequence a list, see rules/batch.py.'''
+        if inherited(self.__class__, Base, 'conditionalPlural') :
+            return conditional_plurals(counts, words, self.pluralize)
+        return conditional_plurals(counts, words, self.pluralize, self.conditionalPlural)
 
 
     def titleize(self, word, uppercase = '') :
@@ -26,30 +81,68 @@ class Base:
             If second parameter is set to 'first' it will only
             capitalize the first character of the title.'''
     
-        if(uppercase == 'first'):
-            return self.humanize(self.underscore(word)).capitalize()
-        else :
-            return self.humanize(self.underscore(word)).title()
+        return self.pipeline('underscore', ('humanize', uppercase))(word)
 
 
     def camelize(self, word):
         ''' Returns given word as CamelCased
         Converts a word like "send_email" to "SendEmail". It
         will remove non alphanumeric character from the word, so
-        "who's online" will be converted to "WhoSOnline"'''
-        return ''.join(w[0].upper() + w[1:] for w in re.sub('[^A-Z^a-z^0-9^:]+', ' ', word).split(' '))
+        "who's online" will be converted to "WhoSOnline"
+        The acronyms of the class are spelled as they were added, see
+        add_acronym().'''
+        if self.acronyms:
+            return compiled_acronyms(self.__class__, identifier_separators.pattern).camelize(camelize_separators.split(word))
+        return ''.join([w[0].upper() + w[1:] for w in camelize_separators.split(word)])
     
     def underscore(self, word) :
         ''' Converts a word "into_it_s_underscored_version"
         Convert any "CamelCased" or "ordinary Word" into an
         "underscored_word".
-        This can be really useful for creating friendly URLs.'''
+        This can be really useful for creating friendly URLs.
+        The acronyms of the class are kept whole, see add_acronym().'''
         
-        return  re.sub('[^A-Z^a-z^0-9^\/]+','_', \
-                re.sub('([a-z\d])([A-Z])','\\1_\\2', \
-                re.sub('([A-Z]+)([A-Z][a-z])','\\1_\\2', re.sub('::', '/',word)))).lower()
+        if self.acronyms:
+            return compiled_acronyms(self.__class__, identifier_separators.pattern).underscore(word)
+        return identifier_separators.sub('_', word.replace('::', '/')).lower()
     
     
+    def unicode_words(self, word, separators) :
+        '''Splits word where separators, a pattern over the classes of its
+        characters, matches, going through the string of the classes.'''
+        words = []
+        position = 0
+        for match in character_classes.class_regex(separators).finditer(word.translate(character_classes)):
+            words.append(word[position:match.start()])
+            position = match.end()
+        words.append(word[position:])
+        return words
+    
+    def underscore_unicode(self, word) :
+        '''underscore() for identifiers in any script, so "\xdcberName"
+        becomes "\xfcber_name" with no unaccent() first: letters, digits
+        and marks are kept and split where their case changes, every other
+        character but "^" and "/" being a separator. ASCII words take the
+        regex of underscore().'''
+        word = word.replace('::', '/')
+        if isinstance(word, bytes) or ascii_word(word):
+            return identifier_separators.sub('_', word).lower()
+        if max(word) < astral:
+            return character_classes.regex(unicode_identifier_separators).sub('_', word).lower()
+        return '_'.join(self.unicode_words(word, unicode_identifier_separators)).lower()
+    
+    def camelize_unicode(self, word) :
+        '''camelize() for identifiers in any script, keeping the letters,
+        digits and marks of all of them, and the empty words before or
+        after separators out rather than failing on them.'''
+        if isinstance(word, bytes) or ascii_word(word):
+            words = camelize_separators.split(word)
+        elif max(word) < astral:
+            words = character_classes.regex(unicode_camelize_separators).split(word)
+        else:
+            words = self.unicode_words(word, unicode_camelize_separators)
+        return ''.join([w[0].upper() + w[1:] for w in words if w])
+    
     def humanize(self, word, uppercase = '') :
         '''Returns a human-readable string from word
         Returns a human-readable string from word, by replacing
@@ -59,9 +152,9 @@ class Base:
         pass 'all' as a second parameter.'''
         
         if(uppercase == 'first'):
-            return re.sub('_id$', '', word).replace('_',' ').capitalize()
+            return id_suffix.sub('', word).replace('_',' ').capitalize()
         else :
-            return re.sub('_id$', '', word).replace('_',' ').title()
+            return id_suffix.sub('', word).replace('_',' ').title()
     
     
     def variablize(self, word) :
@@ -75,13 +168,13 @@ class Base:
     def tableize(self, class_name) :
         ''' Converts a class name to its table name according to rails
         naming conventions. Example. Converts "Person" to "people" '''
-        return self.pluralize(self.underscore(class_name))
+        return self.pipeline('underscore', 'pluralize')(class_name)
     
     
     def classify(self, table_name) :
         '''Converts a table name to its class name according to rails
         naming conventions. Example: Converts "people" to "Person" '''
-        return self.camelize(self.singularize(table_name))
+        return self.pipeline('singularize', 'camelize')(table_name)
     
     
     def ordinalize(self, number) :
@@ -99,13 +192,21 @@ class Base:
         
         return str(number)+tail
     
+    def ordinalize_batch(self, numbers) :
+        '''Returns ordinalize() of every integer of numbers, a NumPy array of
+        strings for a NumPy array and a list for any other sequence, see
+        rules/batch.py.'''
+        if inherited(self.__class__, Base, 'ordinalize') :
+            return ordinals(numbers)
+        return ordinals(numbers, self.ordinalize)
+    
     
     def unaccent(self, text) :
         '''Transforms a string to its unaccented version. 
-        This might be useful for generating "friendly" URLs'''
-        find = u'\u00C0\u00C1\u00C2\u00C3\u00C4\u00C5\u00C6\u00C7\u00C8\u00C9\u00CA\u00CB\u00CC\u00CD\u00CE\u00CF\u00D0\u00D1\u00D2\u00D3\u00D4\u00D5\u00D6\u00D8\u00D9\u00DA\u00DB\u00DC\u00DD\u00DE\u00DF\u00E0\u00E1\u00E2\u00E3\u00E4\u00E5\u00E6\u00E7\u00E8\u00E9\u00EA\u00EB\u00EC\u00ED\u00EE\u00EF\u00F0\u00F1\u00F2\u00F3\u00F4\u00F5\u00F6\u00F8\u00F9\u00FA\u00FB\u00FC\u00FD\u00FE\u00FF'
-        replace = u'AAAAAAACEEEEIIIIDNOOOOOOUUUUYTsaaaaaaaceeeeiiiienoooooouuuuyty'
-        return self.string_replace(text, find, replace)
+        This might be useful for generating "friendly" URLs.
+        The replacements are looked up in one table, built as the
+        characters are first seen.'''
+        return unaccent_table.unaccent(text)
     
     def string_replace (self, word, find, replace) :
         '''This function returns a copy of word, translating
@@ -121,12 +222,24 @@ class Base:
         version ready to be inserted in friendly URLs'''
         return re.sub('^_|_$','',self.underscore(self.unaccent(text)))
     
+    def underscore_stream(self, source, chunk_size = 65536) :
+        '''Yields underscore() of the text of source, a file like object
+        or an iterable of strings, in pieces, reading it chunk_size
+        characters at a time. See rules/stream.py.'''
+        return underscored_chunks(read_chunks(source, chunk_size), identifier_separators)
+    
+    def urlize_stream(self, source, chunk_size = 65536) :
+        '''Yields urlize() of the text of source in pieces, like
+        underscore_stream().'''
+        return underscored_chunks(read_chunks(source, chunk_size), identifier_separators,
+                                  self.unaccent, True)
+    
     
     def demodulize(self, module_name) :
-        return self.humanize(self.underscore(re.sub('^.*::','',module_name)))
+        return self.pipeline(last_module, 'underscore', 'humanize')(module_name)
     
     def modulize(self, module_description) :
-        return self.camelize(self.singularize(module_description))
+        return self.pipeline('singularize', 'camelize')(module_description)
     
     def foreignKey(self, class_name, separate_class_name_and_id_with_underscore = 1) :
         ''' Returns class_name in underscored form, with "_id" tacked on at the end. 
@@ -135,7 +248,7 @@ class Base:
             tail = '_id'
         else :
             tail = 'id'
-        return self.underscore(self.demodulize(class_name))+tail;
+        return self.pipeline('demodulize', 'underscore', (append, tail))(class_name)
 
 
 
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# bermi a-t bermilabs - com
+# See the end of this file for the free software, open source license (BSD-style).
+
+'''ordinalize() and conditionalPlural() of many counts at once.
+
+    inflector.ordinalize_batch([1, 2, 11, 21])          # ['1st', '2nd', '11th', '21st']
+    inflector.conditionalPlural_batch(counts, 'item')   # one word per count
+
+The suffix of an ordinal only depends on the last two digits of the
+number, so it is looked up in a table of 100 suffixes instead of testing
+the number four times. conditionalPlural_batch() pluralizes every
+distinct word once, however many counts it is given.
+
+NumPy is optional. Given a NumPy array, both return a NumPy array of
+strings of the same shape. For integer arrays it is computed without a
+Python loop over the numbers: the digits of the ordinals are taken with
+% 10 and // 10 over all the numbers of the same length at once and
+written as the code points of a fixed width string array, and an array
+of words to pluralize is reduced to its distinct words with
+numpy.unique(). Bool and object arrays are ordinalized one by one. Any
+other sequence of integers gives a list.'''
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _ordinal_suffix(number):
+    if number % 100 in (11, 12, 13):
+        return 'th'
+    return {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')
+
+# The suffix of the ordinal of a number by number % 100.
+ordinal_suffixes = tuple([_ordinal_suffix(number) for number in range(100)])
+
+if numpy is not None:
+    # The code points of the two characters of every suffix.
+    _suffix_codes = [numpy.array([ord(suffix[position]) for suffix in ordinal_suffixes], numpy.uint32)
+                     for position in (0, 1)]
+    _powers = 10 ** numpy.arange(20, dtype = numpy.uint64)
+
+
+def is_array(values):
+    return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+def _array_ordinals(numbers):
+    '''Returns the ordinals of a NumPy integer array as a string array.'''
+    if numbers.dtype.kind not in 'iu':
+        raise TypeError('ordinals are only computed for integer arrays, not %s' % numbers.dtype)
+    flat = numbers.ravel()
+    if numbers.dtype.kind == 'i':
+        flat = flat.astype(numpy.int64)
+    negative = flat < 0
+    # The magnitude of the lowest int64 only fits unsigned.
+    magnitude = numpy.abs(flat).astype(numpy.uint64)
+    # Where the suffix of every ordinal starts.
+    ends = numpy.maximum(numpy.searchsorted(_powers, magnitude, side = 'right'), 1) + negative
+    width = flat.size and int(ends.max()) + 2 or 2
+    codes = numpy.zeros((flat.size, width), numpy.uint32)
+    index = flat % 100
+    for end in numpy.nonzero(numpy.bincount(ends))[0].tolist():
+        rows = numpy.nonzero(ends == end)[0]
+        group = numpy.zeros((rows.size, width), numpy.uint32)
+        remaining = magnitude[rows]
+        # A "0" is written where the sign goes, and replaced below.
+        for column in range(end - 1, -1, -1):
+            group[:, column] = remaining % 10 + 48
+            remaining //= 10
+        group[:, end] = _suffix_codes[0][index[rows]]
+        group[:, end + 1] = _suffix_codes[1][index[rows]]
+        codes[rows] = group
+    codes[negative, 0] = ord('-')
+    # Strings of width code points, the zeros after a shorter one being
+    # dropped as the padding of a NumPy string.
+    return codes.view(numpy.dtype(('U', width))).reshape(numbers.shape)
+
+
+def _listed(values):
+    if is_array(values):
+        return values.ravel().tolist()
+    return values
+
+
+def _like(values, results):
+    '''Returns results as an array shaped like values when it is one.'''
+    if is_array(values):
+        # numpy.array() is several times slower finding the width itself.
+        width = max([len(result) for result in results] or [1])
+        kind = results and isinstance(results[0], bytes) and 'S' or 'U'
+        return numpy.array(results, '%s%d' % (kind, width)).reshape(values.shape)
+    return results
+
+
+def ordinals(numbers, ordinalize = None):
+    '''Returns ordinalize() of every integer of numbers. ordinalize, when
+    given, is called for every number instead, for locales with one of
+    their own.'''
+    if ordinalize is not None:
+        return _like(numbers, [ordinalize(number) for number in _listed(numbers)])
+    if is_array(numbers):
+        if numbers.dtype.kind in 'bO':
+            # Python bools and integers, ordinalized one by one.
+            return _like(numbers, ordinals(_listed(numbers)))
+        return _array_ordinals(numbers)
+    suffixes = ordinal_suffixes
+    return [str(number) + suffixes[number % 100] for number in numbers]
+
+
+def conditional_plurals(counts, words, pluralize, conditional = None):
+    '''Returns conditionalPlural() of every count with words, one word for
+    all the counts or a sequence of one word per count, calling pluralize
+    once for every distinct word. conditional, when given, is called for
+    every count and word instead.'''
+    single = isinstance(words, (bytes, type(u'')))
+    if conditional is not None:
+        if single:
+            return _like(counts, [conditional(count, words) for count in _listed(counts)])
+        return _like(counts, [conditional(count, word) for count, word in zip(_listed(counts), _listed(words))])
+    if single:
+        plural = pluralize(words)
+        if is_array(counts):
+            return numpy.where(counts > 1, plural, words)
+        return [count > 1 and plural or words for count in counts]
+    if is_array(counts) and is_array(words):
+        distinct, inverse = numpy.unique(words.ravel(), return_inverse = True)
+        plurals = numpy.array([pluralize(word) for word in distinct.tolist()])
+        return numpy.where(counts > 1, plurals[inverse.ravel()].reshape(words.shape), words)
+    plurals = {}
+    results = []
+    for count, word in zip(_listed(counts), _listed(words)):
+        if count > 1:
+            plural = plurals.get(word)
+            if plural is None:
+                plural = plurals[word] = pluralize(word)
+            word = plural
+        results.append(word)
+    return _like(counts, results)
+
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software to deal in this software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of this software, and to permit
+# persons to whom this software is furnished to do so, subject to the following
+# condition:
+#
+# THIS SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THIS SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THIS SOFTWARE.
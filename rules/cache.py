@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# bermi a-t bermilabs - com
+# See the end of this file for the free software, open source license (BSD-style).
+
+'''On-disk cache of compiled rules, so a fresh interpreter does not parse
+and compile every rule pattern again.
+
+Compiled data is frozen into tuples, dicts, strings and the bytecode of
+its regexes, and written with marshal to <directory>/<name>-<digest>.cache.
+The digest covers the rule data, CACHE_VERSION, the Python version, the
+regex engine and the source of the modules building the data, so any
+change to one of them misses the cache instead of loading stale data.
+
+directory is $INFLECTOR_CACHE_DIR, or the __pycache__ directory next to
+this file; an empty INFLECTOR_CACHE_DIR turns the cache off. Failing to
+read or write a cache file is never an error, it only costs the time to
+compile the rules again.'''
+
+import hashlib
+import marshal
+import os
+import re
+import sys
+
+try:
+    from re import _parser as sre_parse
+    from re import _compiler as sre_compile
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_compile
+    import sre_constants
+
+import _sre
+
+CACHE_VERSION = 1
+
+directory = os.environ.get('INFLECTOR_CACHE_DIR',
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__'))
+
+
+def _canonical(value):
+    '''Returns value with dicts turned into sorted tuples of items, so its
+    repr does not depend on dict ordering.'''
+    if isinstance(value, dict):
+        return ('dict',) + tuple(sorted([(_canonical(key), _canonical(value[key])) for key in value]))
+    if isinstance(value, (list, tuple)):
+        return tuple([_canonical(item) for item in value])
+    if callable(value):
+        raise TypeError('%r can not be cached' % (value,))
+    return value
+
+
+_sources = {}
+
+def source_digest(filename):
+    '''Returns a digest of the source of the module loaded from filename.'''
+    path = os.path.splitext(filename)[0] + '.py'
+    digest = _sources.get(path)
+    if digest is None:
+        try:
+            source = open(path, 'rb').read()
+        except (IOError, OSError):
+            source = path
+        digest = _sources[path] = hashlib.sha1(source).hexdigest()
+    return digest
+
+
+def digest(*data):
+    '''Returns the cache key for data, which may hold tuples, lists,
+    dicts, strings, numbers and None.'''
+    key = (CACHE_VERSION, sys.version, sre_constants.MAGIC, _canonical(data))
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:20]
+
+
+def _path(name, key):
+    return os.path.join(directory, '%s-%s.cache' % (name, key))
+
+
+def load(name, key):
+    '''Returns the data stored for name and key, or None.'''
+    if not directory:
+        return None
+    try:
+        cache_file = open(_path(name, key), 'rb')
+        try:
+            version, data = marshal.load(cache_file)
+        finally:
+            cache_file.close()
+    except Exception:
+        return None
+    if version != CACHE_VERSION:
+        return None
+    return data
+
+
+def store(name, key, data):
+    '''Writes data for name and key; the file is written under a temporary
+    name and renamed, so concurrent readers never see half of it.'''
+    if not directory:
+        return
+    path = _path(name, key)
+    temporary = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        cache_file = open(temporary, 'wb')
+        try:
+            marshal.dump((CACHE_VERSION, data), cache_file)
+        finally:
+            cache_file.close()
+        os.rename(temporary, path)
+    except Exception:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+
+
+def freeze_regex(regex):
+    '''Returns the arguments _sre.compile() builds regex from, the work
+    re.compile() does in Python.'''
+    parsed = sre_parse.parse(regex.pattern, regex.flags)
+    state = getattr(parsed, 'state', None) or parsed.pattern
+    indexgroup = [None] * state.groups
+    for name, index in state.groupdict.items():
+        indexgroup[index] = name
+    # Opcodes and flags are int subclasses in Python 3, which marshal rejects.
+    return (regex.pattern, int(regex.flags | state.flags),
+            [int(code) for code in sre_compile._code(parsed, regex.flags)],
+            state.groups - 1, dict(state.groupdict), indexgroup)
+
+
+def thaw_regex(frozen):
+    '''Returns the regex frozen by freeze_regex().'''
+    pattern, flags, code, groups, groupindex, indexgroup = frozen
+    if sys.version_info[0] >= 3:
+        indexgroup = tuple(indexgroup)
+    return _sre.compile(pattern, flags, code, groups, groupindex, indexgroup)
+
+
+def compile_patterns(sources, flags = 0):
+    '''Returns re.compile(source, flags) for every source, compiling them
+    only when they are not in the cache.'''
+    key = digest('patterns', sources, flags, source_digest(__file__))
+    frozen = load('patterns', key)
+    if frozen is not None:
+        try:
+            return [thaw_regex(regex) for regex in frozen]
+        except Exception:
+            pass
+    regexes = [re.compile(source, flags) for source in sources]
+    try:
+        store('patterns', key, [freeze_regex(regex) for regex in regexes])
+    except Exception:
+        pass
+    return regexes
+
+
+class Lazy(object):
+    '''A class attribute computed as function(cls) the first time it is
+    read, then stored on the class in place of the descriptor.'''
+
+    def __init__(self, function):
+        self.function = function
+
+    def __get__(self, instance, owner):
+        value = self.function(owner)
+        for cls in getattr(owner, '__mro__', (owner,)):
+            for name, attribute in list(cls.__dict__.items()):
+                if attribute is self:
+                    setattr(cls, name, value)
+        return value
+
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software to deal in this software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of this software, and to permit
+# persons to whom this software is furnished to do so, subject to the following
+# condition:
+#
+# THIS SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THIS SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THIS SOFTWARE.
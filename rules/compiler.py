@@ -0,0 +1,637 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# bermi a-t bermilabs - com
+# See the end of this file for the free software, open source license (BSD-style).
+
+'''Ahead-of-time compiler from the noun rules of a locale class to plain
+Python code.
+
+Every rule that only looks at the end of the word is turned into
+endswith() tests and string slicing, grouped in one function per last
+character of the word, so pluralizing a word runs a dict lookup and a few
+string comparisons instead of a series of regex searches. Rules the
+compiler does not understand are called through their compiled regex, in
+the same place of the rule order, and words that are not plain ASCII go
+through the regular RuleSet.
+
+    python rules/compiler.py english English > rules/english_compiled.py
+
+writes a module whose English class is a drop-in replacement for
+rules.english.English, and load(English) builds the same class in memory:
+
+    Inflector(load(English)).pluralize('query')'''
+
+import marshal
+import re
+import types
+
+try:
+    from re import _compiler as sre_compile
+except ImportError:
+    import sre_compile
+
+from engine import sre_parse, sre_constants, compiled_rules, rule_data, generation, cache, _subpattern
+
+try:
+    _literal = ascii
+except NameError:
+    _literal = repr
+
+# Lower cased ASCII characters a generated function can see; words with
+# a new line or other characters are left to the regular RuleSet, so "$"
+# always means the end of the word.
+_domain = sorted(set([chr(code).lower() for code in range(128)]) - set(['\n']))
+
+_character_ops = (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN)
+
+max_paths = 64
+max_repeat = 8
+
+
+class Unsupported(Exception):
+    '''Raised for a pattern that can not be turned into suffix tests.'''
+
+
+def _character_set(parsed, node):
+    '''Returns the characters of _domain a single character node matches,
+    asking the re module itself so case folding follows re.IGNORECASE.'''
+    state = getattr(parsed, 'state', None) or parsed.pattern
+    regex = sre_compile.compile(parsed.__class__(state, [node]), re.IGNORECASE)
+    return frozenset([character for character in _domain if regex.match(character)])
+
+
+def _product(paths, alternatives):
+    paths = [path + alternative for path in paths for alternative in alternatives]
+    if len(paths) > max_paths:
+        raise Unsupported('too many alternatives')
+    return paths
+
+
+def _expand(parsed, items, loose = False):
+    '''Lists every way through items as a sequence of tokens: ("char", set),
+    ("star", set), ("open", group), ("close", group), ("bol",) and ("eol",),
+    in the order the re module would try them.
+
+    With loose, repeats that can not be listed become a ("gap",) token
+    followed by their last repetition, which is enough to tell what a word
+    has to contain for the pattern to match.'''
+    paths = [[]]
+    for op, av in items:
+        if op in _character_ops:
+            paths = _product(paths, [[('char', _character_set(parsed, (op, av)))]])
+        elif op is sre_constants.AT and av is sre_constants.AT_BEGINNING:
+            paths = _product(paths, [[('bol',)]])
+        elif op is sre_constants.AT and av is sre_constants.AT_END:
+            paths = _product(paths, [[('eol',)]])
+        elif op is sre_constants.SUBPATTERN:
+            group, sub_items = _subpattern(av)
+            sub_paths = _expand(parsed, sub_items, loose)
+            if group is not None:
+                sub_paths = [[('open', group)] + path + [('close', group)] for path in sub_paths]
+            paths = _product(paths, sub_paths)
+        elif op is sre_constants.BRANCH:
+            alternatives = []
+            for branch in av[1]:
+                alternatives += _expand(parsed, branch, loose)
+            paths = _product(paths, alternatives)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            low, high, sub_items = av
+            sub_items = list(sub_items)
+            if loose and (len(sub_items) != 1 or sub_items[0][0] not in _character_ops
+                          or (low and high == sre_constants.MAXREPEAT) or high > max_repeat):
+                if low:
+                    paths = _product(paths, [[('gap',)] + path for path in _expand(parsed, sub_items, loose)])
+                else:
+                    paths = _product(paths, [[('gap',)]])
+                continue
+            if len(sub_items) != 1 or sub_items[0][0] not in _character_ops:
+                raise Unsupported('repeat of more than one character')
+            characters = _character_set(parsed, sub_items[0])
+            if high == sre_constants.MAXREPEAT:
+                if low:
+                    raise Unsupported('unbounded repeat with a minimum')
+                paths = _product(paths, [[('star', characters)]])
+                continue
+            if high > max_repeat:
+                raise Unsupported('long repeat')
+            counts = list(range(low, high + 1))
+            if op is sre_constants.MAX_REPEAT:
+                counts.reverse()
+            paths = _product(paths, [[('char', characters)] * count for count in counts])
+        else:
+            raise Unsupported('unsupported pattern element')
+    return paths
+
+
+class Path(object):
+    '''One way a rule can match: an optional star over a set of characters
+    followed by fixed characters ending at the end of the word, or fixed
+    characters at the start of the word for rules only anchored with "^".
+    groups maps a group number to its (start, end) offsets within the
+    fixed characters; None stands for the start of the match.'''
+
+    def __init__(self, tokens):
+        self.bol = False
+        self.star = None
+        self.characters = []
+        self.groups = {}
+        self.dead = False
+        opened = {}
+        ended = False
+        for token in tokens:
+            kind = token[0]
+            if ended and kind != 'close':
+                if kind != 'char':
+                    raise Unsupported('pattern continues after "$"')
+                # "$" is followed by a character: impossible without a new line.
+                self.dead = True
+            elif kind == 'eol':
+                ended = True
+            elif kind == 'bol':
+                if self.characters or self.star is not None:
+                    raise Unsupported('"^" inside the pattern')
+                self.bol = True
+            elif kind == 'star':
+                if self.characters or self.star is not None:
+                    raise Unsupported('repeat inside the pattern')
+                self.star = token[1]
+            elif kind == 'char':
+                if not token[1]:
+                    self.dead = True
+                self.characters.append(token[1])
+            elif kind == 'open':
+                opened[token[1]] = self._position()
+            elif kind == 'close':
+                self.groups[token[1]] = (opened[token[1]], self._position())
+        if not ended and (not self.bol or self.star is not None):
+            raise Unsupported('pattern is not anchored at either end')
+        self.end_anchored = ended
+        self.width = len(self.characters)
+
+    def _position(self):
+        if not self.characters and self.star is None:
+            return None
+        return len(self.characters)
+
+    def last(self):
+        '''Characters the word can end with for this path, or None.'''
+        if self.characters and self.end_anchored:
+            return self.characters[-1]
+        return None
+
+
+def _set_test(expression, characters):
+    if len(characters) == 1:
+        return '%s == %s' % (expression, _literal(list(characters)[0]))
+    if len(characters) * 2 <= len(_domain):
+        return '%s in %s' % (expression, _literal(''.join(sorted(characters))))
+    excluded = [character for character in _domain if character not in characters]
+    return '%s not in %s' % (expression, _literal(''.join(excluded)))
+
+
+def _trie_words(trie):
+    '''Returns the plain ASCII words stored in a SuffixTrie.'''
+    words = []
+    pending = [('', trie.root)]
+    while pending:
+        suffix, node = pending.pop()
+        for character in node:
+            if character == '':
+                words.append(suffix)
+            elif character in _domain:
+                pending.append((character + suffix, node[character]))
+    return tuple(sorted(words))
+
+
+def _offset(distance):
+    if distance == 0:
+        return 'n'
+    return 'n - %d' % distance
+
+
+class Fallback(object):
+    '''A rule left to its regex, with a test every plain word it matches
+    passes and the characters such a word can end with, when known.'''
+
+    def __init__(self, rule):
+        self.guard = None
+        self.characters = None
+        try:
+            parsed = sre_parse.parse(rule.source, re.IGNORECASE)
+            paths = [self.path(tokens) for tokens in _expand(parsed, parsed, True)]
+        except Unsupported:
+            return
+        paths = [path for path in paths if path is not None]
+        tests = []
+        for suffix, runs, ending in paths:
+            if suffix:
+                test = 'lower.endswith(%s)' % _literal(suffix)
+            elif max(runs, key = len):
+                test = '%s in lower' % _literal(max(runs, key = len))
+            else:
+                tests = None
+                break
+            if test not in tests:
+                tests.append(test)
+        if tests is not None:
+            self.guard = ' or '.join(tests) or 'False'
+        if not [ending for suffix, runs, ending in paths if ending is None]:
+            self.characters = frozenset().union(*[ending for suffix, runs, ending in paths])
+
+    def path(self, tokens):
+        '''Returns (suffix, runs, ending) for a path: the literal characters
+        the word ends with, every run of literal characters in it and the
+        set of its last character, or None when the path can never match.'''
+        runs = ['']
+        suffix = ending = None
+        last = None
+        for token in tokens:
+            kind = token[0]
+            if kind == 'close':
+                continue
+            if suffix is not None:
+                if kind == 'char':
+                    return None
+                raise Unsupported('pattern continues after "$"')
+            if kind == 'eol':
+                suffix = runs[-1]
+                if last is not None and last[0] == 'char':
+                    ending = last[1]
+            elif kind == 'char' and not token[1]:
+                return None
+            elif kind == 'char' and len(token[1]) == 1:
+                runs[-1] += list(token[1])[0]
+            elif kind in ('char', 'star', 'gap', 'bol'):
+                runs.append('')
+            if kind != 'eol':
+                last = token
+        return suffix or '', runs, ending
+
+    def last(self):
+        '''Characters the word can end with for this rule to match, or None.'''
+        return self.characters
+
+
+class RuleCompiler(object):
+    '''Generates the code for one RuleSet; prefix names its globals.'''
+
+    def __init__(self, rule_set, prefix):
+        self.rule_set = rule_set
+        self.prefix = prefix
+        self.mappings = {}
+        self.entries = []
+        for index, rule in enumerate(rule_set.rules):
+            try:
+                paths = self.paths(rule)
+            except Unsupported:
+                fallback = Fallback(rule)
+                if fallback.guard != 'False':
+                    self.entries.append((index, fallback))
+                continue
+            for path in paths:
+                self.entries.append((index, path))
+
+    def paths(self, rule):
+        parsed = sre_parse.parse(rule.source, re.IGNORECASE)
+        paths = [Path(tokens) for tokens in _expand(parsed, parsed)]
+        if len(paths) > 1 and [path for path in paths if path.star is not None]:
+            raise Unsupported('repeat in an alternative')
+        if not rule.single and [path for path in paths if path.width == 0]:
+            raise Unsupported('empty match of a rule applied with re.sub')
+        paths = [path for path in paths if not path.dead]
+        prefixes = [path for path in paths if not path.end_anchored]
+        if prefixes:
+            if len(prefixes) != len(paths):
+                raise Unsupported('alternatives anchored at different ends')
+            # All of them can only match at the start: the first one wins.
+            return paths
+        # Every path ends at the end of the word, so the longest one that
+        # matches starts leftmost and wins; ties keep the pattern order.
+        paths.sort(key = lambda path: -path.width)
+        return paths
+
+    def bounds(self, path, start, end):
+        '''Returns the (start, end) expressions slicing a group out of the
+        word, "" standing for either end of it, or None for an empty group.'''
+        if not path.end_anchored:
+            start, end = start or 0, end or 0
+            if start == end:
+                return None
+            return str(start or ''), str(end)
+
+        def position(offset):
+            if offset is None:
+                if path.bol:
+                    return ''
+                if path.star is not None:
+                    return 'start'
+                offset = 0
+            return _offset(path.width - offset)
+        start, end = position(start), position(end)
+        if start == end:
+            return None
+        return start, end != 'n' and end or ''
+
+    def expression(self, index, path):
+        '''Returns the expression building the result of rule index when
+        path matched.'''
+        rule = self.rule_set.rules[index]
+        if path.bol or not path.end_anchored:
+            pieces = []
+        elif path.star is not None:
+            pieces = [('', 'start')]
+        elif path.width:
+            pieces = [('', _offset(path.width))]
+        else:
+            pieces = [('', '')]
+        for position, part in enumerate(rule.template):
+            if part.__class__ is int:
+                if part in path.groups and self.bounds(path, *path.groups[part]):
+                    pieces.append(self.bounds(path, *path.groups[part]))
+            elif part.__class__ is tuple:
+                if part[0] in path.groups and self.bounds(path, *path.groups[part[0]]):
+                    name = '%s_map_%d_%d' % (self.prefix, index, position)
+                    self.mappings[name] = (index, position)
+                    pieces.append('translate(word[%s:%s], %s)' % (self.bounds(path, *path.groups[part[0]]) + (name,)))
+            elif part:
+                pieces.append(_literal(part))
+        if not path.end_anchored:
+            pieces.append((str(path.width or ''), ''))
+        # Adjacent slices of the word are taken as one.
+        merged = []
+        for piece in pieces:
+            if piece.__class__ is tuple and merged and merged[-1].__class__ is tuple \
+                    and merged[-1][1] == piece[0]:
+                merged[-1] = (merged[-1][0], piece[1])
+            else:
+                merged.append(piece)
+        code = []
+        for piece in merged:
+            if piece == ('', ''):
+                code.append('word')
+            elif piece.__class__ is tuple:
+                code.append('word[%s:%s]' % piece)
+            else:
+                code.append(piece)
+        return ' + '.join(code) or "''"
+
+    def test(self, path):
+        if not path.end_anchored:
+            return self.prefix_test(path)
+        tests = []
+        if path.bol and path.star is None:
+            tests.append('n == %d' % path.width)
+        elif path.width:
+            tests.append('n >= %d' % path.width)
+        run = ''
+        distance = 0
+        for characters in reversed(path.characters):
+            distance += 1
+            if len(characters) == 1:
+                run = list(characters)[0] + run
+                continue
+            if run:
+                tests.append(self.run_test(run, distance - 1 - len(run)))
+                run = ''
+            tests.append(_set_test('lower[-%d]' % distance, characters))
+        if run:
+            tests.append(self.run_test(run, distance - len(run)))
+        if path.bol and path.star is not None and path.star != frozenset(_domain):
+            tests.append("not lower[:%s].lstrip(%s)" % (_offset(path.width), _literal(''.join(sorted(path.star)))))
+        return ' and '.join(tests) or 'True'
+
+    def prefix_test(self, path):
+        tests = []
+        if path.width:
+            tests.append('n >= %d' % path.width)
+        run = ''
+        for position, characters in enumerate(path.characters + [None]):
+            if characters is not None and len(characters) == 1:
+                run += list(characters)[0]
+                continue
+            if len(run) == 1:
+                tests.append('lower[%d] == %s' % (position - 1, _literal(run)))
+            elif run:
+                tests.append('lower.startswith(%s, %d)' % (_literal(run), position - len(run)))
+            run = ''
+            if characters is not None:
+                tests.append(_set_test('lower[%d]' % position, characters))
+        return ' and '.join(tests) or 'True'
+
+    def run_test(self, run, distance):
+        if len(run) == 1:
+            return "lower[-%d] == %s" % (distance + 1, _literal(run))
+        if distance == 0:
+            return 'lower.endswith(%s)' % _literal(run)
+        return 'lower.endswith(%s, 0, n - %d)' % (_literal(run), distance)
+
+    def start(self, path):
+        '''Statement setting "start" for a path beginning with a star.'''
+        if path.star == frozenset(_domain):
+            return 'start = 0'
+        return 'start = len(lower[:%s].rstrip(%s))' % (_offset(path.width), _literal(''.join(sorted(path.star))))
+
+    def entry_code(self, index, path):
+        lines = []
+        if path.__class__ is Fallback:
+            rule = '%s_rules[%d]' % (self.prefix, index)
+            window = self.rule_set.rules[index].window
+            indent = '    '
+            if path.guard is not None:
+                lines.append('    if %s:' % path.guard)
+                indent = '        '
+            if window is None:
+                lines.append(indent + 'match = %s.search(word)' % rule)
+                lines.append(indent + 'if match:')
+                lines.append(indent + '    return %s.apply(word, match)' % rule)
+            else:
+                lines.append(indent + 'match = %s.search(word[-%d:])' % (rule, window))
+                lines.append(indent + 'if match:')
+                lines.append(indent + '    return word[:-%d] + %s.apply(word[-%d:], match)' % (window, rule, window))
+            return lines
+        test = self.test(path)
+        indent = '    '
+        if test != 'True':
+            lines.append('    if %s:' % test)
+            indent = '        '
+        if path.star is not None and not path.bol:
+            lines.append(indent + self.start(path))
+        lines.append(indent + 'return ' + self.expression(index, path))
+        return lines
+
+    def buckets(self):
+        '''Returns {last character: entries} and the entries for any
+        other last character.'''
+        explicit = set()
+        for index, path in self.entries:
+            if path.last() is not None and len(path.last()) <= 8:
+                explicit.update(path.last())
+        buckets = {}
+        for character in sorted(explicit):
+            buckets[character] = [(index, path) for index, path in self.entries
+                                  if path.last() is None or character in path.last()]
+        default = [(index, path) for index, path in self.entries
+                   if path.last() is None or path.last() - explicit]
+        return buckets, default
+
+    def function(self, name, entries):
+        lines = ['def %s(word, lower, n):' % name]
+        previous = None
+        for index, path in entries:
+            if index != previous:
+                lines.append('    # %s' % _literal(self.rule_set.rules[index].pattern))
+                previous = index
+            code = self.entry_code(index, path)
+            lines += code
+            if code[-1].startswith('    return'):
+                # Nothing after a rule that always matches is reachable.
+                return lines
+        lines.append('    return None')
+        return lines
+
+    def code(self, function_name):
+        prefix = self.prefix
+        buckets, default = self.buckets()
+        functions = []
+        names = {}
+        for character in sorted(buckets):
+            name = '%s_%d' % (prefix, ord(character))
+            names[character] = name
+            functions += self.function(name, buckets[character]) + ['', '']
+        functions += self.function(prefix + '_default', default) + ['', '']
+
+        lines = []
+        lines.append("%s = compiled_rules(_Source, %s, 'linear')" % (prefix, _literal(prefix[1:])))
+        lines.append('%s_rules = %s.rules' % (prefix, prefix))
+        lines.append('%s_irregular = %s.irregular_words.longest_suffix' % (prefix, prefix))
+        lines.append('%s_uncountable_words = %s' % (prefix, _literal(_trie_words(self.rule_set.uncountable_words))))
+        lines.append('%s_irregular_words = %s' % (prefix, _literal(_trie_words(self.rule_set.irregular_words))))
+        body = functions
+        body.append('%s_dispatch = {' % prefix)
+        for character in sorted(names):
+            body.append('    %s: %s,' % (_literal(character), names[character]))
+        body.append('}')
+        body.append('')
+        body.append('')
+        body.append('def %s(word):' % function_name)
+        body.append('    if not _plain(word):')
+        body.append('        return %s.apply(word)' % prefix)
+        body.append('    lower = word.lower()')
+        body.append('    if lower.endswith(%s_uncountable_words):' % prefix)
+        body.append('        return word')
+        if self.rule_set.exact_words:
+            body.append('    if lower in %s.exact_words:' % prefix)
+            body.append('        return recase(word, lower, %s.exact_words[lower], %s.capitals)' % (prefix, prefix))
+        body.append('    if lower.endswith(%s_irregular_words):' % prefix)
+        body.append('        irregular = %s_irregular(lower)' % prefix)
+        body.append('        return recase(word, lower, lower[:len(lower) - irregular[0]] + irregular[1], %s.capitals)' % prefix)
+        # The rules run on the lower cased word, which has the same length.
+        body.append('    result = %s_dispatch.get(lower[-1:], %s_default)(lower, lower, len(lower))' % (prefix, prefix))
+        body.append('    if result is None:')
+        body.append('        return word')
+        for index in range(len(self.rule_set.accents)):
+            body.append('    result = %s.accents[%d].apply(lower, result)' % (prefix, index))
+        body.append('    return recase(word, lower, result, %s.capitals)' % prefix)
+        # Placeholder mappings are collected while the functions are generated.
+        for name in sorted(self.mappings):
+            lines.append('%s = %s_rules[%d].template[%d][1]' % ((name, prefix) + self.mappings[name]))
+        return lines + ['', ''] + body
+
+
+def _kinds(locale):
+    return [kind for kind in ('plural', 'singular') if hasattr(locale, kind + '_rules')]
+
+
+def generate(locale):
+    '''Returns the source of a module defining a subclass of locale, with
+    the same name, whose pluralize and singularize run generated code.'''
+    module = locale.__module__
+    engine = compiled_rules.__module__
+    lines = [
+        '#!/usr/bin/env python3',
+        '',
+        '# Generated by rules/compiler.py from %s.%s, do not edit.' % (module, locale.__name__),
+        '',
+        'import re',
+        'from %s import compiled_rules, recase, translate' % engine,
+        'from %s import %s as _Source' % (module, locale.__name__),
+        '',
+        "_plain = re.compile('[\\\\x00-\\\\x09\\\\x0b-\\\\x7f]*\\\\Z').match",
+        '',
+    ]
+    for kind in _kinds(locale):
+        rule_set = compiled_rules(locale, kind, 'linear')
+        lines += RuleCompiler(rule_set, '_' + kind).code(kind + 'ize') + ['', '']
+    lines.append('class %s(_Source):' % locale.__name__)
+    lines.append("    '''%s with its noun rules compiled to Python code.'''" % locale.__name__)
+    for kind in _kinds(locale):
+        lines.append('')
+        lines.append('    def %size(self, word):' % kind)
+        lines.append('        return %size(word)' % kind)
+    return '\n'.join(lines) + '\n'
+
+
+_loaded = {}
+
+def _code(locale):
+    '''Returns the code object of the generated module for locale.'''
+    try:
+        key = cache.digest('generated', locale.__module__, locale.__name__,
+                           getattr(locale, 'rule_mode', None),
+                           rule_data(locale, 'plural'), rule_data(locale, 'singular'),
+                           cache.source_digest(__file__), cache.source_digest(compiled_rules.__code__.co_filename))
+    except TypeError:
+        key = None
+    code = key and cache.load('generated', key)
+    if code:
+        try:
+            return marshal.loads(code)
+        except Exception:
+            pass
+    code = compile(generate(locale), '<%s compiled>' % locale.__name__, 'exec')
+    if key:
+        cache.store('generated', key, marshal.dumps(code))
+    return code
+
+
+def load(locale):
+    '''Returns the generated class for locale, compiling it in memory the
+    first time it is requested and again after its rules are changed,
+    see engine.CustomRules. The compiled code is kept in the on-disk
+    cache, see the cache module.'''
+    key = (locale, generation(locale))
+    module = _loaded.get(key)
+    if module is None:
+        module = types.ModuleType(locale.__module__ + '_compiled')
+        exec(_code(locale), module.__dict__)
+        # The module is kept alive, its functions use it as their globals,
+        # also when a later generation replaces it.
+        _loaded[key] = module
+    return getattr(module, locale.__name__)
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) != 3:
+        sys.stderr.write('usage: python rules/compiler.py <module> <class>\n')
+        sys.exit(2)
+    module = __import__(sys.argv[1])
+    sys.stdout.write(generate(getattr(module, sys.argv[2])))
+
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software to deal in this software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of this software, and to permit
+# persons to whom this software is furnished to do so, subject to the following
+# condition:
+#
+# THIS SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THIS SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THIS SOFTWARE.
@@ -0,0 +1,1483 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# bermi a-t bermilabs - com
+# See the end of this file for the free software, open source license (BSD-style).
+
+import inspect
+import re
+import unicodedata
+
+try:
+    from re import _parser as sre_parse
+    from re import _compiler as sre_compile
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_compile
+    import sre_constants
+
+try:
+    from . import cache
+    from .acronyms import Acronyms
+except (ImportError, ValueError):
+    import cache
+    from acronyms import Acronyms
+
+_group_reference = re.compile(r'\\(\d+)|\\g<(\d+)>')
+
+
+def parse_template(replacement, groups = 0, placeholders = None):
+    '''Splits a replacement like "\\1ices" into a tuple of literal strings
+    and group numbers, so it can be expanded without going through the
+    re module template parser on every call.
+
+    placeholders maps a marker character to a (find, replace) pair of
+    character lists. A replacement starting with the marker has each of
+    its "<marker><n>" references, for n below the number of groups in the
+    pattern, turned into a (group, table) part that renders group n with
+    the characters in find swapped for those in replace, table being
+    their translation().'''
+    parts = []
+    position = 0
+    for reference in _group_reference.finditer(replacement):
+        if reference.start() > position:
+            parts.append(replacement[position:reference.start()])
+        parts.append(int(reference.group(1) or reference.group(2)))
+        position = reference.end()
+    if position < len(replacement):
+        parts.append(replacement[position:])
+
+    marker = replacement[:1]
+    if placeholders and marker in placeholders:
+        find, replace = placeholders[marker]
+        table = translation(dict(zip(find, replace)))
+        for group in range(1, groups):
+            token = marker + str(group)
+            split = []
+            for part in parts:
+                if part.__class__ is int or token not in part:
+                    split.append(part)
+                    continue
+                pieces = part.split(token)
+                for piece in pieces[:-1]:
+                    if piece:
+                        split.append(piece)
+                    split.append((group, table))
+                if pieces[-1]:
+                    split.append(pieces[-1])
+            parts = split
+    return tuple(parts)
+
+
+def translation(mapping):
+    '''Returns the table translate() swaps the characters of mapping, a
+    {character: replacement} dict, with: the {ordinal: replacement} dict
+    str.translate takes for text strings, the 256 byte table it takes for
+    byte strings or None, and mapping, for the strings neither fits.
+    Single byte characters and replacements are Latin-1, like the
+    literals of the locales, so text strings find them by the same
+    ordinal.'''
+    ordinals = {}
+    characters = bytearray(range(256))
+    for character, replacement in mapping.items():
+        if character.__class__ is not bytes:
+            ordinals[ord(character)] = replacement
+            characters = None
+            continue
+        if len(character) == 1:
+            if replacement.__class__ is bytes:
+                ordinals[ord(character)] = replacement.decode('latin-1')
+            else:
+                ordinals[ord(character)] = replacement
+        if characters is not None and len(character) == 1 and replacement.__class__ is bytes \
+                and len(replacement) == 1:
+            characters[ord(character)] = ord(replacement)
+        else:
+            characters = None
+    if characters is not None:
+        characters = bytes(characters)
+    if len(ordinals) != len(mapping):
+        ordinals = None
+    return ordinals, characters, mapping
+
+
+def translate(text, table):
+    '''Replaces every character of text found in the mapping of table,
+    from translation().'''
+    ordinals, characters, mapping = table
+    if text.__class__ is bytes:
+        if characters is not None:
+            return text.translate(characters)
+    elif ordinals is not None:
+        return text.translate(ordinals)
+    return ''.join([mapping.get(character, character) for character in text])
+
+
+# The blocks of combining marks UnaccentTable drops: diacritics, not the
+# marks other scripts spell letters with, like the kana voicing marks.
+_diacritic_blocks = ((0x0300, 0x0370), (0x1ab0, 0x1b00), (0x1dc0, 0x1e00), (0x20d0, 0x2100), (0xfe20, 0xfe30))
+
+
+def _diacritic(character):
+    code = ord(character)
+    for start, end in _diacritic_blocks:
+        if start <= code < end:
+            return True
+    return False
+
+
+class UnaccentTable(dict):
+    '''The {code point: replacement} table unicode.translate() takes out
+    the accents with, filled in as characters are first seen.
+
+    Latin-1 characters are swapped for those of replace when in find and
+    kept otherwise. Any other character is decomposed with NFKD, which
+    also turns ligatures and full width forms into plain letters, and
+    recomposed without its diacritics, so a character only made of them
+    is dropped.'''
+
+    def __init__(self, find, replace):
+        dict.__init__(self)
+        self.latin = dict(zip(find, replace))
+        characters = bytearray(range(256))
+        for character, replacement in self.latin.items():
+            characters[ord(character)] = ord(replacement)
+        self.characters = bytes(characters)
+
+    def __missing__(self, code):
+        character = _character(code, u'')
+        if code < 256:
+            replacement = self.latin.get(character, character)
+        else:
+            replacement = u''.join([part for part in unicodedata.normalize('NFKD', character)
+                                    if not _diacritic(part)])
+            replacement = u''.join([self.latin.get(part, part)
+                                    for part in unicodedata.normalize('NFC', replacement)])
+        self[code] = replacement
+        return replacement
+
+    def unaccent(self, text):
+        '''Returns text without accents. Python 2 byte strings are read as
+        Latin-1 and come back as unicode when anything was replaced, the
+        other bytes having to be ASCII.'''
+        if isinstance(text, bytes) and bytes is str:
+            unaccented = text.translate(self.characters)
+            if unaccented == text:
+                return text
+            return unaccented.decode('ascii')
+        return text.translate(self)
+
+
+def _character_class(character):
+    category = unicodedata.category(character)
+    if character in u'^/:':
+        return character
+    if category in ('Lu', 'Lt'):
+        return u'u'
+    if category == 'Ll':
+        return u'l'
+    if category == 'Nd':
+        return u'd'
+    if category[0] in 'LN':
+        return u'o'
+    if category[0] == 'M':
+        return u'm'
+    return u's'
+
+
+class CharacterClassTable(dict):
+    '''The {code point: class} table unicode.translate() turns a word into
+    a string of the classes of its characters with:
+
+        u  upper or title case letter     l  lower case letter
+        d  decimal digit                  o  other letter or number
+        m  combining mark                 s  separator
+        ^ / :  themselves
+
+    The classes of a block of 256 code points are looked up together the
+    first time one of them is seen.
+
+    Patterns over the classes, with sets like [%(ldom)s] for the letters
+    of no case and the digits, are compiled by regex() into regexes over
+    the characters themselves and by class_regex() into regexes over the
+    strings of classes.'''
+
+    def __init__(self):
+        dict.__init__(self)
+        self.sets = None
+        self.regexes = {}
+        self.class_regexes = {}
+
+    def __missing__(self, code):
+        start = code - code % 256
+        for other in range(start, start + 256):
+            self[other] = _character_class(_character(other, u''))
+        return self[code]
+
+    def _sets(self):
+        '''Returns {class: the characters of the Basic Multilingual Plane
+        of the class as the ranges of a regex set}.'''
+        if self.sets is None:
+            ranges = {}
+            for code in range(0x10000):
+                members = ranges.setdefault(_character_class(_character(code, u'')), [])
+                if members and members[-1][1] == code - 1:
+                    members[-1][1] = code
+                else:
+                    members.append([code, code])
+            escaped = lambda code: re.escape(_character(code, u'')) if code < 128 else _character(code, u'')
+            self.sets = dict([(kind, u''.join([escaped(start) + (end > start and u'-' + escaped(end) or u'')
+                                               for start, end in members]))
+                              for kind, members in ranges.items()])
+        return self.sets
+
+    def regex(self, pattern):
+        '''Returns pattern compiled over characters of the Basic
+        Multilingual Plane, which sre checks against the big sets in
+        constant time with a bitmap per block of 256 code points. Words
+        with other characters go through class_regex().'''
+        regex = self.regexes.get(pattern)
+        if regex is None:
+            sets = self._sets()
+            names = set(re.findall(r'%\((\w+)\)s', pattern))
+            regex = self.regexes[pattern] = re.compile(
+                pattern % dict([(name, u''.join([sets.get(kind, u'') for kind in name])) for name in names]),
+                re.UNICODE)
+        return regex
+
+    def class_regex(self, pattern):
+        '''Returns pattern compiled over the strings of classes
+        unicode.translate() turns words into with the table.'''
+        regex = self.class_regexes.get(pattern)
+        if regex is None:
+            names = set(re.findall(r'%\((\w+)\)s', pattern))
+            regex = self.class_regexes[pattern] = re.compile(pattern % dict([(name, name) for name in names]))
+        return regex
+
+
+def is_end_anchored(parsed):
+    '''True when a parsed pattern is a plain sequence ending in "$", so it
+    can match at most once and the result can be spliced instead of
+    running re.sub over the word again.'''
+    data = parsed.data
+    return bool(data) and data[-1] == (sre_constants.AT, sre_constants.AT_END) \
+        and not [op for op, av in data if op is sre_constants.BRANCH]
+
+
+def _subpattern(av):
+    '''Returns (group, items) for a SUBPATTERN node on both the old
+    (group, items) and the newer (group, add_flags, del_flags, items) layout.'''
+    return av[0], av[-1]
+
+
+def _ends_with_end_anchor(items):
+    items = list(items)
+    if not items:
+        return False
+    op, av = items[-1]
+    if op is sre_constants.AT:
+        return av is sre_constants.AT_END
+    if op is sre_constants.BRANCH:
+        return not [branch for branch in av[1] if not _ends_with_end_anchor(branch)]
+    if op is sre_constants.SUBPATTERN:
+        return _ends_with_end_anchor(_subpattern(av)[1])
+    return False
+
+
+def _starts_with_start_anchor(items):
+    items = list(items)
+    if not items:
+        return False
+    op, av = items[0]
+    if op is sre_constants.AT:
+        return av is sre_constants.AT_BEGINNING
+    if op is sre_constants.BRANCH:
+        return not [branch for branch in av[1] if not _starts_with_start_anchor(branch)]
+    if op is sre_constants.SUBPATTERN:
+        return _starts_with_start_anchor(_subpattern(av)[1])
+    return False
+
+
+def is_start_anchored(source):
+    '''True when every alternative of a pattern begins with "^", so
+    re.match finds the same match as re.search without trying every
+    position of the word.'''
+    return _starts_with_start_anchor(sre_parse.parse(source))
+
+
+def _max_width(items, free_group, free = False):
+    '''Longest string items can match, or None when unbounded.
+
+    A leading ".*" counts as zero width when it sits at the start of
+    free_group: it only repeats whatever precedes the part of the word
+    the rule looks at, and that group is copied to the output unchanged.'''
+    width = 0
+    leading = True
+    for op, av in items:
+        if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN):
+            width += 1
+        elif op is sre_constants.AT:
+            continue
+        elif op is sre_constants.SUBPATTERN:
+            group, sub_items = _subpattern(av)
+            sub_free = leading and (free or (group is not None and group == free_group))
+            sub_width = _max_width(sub_items, free_group, sub_free)
+            if sub_width is None:
+                return None
+            width += sub_width
+        elif op is sre_constants.BRANCH:
+            widths = [_max_width(branch, free_group, leading and free) for branch in av[1]]
+            if None in widths:
+                return None
+            width += max(widths)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            low, high, sub_items = av
+            sub_items = list(sub_items)
+            if leading and free and low == 0 and high == sre_constants.MAXREPEAT \
+                    and [op for op, av in sub_items] == [sre_constants.ANY]:
+                pass
+            elif high == sre_constants.MAXREPEAT:
+                return None
+            else:
+                sub_width = _max_width(sub_items, free_group)
+                if sub_width is None:
+                    return None
+                width += high * sub_width
+        else:
+            return None
+        leading = False
+    return width
+
+
+def suffix_window(source, template = ()):
+    '''Returns how many trailing characters of a word a pattern needs to
+    see, or None when it has to see the whole word.
+
+    Only patterns anchored at the end with "$" and of bounded width have
+    a window; a leading ".*" inside the group the template starts with is
+    allowed. Matching such a pattern against word[-window:] and putting
+    word[:-window] back in front gives the same result as matching the
+    whole word, with "search" or "match" semantics alike: the window is
+    one character longer than anything the pattern can match, so a "^"
+    or an implicitly anchored alternative can never match inside it.'''
+    parsed = sre_parse.parse(source)
+    if not _ends_with_end_anchor(parsed):
+        return None
+    free_group = None
+    if template and template[0].__class__ is int and list(template).count(template[0]) == 1:
+        free_group = template[0]
+    width = _max_width(parsed, free_group)
+    if width is None:
+        return None
+    return width + 1
+
+
+def _character_set(op, av):
+    '''Returns the lower cased characters a single character node can
+    match, or None when it may match characters outside ASCII other than
+    the case variants of its own letters, or a new line.'''
+    if op is sre_constants.LITERAL:
+        items = [(op, av)]
+    elif op is sre_constants.IN:
+        items = av
+    else:
+        return None
+    characters = set()
+    for item_op, item_av in items:
+        if item_op is sre_constants.LITERAL:
+            low = high = item_av
+        elif item_op is sre_constants.RANGE:
+            low, high = item_av
+        else:
+            return None
+        if high > 127 or low <= 10 <= high:
+            return None
+        characters.update([chr(code).lower() for code in range(low, high + 1)])
+    return ''.join(sorted(characters))
+
+
+def _concatenate(tails, endings, depth):
+    '''Puts each of endings in front of each of tails.'''
+    result = []
+    for characters, complete in tails:
+        if complete and len(characters) < depth:
+            extended = [((characters + more)[:depth], more_complete) for more, more_complete in endings]
+        else:
+            extended = [(characters, complete)]
+        for tail in extended:
+            if tail not in result:
+                result.append(tail)
+    return result
+
+
+def _endings(op, av, depth):
+    if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN):
+        return [((_character_set(op, av),), True)]
+    if op is sre_constants.AT:
+        return [((), True)]
+    if op is sre_constants.SUBPATTERN:
+        return _tails(_subpattern(av)[1], depth)
+    if op is sre_constants.BRANCH:
+        endings = []
+        for branch in av[1]:
+            endings += _tails(branch, depth)
+        return endings
+    if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+        low, high, sub_items = av
+        repeated_endings = _tails(sub_items, depth)
+        if [characters for characters, complete in repeated_endings if not characters]:
+            return [((), False)]
+        # Every repetition adds a character, so repeating more than depth
+        # times only changes what precedes the last depth characters.
+        endings = []
+        repeated = [((), True)]
+        for count in range(min(high, max(low, depth)) + 1):
+            if count >= low:
+                endings += repeated
+            repeated = _concatenate(repeated, repeated_endings, depth)
+            if len(repeated) > 64:
+                return [((), False)]
+        return endings
+    return [((), False)]
+
+
+def _tails(items, depth):
+    '''Lists the ways items can end as (characters, complete) pairs:
+    characters holds the sets of the last characters, last first, and
+    complete is False when what comes before them is unknown.'''
+    tails = [((), True)]
+    for op, av in reversed(list(items)):
+        tails = _concatenate(tails, _endings(op, av, depth), depth)
+        if len(tails) > 64:
+            return [((), False)]
+    return tails
+
+
+def suffix_sets(source, depth = 3):
+    '''Returns, for each of the last depth characters of a word, last
+    first, the lower cased characters it must be one of for the pattern
+    to match, or None when it can be any.
+
+    Sets are only given for characters of patterns anchored with "$"
+    that can only be ASCII characters, or the case variants of ASCII
+    letters, and never a new line; so when two patterns have disjoint
+    sets at a position, no word can match both.'''
+    parsed = sre_parse.parse(source)
+    if not _ends_with_end_anchor(parsed):
+        return (None,) * depth
+    tails = _tails(parsed, depth)
+    sets = []
+    for position in range(depth):
+        characters = [tail[position] if position < len(tail) else None for tail, complete in tails]
+        if None in characters:
+            sets.append(None)
+        else:
+            sets.append(''.join(sorted(set(''.join(characters)))))
+    return tuple(sets)
+
+
+def _matches(op, av, character):
+    '''True when a single character node matches character, ignoring case.'''
+    node = sre_parse.parse('x')
+    node.data = [(op, av)]
+    return bool(sre_compile.compile(node, re.IGNORECASE).match(character))
+
+
+def _nullable(items):
+    '''True when items can match the empty string at the end of a word,
+    or None when they hold an element that is not a character, a group,
+    an alternation, a repeat or "$".'''
+    for op, av in items:
+        if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN):
+            return False
+        if op is sre_constants.AT:
+            if av is not sre_constants.AT_END:
+                return None
+        elif op is sre_constants.SUBPATTERN:
+            nullable = _nullable(_subpattern(av)[1])
+            if not nullable:
+                return nullable
+        elif op is sre_constants.BRANCH:
+            branches = [_nullable(branch) for branch in av[1]]
+            if None in branches:
+                return None
+            if True not in branches:
+                return False
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            if av[0]:
+                return False
+        else:
+            return None
+    return True
+
+
+def matches_everything(source):
+    '''True when a pattern is found in every word, at its end if nowhere
+    else, like the "$" catch-all rules close the rule lists with.'''
+    return bool(_nullable(sre_parse.parse(source)))
+
+
+def _never_matches(items, ended = 0):
+    '''Returns (dead, ended) for items: dead when no word can match them,
+    ended 1 past a "$", 2 past a "$" and a new line, 0 when unknown.'''
+    for op, av in items:
+        if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN):
+            # Past "$" only a final new line is left in the word.
+            if ended and (ended == 2 or not _matches(op, av, '\n')):
+                return True, ended
+            if ended:
+                ended = 2
+        elif op is sre_constants.AT:
+            if av is sre_constants.AT_END:
+                ended = max(ended, 1)
+        elif op is sre_constants.SUBPATTERN:
+            dead, ended = _never_matches(_subpattern(av)[1], ended)
+            if dead:
+                return True, ended
+        elif op is sre_constants.BRANCH:
+            branches = [_never_matches(branch, ended) for branch in av[1]]
+            live = [branch_ended for dead, branch_ended in branches if not dead]
+            if not live:
+                return True, ended
+            ended = min(live)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            if ended and av[0] and _never_matches(av[2], ended)[0]:
+                return True, ended
+            ended = 0
+        else:
+            return False, 0
+    return False, ended
+
+
+def never_matches(source):
+    '''True when no word can match a pattern, like one with characters
+    after its "$" that a new line can not stand for.'''
+    return _never_matches(sre_parse.parse(source))[0]
+
+
+def _suffix_nodes(items, nodes):
+    for op, av in items:
+        if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN):
+            nodes.append((op, av))
+        elif op is sre_constants.SUBPATTERN:
+            if not _suffix_nodes(_subpattern(av)[1], nodes):
+                return False
+        else:
+            return False
+    return True
+
+
+def suffix_nodes(source):
+    '''Returns the character nodes, last first, of a pattern made of
+    nothing but characters followed by "$", which matches exactly the
+    words ending with such characters; None for any other pattern.'''
+    parsed = sre_parse.parse(source)
+    items = list(parsed)
+    if not items or items[-1] != (sre_constants.AT, sre_constants.AT_END):
+        return None
+    nodes = []
+    if not _suffix_nodes(items[:-1], nodes) or not nodes:
+        return None
+    nodes.reverse()
+    return nodes
+
+
+def _whole_words(items, words, limit):
+    '''Returns the strings, at most limit, items can match from the start
+    of a word put after each of words, or None.'''
+    for op, av in items:
+        if op is sre_constants.AT and av in (sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING):
+            # "^" only matches where nothing was matched yet.
+            words = [word for word in words if not word]
+            continue
+        if op is sre_constants.LITERAL:
+            choices = [(op, av)]
+        elif op is sre_constants.IN:
+            choices = av
+        else:
+            choices = None
+        if choices is not None:
+            characters = []
+            for item_op, item_av in choices:
+                if item_op is sre_constants.LITERAL:
+                    low = high = item_av
+                elif item_op is sre_constants.RANGE:
+                    low, high = item_av
+                else:
+                    return None
+                if high > 127:
+                    return None
+                characters += [chr(code) for code in range(low, high + 1) if chr(code) not in characters]
+            extended = [word + character for word in words for character in characters]
+        elif op is sre_constants.SUBPATTERN:
+            if len(av) == 4 and (av[1] or av[2]):
+                return None
+            extended = _whole_words(_subpattern(av)[1], words, limit)
+        elif op is sre_constants.BRANCH:
+            extended = []
+            for branch in av[1]:
+                branch_words = _whole_words(branch, words, limit)
+                if branch_words is None:
+                    return None
+                extended += [word for word in branch_words if word not in extended]
+        else:
+            return None
+        if extended is None or len(extended) > limit:
+            return None
+        words = extended
+    return words
+
+
+def whole_words(source, limit = 256):
+    '''Returns the words re.match finds a pattern ending with "$" in, as
+    written in the pattern, or None when there are more than limit, when
+    it may match other characters than ASCII ones, or holds a repeat or
+    another element that is not a character, a group, an alternation or
+    "^". Words followed by a new line, which "$" matches before, are not
+    listed.'''
+    items = list(sre_parse.parse(source))
+    if not items or items[-1] != (sre_constants.AT, sre_constants.AT_END):
+        return None
+    return _whole_words(items[:-1], [''], limit)
+
+
+def shadows(rule, later):
+    '''True when every word later matches is matched by rule as well, so
+    later can never fire after it.'''
+    if rule.source == later.source or matches_everything(rule.source):
+        return True
+    nodes = suffix_nodes(rule.source)
+    if nodes is None or len(nodes) > len(later.suffix) or later.suffix[0] is None:
+        return False
+    for node, characters in zip(nodes, later.suffix):
+        if characters is None:
+            return False
+        for character in characters:
+            if not _matches(node[0], node[1], character):
+                return False
+    return True
+
+
+def reachable_rules(rules):
+    '''Returns the rules that can fire, in order: those that can match
+    some word and are not shadowed by an earlier one.'''
+    reachable = []
+    for rule in rules:
+        if never_matches(rule.source):
+            continue
+        if [earlier for earlier in reachable if shadows(earlier, rule)]:
+            continue
+        reachable.append(rule)
+    return reachable
+
+
+class SuffixTrie(object):
+    '''Index of words by their reversed characters, so the longest word
+    that is a suffix of a given string is found walking back from its
+    last character, in O(len(word)) no matter how many words are stored.'''
+
+    __slots__ = ('root', 'depth')
+
+    def __init__(self, words = ()):
+        self.root = {}
+        self.depth = 0
+        if isinstance(words, dict):
+            for word in words:
+                self.add(word, words[word])
+        else:
+            for word in words:
+                self.add(word)
+
+    def add(self, word, value = True):
+        '''Stores value for word; the empty string key holds a node value.'''
+        node = self.root
+        for character in reversed(word.lower()):
+            node = node.setdefault(character, {})
+        node[''] = value
+        self.depth = max(self.depth, len(word))
+
+    def longest_suffix(self, word):
+        '''Returns (length, value) for the longest stored word word ends
+        with, or None. word is expected to be lower cased already.'''
+        node = self.root
+        found = None
+        length = 0
+        for index in range(len(word) - 1, max(len(word) - self.depth, 0) - 1, -1):
+            node = node.get(word[index])
+            if node is None:
+                break
+            length += 1
+            if '' in node:
+                found = (length, node[''])
+        return found
+
+    def discard(self, word):
+        '''Removes word, pruning the nodes only it used.'''
+        path = []
+        node = self.root
+        for character in reversed(word.lower()):
+            path.append((node, character))
+            node = node.get(character)
+            if node is None:
+                return
+        node.pop('', None)
+        for parent, character in reversed(path):
+            if parent[character]:
+                break
+            del parent[character]
+
+    def has_suffix(self, word):
+        '''True when word (lower cased) ends with any stored word.'''
+        node = self.root
+        for index in range(len(word) - 1, max(len(word) - self.depth, 0) - 1, -1):
+            node = node.get(word[index])
+            if node is None:
+                return False
+            if '' in node:
+                return True
+        return False
+
+    def freeze(self):
+        return self.root, self.depth
+
+    @classmethod
+    def thaw(cls, state):
+        trie = cls.__new__(cls)
+        trie.root, trie.depth = state
+        return trie
+
+
+def upper(text, capitals = None):
+    '''Returns text upper cased, also for the characters capitals, the
+    translation() of a {character: capital} dict, maps to their capital,
+    which str.upper() does not know in byte strings.'''
+    text = text.upper()
+    if capitals and capitals[2]:
+        return translate(text, capitals)
+    return text
+
+
+def recase(word, lower_cased_word, result, capitals = None):
+    '''Returns result, the inflection of lower_cased_word, cased the way
+    word is: unchanged when word is lower case, with its first letter
+    upper cased when word is Title case, all upper cased when word is
+    UPPER case. For any other mix the characters result keeps from the
+    start and the end of lower_cased_word are taken from word, and the
+    ones in between are upper cased when those they replace are, or
+    capitalized when the first of them is; when they replace none, they
+    are upper cased after a capital.'''
+    if result == lower_cased_word:
+        return word
+    if word == lower_cased_word:
+        return result
+    if word == lower_cased_word[:1].upper() + lower_cased_word[1:]:
+        return upper(result[:1], capitals) + result[1:]
+    if word == lower_cased_word.upper():
+        return upper(result, capitals)
+    if len(word) != len(lower_cased_word):
+        return result
+    kept = 0
+    for character, other in zip(lower_cased_word, result):
+        if character != other:
+            break
+        kept += 1
+    length = min(len(lower_cased_word), len(result)) - kept
+    tail = 0
+    while tail < length and lower_cased_word[-tail - 1] == result[-tail - 1]:
+        tail += 1
+    end = len(word) - tail
+    replaced = word[kept:end] or word[kept - 1:kept]
+    middle = result[kept:len(result) - tail]
+    if replaced != replaced.lower():
+        if replaced == replaced.upper():
+            middle = upper(middle, capitals)
+        elif replaced[:1] != replaced[:1].lower():
+            middle = upper(middle[:1], capitals) + middle[1:]
+    return word[:kept] + middle + word[end:]
+
+
+def mapped_capitals(mappings):
+    '''Returns {character: capital} for the characters mappings translate
+    both cases of a letter to, like "e" and "E" to "\\xe9" and "\\xc9".'''
+    found = {}
+    for mapping in mappings:
+        for character, replacement in mapping.items():
+            lower_cased = character.lower()
+            if lower_cased != character and mapping.get(lower_cased, replacement) != replacement:
+                found[mapping[lower_cased]] = replacement
+    return found
+
+
+def case_flags(source):
+    '''Returns the flags to compile source with for matching lower cased
+    words: re.IGNORECASE when it has upper case letters, which could not
+    match otherwise, and none at all for the usual lower case patterns.'''
+    if source != source.lower():
+        return re.IGNORECASE
+    return 0
+
+
+class Rule(object):
+    '''A single pattern/replacement pair compiled once.
+
+    Locale rules are written with inline "(?i)" flags; they are dropped,
+    as rules only ever see lower cased words, see RuleSet, and patterns
+    are compiled with the case_flags they need to match them.'''
+
+    __slots__ = ('pattern', 'replacement', 'source', 'regex', 'search', 'anchored',
+                 'template', 'single', 'window', 'suffix')
+
+    def __init__(self, pattern, replacement, placeholders = None):
+        self.pattern = pattern
+        self.replacement = replacement
+        self.source = pattern.replace('(?i)', '')
+        self.regex = re.compile(self.source, case_flags(self.source))
+        self.template = parse_template(replacement, self.regex.groups, placeholders)
+        self.single = is_end_anchored(sre_parse.parse(self.source, re.IGNORECASE))
+        self.window = suffix_window(self.source, self.template)
+        self.anchored = is_start_anchored(self.source)
+        self.search = self.regex.match if self.anchored else self.regex.search
+        self.suffix = suffix_sets(self.source)
+
+    def expand(self, match, offset = 0):
+        '''Renders the replacement for match, whose groups for this rule
+        start after group number offset. Groups that did not take part in
+        the match expand to an empty string.'''
+        pieces = []
+        for part in self.template:
+            if part.__class__ is int:
+                pieces.append(match.group(part + offset) or '')
+            elif part.__class__ is tuple:
+                pieces.append(translate(match.group(part[0] + offset) or '', part[1]))
+            else:
+                pieces.append(part)
+        return ''.join(pieces)
+
+    def apply(self, word, match, group = 0):
+        '''Returns word with the rule applied; group is the number of the
+        group holding this rule's match within match.'''
+        if self.single:
+            return word[:match.start(group)] + self.expand(match, group) + word[match.end(group):]
+        return self.regex.sub(self.expand, word)
+
+    def freeze(self):
+        return (self.pattern, self.replacement, self.source, cache.freeze_regex(self.regex),
+                self.template, self.single, self.window, self.anchored, self.suffix)
+
+    @classmethod
+    def thaw(cls, state):
+        rule = cls.__new__(cls)
+        (rule.pattern, rule.replacement, rule.source, regex,
+         rule.template, rule.single, rule.window, rule.anchored, rule.suffix) = state
+        rule.regex = cache.thaw_regex(regex)
+        rule.search = rule.regex.match if rule.anchored else rule.regex.search
+        return rule
+
+
+def _character(code, source):
+    '''Returns the character code stands for in a pattern like source.'''
+    if source.__class__ is bytes:
+        return bytes(bytearray([code]))
+    try:
+        return unichr(code)
+    except NameError:
+        return chr(code)
+
+
+def literal_suffix(source):
+    '''Returns the literal characters a pattern matched with case ends
+    with before "$", which every word it is found in ends with unless it
+    ends with a new line, or None.'''
+    if case_flags(source):
+        return None
+    items = list(sre_parse.parse(source))
+    if not items or items[-1] != (sre_constants.AT, sre_constants.AT_END):
+        return None
+    suffix = []
+    for op, av in reversed(items[:-1]):
+        if op is not sre_constants.LITERAL:
+            break
+        suffix.insert(0, _character(av, source))
+    return suffix and source[:0].join(suffix) or None
+
+
+class Accent(object):
+    '''A stress fix applied to the result of a rule.
+
+    When pattern is found in the result and unless is not found in the
+    original word, the characters of find are swapped for those of
+    replace: within group of the match, rewriting every occurrence of the
+    matched text in the result, or in the whole result when group is
+    None.
+
+    A pattern ending with literal characters, like the "nes$" of the
+    Spanish plurals, is only searched for in the results ending with
+    them.'''
+
+    __slots__ = ('regex', 'unless', 'group', 'table', 'window', 'suffix')
+
+    def __init__(self, pattern, unless, group, find, replace):
+        source = pattern.replace('(?i)', '')
+        unless = unless.replace('(?i)', '')
+        self.regex = re.compile(source, case_flags(source))
+        self.unless = re.compile(unless, case_flags(unless))
+        self.group = group
+        self.table = translation(dict(zip(find, replace)))
+        self.window = suffix_window(source)
+        self.suffix = literal_suffix(source)
+
+    def apply(self, word, result):
+        if self.suffix is not None and not result.endswith(self.suffix) and result[-1:] != '\n':
+            return result
+        if self.window is None:
+            match = self.regex.search(result)
+        else:
+            match = self.regex.search(result, max(0, len(result) - self.window))
+        if not match or self.unless.search(word):
+            return result
+        if self.group is None:
+            return translate(result, self.table)
+        text = match.group(0)
+        start, end = match.span(self.group)
+        start, end = start - match.start(), end - match.start()
+        return result.replace(text, text[:start] + translate(text[start:end], self.table) + text[end:])
+
+    def freeze(self):
+        return (cache.freeze_regex(self.regex), cache.freeze_regex(self.unless),
+                self.group, self.table, self.window, self.suffix)
+
+    @classmethod
+    def thaw(cls, state):
+        accent = cls.__new__(cls)
+        regex, unless, accent.group, accent.table, accent.window, accent.suffix = state
+        accent.regex = cache.thaw_regex(regex)
+        accent.unless = cache.thaw_regex(unless)
+        return accent
+
+
+class Alternation(object):
+    '''Ordered rules folded into one regex of named alternatives,
+    "[\\s\\S]*?(?P<r0>rule0)|[\\s\\S]*?(?P<r1>rule1)|...", run with a
+    single match() per word.
+
+    The lazy prefix makes the engine try every start position for one
+    alternative before moving to the next, so the first rule that matches
+    anywhere wins, exactly as in a linear scan, and lastgroup names it.
+    Rules anchored with "^" can only match at the start and go without
+    the prefix. Rules are split over several regexes when they would
+    exceed the number of groups the re module supports, and wherever
+    rules that fit in the suffix window meet rules that need the whole
+    word.'''
+
+    max_groups = 99
+
+    def __init__(self, rules):
+        self.chunks = []
+        branches = []
+        targets = {}
+        groups = 0
+        windowed = None
+        for index, rule in enumerate(rules):
+            if branches and (groups + 1 + rule.regex.groups > self.max_groups
+                             or windowed != (rule.window is not None)):
+                self._add_chunk(branches, targets, windowed)
+                branches, targets, groups = [], {}, 0
+            windowed = rule.window is not None
+            groups += 1
+            name = 'r%d' % index
+            branches.append(self._branch(name, rule))
+            targets[name] = (rule, groups)
+            groups += rule.regex.groups
+        if branches:
+            self._add_chunk(branches, targets, windowed)
+
+    def _branch(self, name, rule):
+        if rule.anchored:
+            return '(?P<%s>%s)' % (name, rule.source)
+        return '[\\s\\S]*?(?P<%s>%s)' % (name, rule.source)
+
+    def _add_chunk(self, branches, targets, windowed):
+        source = '|'.join(branches)
+        self.chunks.append((re.compile(source, case_flags(source)), targets, windowed))
+
+    def prepend(self, rule):
+        '''Makes rule the first one tried, in a chunk of its own so the
+        chunks already compiled are kept.'''
+        self._add_chunk([self._branch('r0', rule)], {'r0': (rule, 1)}, rule.window is not None)
+        self.chunks.insert(0, self.chunks.pop())
+
+    def search(self, word, tail, cut):
+        '''Returns (rule, match, group, cut) for the first rule matching
+        word, where tail is word[cut:], the part windowed rules look at.'''
+        for regex, targets, windowed in self.chunks:
+            if windowed:
+                match = regex.match(tail)
+            else:
+                match = regex.match(word)
+            if match:
+                rule, group = targets[match.lastgroup]
+                return rule, match, group, cut if windowed else 0
+        return None
+
+    def freeze(self, rules):
+        '''Returns the chunks with each rule given as its index in rules.'''
+        index = dict([(id(rule), position) for position, rule in enumerate(rules)])
+        return tuple([(cache.freeze_regex(regex),
+                       dict([(name, (index[id(rule)], group)) for name, (rule, group) in targets.items()]),
+                       windowed)
+                      for regex, targets, windowed in self.chunks])
+
+    @classmethod
+    def thaw(cls, state, rules):
+        alternation = cls.__new__(cls)
+        alternation.chunks = [(cache.thaw_regex(regex),
+                               dict([(name, (rules[position], group)) for name, (position, group) in targets.items()]),
+                               windowed)
+                              for regex, targets, windowed in state]
+        return alternation
+
+
+class RuleSet(object):
+    '''Uncountable words, irregular words and ordered rules for one
+    direction (pluralize or singularize) of a locale, compiled into
+    tables the add_* methods update in place.
+
+    mode is "linear" to try each rule regex in turn or "alternation" to
+    run them all as a single Alternation. Words found in exact_words are
+    replaced as a whole, and accents are applied in turn to the output of
+    every rule that fires.
+
+    Words are inflected lower cased, and the result is given the case of
+    the word with recase, so "user", "User" and "USER" are inflected, and
+    remembered, once.
+
+    Rules with a suffix_window only ever see the last window characters
+    of a word, so their cost does not grow with the length of the input.
+    In linear mode a word ending with an ASCII character is only tried
+    against the rules whose suffix_sets allow that last character. Rules
+    reachable_rules proves can never fire are left out.
+
+    The results for up to max_results lower cased words of at most
+    max_word_length characters are remembered along with the generation,
+    the number of changes made to the tables, they were computed at, in
+    results for str words and in typed_results for the others, as
+    u"box" == "box" on Python 2 but each gives a result of its own type.'''
+
+    modes = ('linear', 'alternation')
+    max_results = 4096
+    max_word_length = 64
+    # Remembered results older than this many changes are computed again
+    # instead of being checked against every change.
+    max_changes = 16
+
+    def __init__(self, rules, uncountable_words = (), irregular_words = None,
+                 placeholders = None, accents = (), exact_words = None, mode = 'linear'):
+        if mode not in self.modes:
+            raise ValueError('Unknown rule mode %r' % (mode,))
+        self.rules = tuple(reachable_rules([Rule(pattern, replacement, placeholders)
+                                            for pattern, replacement in rules]))
+        self.uncountable_words = SuffixTrie(uncountable_words)
+        self.irregular_words = SuffixTrie(irregular_words or {})
+        self.exact_words = dict([(word.lower(), replacement) for word, replacement in (exact_words or {}).items()])
+        self.accents = tuple([Accent(*accent) for accent in accents])
+        self.mode = mode
+        self.window = max([0] + [rule.window for rule in self.rules if rule.window is not None])
+        self.alternation = Alternation(self.rules) if mode == 'alternation' else None
+        self.dispatch = self._dispatch()
+        self.capitals = self._capitals()
+        self.results = {}
+        self.typed_results = {}
+        self.changes = []
+        self.generation = 0
+
+    def apply(self, word):
+        '''Returns the inflection of word. A result remembered at an older
+        generation is kept unless one of the changes made since then can
+        affect word.'''
+        lower_cased_word = word.lower()
+        if len(lower_cased_word) > self.max_word_length:
+            return recase(word, lower_cased_word, self.inflect_lower(lower_cased_word), self.capitals)
+        results = self.results
+        if word.__class__ is not str:
+            results = self.typed_results.setdefault(word.__class__, {})
+        remembered = results.get(lower_cased_word)
+        if remembered is not None:
+            generation, result = remembered
+            if generation == self.generation:
+                return recase(word, lower_cased_word, result, self.capitals)
+            if self.unaffected(lower_cased_word, generation):
+                results[lower_cased_word] = (self.generation, result)
+                return recase(word, lower_cased_word, result, self.capitals)
+        result = self.inflect_lower(lower_cased_word)
+        if len(results) >= self.max_results:
+            results.clear()
+        results[lower_cased_word] = (self.generation, result)
+        return recase(word, lower_cased_word, result, self.capitals)
+
+    def unaffected(self, lower_cased_word, generation):
+        '''True when no change made after generation can alter the result
+        for lower_cased_word: added rules are tried first, so only a rule
+        that matches it can, and words only affect the words ending with
+        them.'''
+        changes = self.changes[generation:]
+        if len(changes) > self.max_changes:
+            return False
+        for change in changes:
+            if change.__class__ is Rule:
+                if change.regex.search(lower_cased_word):
+                    return False
+            elif lower_cased_word.endswith(change):
+                return False
+        return True
+
+    def inflect(self, word):
+        '''Returns the inflection of word without remembering it.'''
+        lower_cased_word = word.lower()
+        return recase(word, lower_cased_word, self.inflect_lower(lower_cased_word), self.capitals)
+
+    def inflect_lower(self, lower_cased_word):
+        '''Returns the inflection of lower_cased_word, with the words of
+        exact_words and irregular_words in it as they are written.'''
+        if self.uncountable_words.has_suffix(lower_cased_word):
+            return lower_cased_word
+
+        if lower_cased_word in self.exact_words:
+            return self.exact_words[lower_cased_word]
+
+        irregular = self.irregular(lower_cased_word)
+        if irregular is not None:
+            return irregular
+
+        found = self.match_rule(lower_cased_word)
+        if found is None:
+            return lower_cased_word
+        rule, match, group, cut = found
+        if cut:
+            result = lower_cased_word[:cut] + rule.apply(lower_cased_word[cut:], match, group)
+        else:
+            result = rule.apply(lower_cased_word, match, group)
+        for accent in self.accents:
+            result = accent.apply(lower_cased_word, result)
+        return result
+
+    def irregular(self, lower_cased_word):
+        '''Returns lower_cased_word with the longest irregular word it ends
+        with replaced, or None. Like the "$" they were matched with, they
+        are also found before a final new line.'''
+        end = len(lower_cased_word)
+        if lower_cased_word[-1:] == '\n':
+            end -= 1
+        irregular = self.irregular_words.longest_suffix(lower_cased_word[:end])
+        if irregular:
+            return lower_cased_word[:end - irregular[0]] + irregular[1] + lower_cased_word[end:]
+        return None
+
+    def fired_rule(self, word):
+        '''Returns the rule inflect() applies to word, or None when a word
+        list or no rule decides it.'''
+        lower_cased_word = word.lower()
+        if self.uncountable_words.has_suffix(lower_cased_word) or lower_cased_word in self.exact_words \
+                or self.irregular(lower_cased_word) is not None:
+            return None
+        found = self.match_rule(lower_cased_word)
+        return found and found[0]
+
+    def add_uncountable(self, word):
+        '''Leaves word, and the words ending with it, unchanged.'''
+        self.uncountable_words.add(word)
+        self._changed(word.lower())
+
+    def discard_uncountable(self, word):
+        self.uncountable_words.discard(word)
+        self._changed(word.lower())
+
+    def add_irregular(self, word, replacement):
+        '''Replaces word, also at the end of other words, by replacement.'''
+        self.exact_words.pop(word.lower(), None)
+        self.irregular_words.add(word, replacement)
+        self._changed(word.lower())
+
+    def add_rule(self, pattern, replacement, placeholders = None):
+        '''Adds a rule tried before all the others.'''
+        rule = Rule(pattern, replacement, placeholders)
+        self.rules = (rule,) + self.rules
+        if rule.window is not None:
+            self.window = max(self.window, rule.window)
+        if self.alternation is not None:
+            self.alternation.prepend(rule)
+        for character, rules in self.dispatch.items():
+            if rule.suffix[0] is None or character.lower() in rule.suffix[0]:
+                self.dispatch[character] = (rule,) + rules
+        self.capitals = self._capitals()
+        self._changed(rule)
+
+    def _dispatch(self):
+        '''Maps every ASCII character but the new line to the rules, in
+        order, that can match a word ending with it.'''
+        dispatch = {}
+        for code in range(128):
+            character = chr(code)
+            if character != '\n':
+                dispatch[character] = tuple([rule for rule in self.rules
+                                             if rule.suffix[0] is None or character.lower() in rule.suffix[0]])
+        return dispatch
+
+    def _capitals(self):
+        '''Returns the translation() of the mapped_capitals of the accents
+        and placeholders, for recase.'''
+        mappings = [accent.table[2] for accent in self.accents]
+        for rule in self.rules:
+            mappings += [part[1][2] for part in rule.template if part.__class__ is tuple]
+        return translation(mapped_capitals(mappings))
+
+    def _changed(self, change):
+        self.changes.append(change)
+        self.generation = len(self.changes)
+
+    def match_rule(self, word):
+        '''Returns (rule, match, group, cut) for the rule that fires on
+        word, which is lower cased; match was made against word[cut:].'''
+        cut = len(word) - self.window
+        if cut > 0:
+            tail = word[cut:]
+        else:
+            cut = 0
+            tail = word
+        if self.alternation is not None:
+            return self.alternation.search(word, tail, cut)
+        for rule in self.dispatch.get(word[-1:], self.rules):
+            if rule.window is None:
+                match = rule.search(word)
+                if match:
+                    return rule, match, 0, 0
+            else:
+                match = rule.search(tail)
+                if match:
+                    return rule, match, 0, cut
+        return None
+
+    def freeze(self):
+        '''Returns the compiled tables as plain data for the cache module.'''
+        return (self.mode, self.window, tuple([rule.freeze() for rule in self.rules]),
+                self.uncountable_words.freeze(), self.irregular_words.freeze(), self.exact_words,
+                tuple([accent.freeze() for accent in self.accents]),
+                self.alternation and self.alternation.freeze(self.rules))
+
+    @classmethod
+    def thaw(cls, state):
+        '''Returns the RuleSet frozen by freeze() without compiling it again.'''
+        rule_set = cls.__new__(cls)
+        rule_set.mode, rule_set.window, rules, uncountable_words, irregular_words, \
+            rule_set.exact_words, accents, alternation = state
+        rule_set.rules = tuple([Rule.thaw(rule) for rule in rules])
+        rule_set.uncountable_words = SuffixTrie.thaw(uncountable_words)
+        rule_set.irregular_words = SuffixTrie.thaw(irregular_words)
+        rule_set.accents = tuple([Accent.thaw(accent) for accent in accents])
+        rule_set.alternation = alternation and Alternation.thaw(alternation, rule_set.rules)
+        rule_set.dispatch = rule_set._dispatch()
+        rule_set.capitals = rule_set._capitals()
+        rule_set.results = {}
+        rule_set.typed_results = {}
+        rule_set.changes = []
+        rule_set.generation = 0
+        return rule_set
+
+
+def load_rule_set(rules, uncountable_words = (), irregular_words = None,
+                  placeholders = None, accents = (), exact_words = None, mode = 'linear'):
+    '''Returns RuleSet(...) for the arguments, loaded from the on-disk
+    cache when it was compiled before, and stored there otherwise.'''
+    data = (rules, uncountable_words, irregular_words, placeholders, accents, exact_words, mode)
+    try:
+        key = cache.digest('RuleSet', data, cache.source_digest(cache.__file__), cache.source_digest(__file__))
+    except TypeError:
+        return RuleSet(*data)
+    state = cache.load('rules', key)
+    if state is not None:
+        try:
+            return RuleSet.thaw(state)
+        except Exception:
+            pass
+    rule_set = RuleSet(*data)
+    try:
+        cache.store('rules', key, rule_set.freeze())
+    except Exception:
+        pass
+    return rule_set
+
+
+def rule_data(locale, kind):
+    '''Returns the RuleSet arguments locale declares for kind, see
+    compiled_rules.'''
+    return (getattr(locale, kind + '_rules'),
+            getattr(locale, kind + '_uncountable_words', ()),
+            getattr(locale, kind + '_irregular_words', None),
+            getattr(locale, kind + '_placeholders', None),
+            getattr(locale, kind + '_accents', ()),
+            getattr(locale, kind + '_exact_words', None))
+
+
+_compiled = {}
+
+def compiled_rules(locale, kind, mode = None):
+    '''Returns the RuleSet for kind ("plural" or "singular") of a locale
+    class, compiling it the first time it is requested. mode defaults to
+    the rule_mode attribute of the locale.
+
+    This is the loader for the rule data every locale declares as plain
+    class attributes, all but the first optional:
+
+        <kind>_rules              ordered (pattern, replacement) pairs
+        <kind>_uncountable_words  words returned unchanged, also as suffixes
+        <kind>_irregular_words    {word: replacement}, also as suffixes
+        <kind>_exact_words        {word: replacement} for whole words only
+        <kind>_placeholders       {marker: (find, replace)} accent transforms
+                                  for replacements, see parse_template
+        <kind>_accents            (pattern, unless, group, find, replace)
+                                  stress fixes, see Accent
+
+    Compiled rule sets are kept in the on-disk cache, see the cache
+    module, so a new process loads them instead of compiling them.'''
+    mode = mode or getattr(locale, 'rule_mode', 'linear')
+    key = (locale, kind, mode)
+    rule_set = _compiled.get(key)
+    if rule_set is None:
+        rule_set = _compiled[key] = load_rule_set(*rule_data(locale, kind) + (mode,))
+    return rule_set
+
+
+def compiled_acronyms(locale, separators):
+    '''Returns the Acronyms of a locale class, compiled from its acronyms
+    attribute and separators, the pattern of the regex of underscore(),
+    the first time they are requested.'''
+    key = (locale, 'acronyms', None)
+    acronyms = _compiled.get(key)
+    if acronyms is None:
+        acronyms = _compiled[key] = Acronyms(getattr(locale, 'acronyms', None) or (), separators)
+    return acronyms
+
+
+
+_generations = {}
+_owned = set()
+
+def generation(locale):
+    '''Returns the number of runtime changes made to the rules of locale
+    and of the classes it inherits them from.'''
+    return sum([_generations.get(cls, 0) for cls in inspect.getmro(locale)])
+
+
+def _own(locale, name, empty):
+    '''Returns the name attribute of locale as a list or dict of its own,
+    copying inherited or shared data the first time.'''
+    if (locale, name) not in _owned:
+        setattr(locale, name, empty.__class__(getattr(locale, name, None) or empty))
+        _owned.add((locale, name))
+    return getattr(locale, name)
+
+
+def _update(locale, kind, change):
+    '''Applies change to every compiled RuleSet of locale for kind; rule
+    sets of subclasses are dropped, to be compiled again from their data.'''
+    for key in list(_compiled):
+        if key[1] != kind:
+            continue
+        if key[0] is locale:
+            change(_compiled[key])
+        elif issubclass(key[0], locale):
+            del _compiled[key]
+
+
+def add_uncountable(locale, word):
+    '''Makes word uncountable for locale, see CustomRules.'''
+    for kind in ('plural', 'singular'):
+        _own(locale, kind + '_uncountable_words', []).append(word.lower())
+        _update(locale, kind, lambda rule_set: rule_set.add_uncountable(word))
+    _generations[locale] = _generations.get(locale, 0) + 1
+
+
+def add_irregular(locale, singular, plural):
+    '''Adds an irregular word to locale, see CustomRules.'''
+    words = (singular.lower(), plural.lower())
+    for kind, word, replacement in (('plural', singular, plural), ('singular', plural, singular)):
+        uncountable_words = getattr(locale, kind + '_uncountable_words', ())
+        if [uncountable for uncountable in uncountable_words if uncountable.lower() in words]:
+            _own(locale, kind + '_uncountable_words', [])[:] = \
+                [uncountable for uncountable in uncountable_words if uncountable.lower() not in words]
+        if word in (getattr(locale, kind + '_exact_words', None) or {}):
+            del _own(locale, kind + '_exact_words', {})[word]
+        _own(locale, kind + '_irregular_words', {})[word] = replacement
+        def change(rule_set, word = word, replacement = replacement):
+            for uncountable in words:
+                rule_set.discard_uncountable(uncountable)
+            rule_set.add_irregular(word, replacement)
+        _update(locale, kind, change)
+    _generations[locale] = _generations.get(locale, 0) + 1
+
+
+def add_acronym(locale, acronym):
+    '''Adds an acronym to locale, see CustomRules. The rules are left as
+    they are, so the generation of locale is not changed.'''
+    _own(locale, 'acronyms', []).append(acronym)
+    _update(locale, 'acronyms', lambda acronyms: acronyms.add(acronym))
+
+
+def add_rule(locale, kind, pattern, replacement):
+    '''Adds a rule for kind to locale, see CustomRules.'''
+    _own(locale, kind + '_rules', []).insert(0, (pattern, replacement))
+    placeholders = getattr(locale, kind + '_placeholders', None)
+    _update(locale, kind, lambda rule_set: rule_set.add_rule(pattern, replacement, placeholders))
+    _generations[locale] = _generations.get(locale, 0) + 1
+
+
+class CustomRules:
+    '''Runtime additions to the rules of a locale class, affecting every
+    instance of it and of its subclasses.
+
+    The class data is updated along with the RuleSets already compiled
+    from it, which take the new words with a trie insert and the new
+    rules with a single compile; nothing is rebuilt from scratch. Rules
+    added last take precedence over all the others.'''
+
+    @classmethod
+    def add_irregular(cls, singular, plural):
+        '''Pluralizes singular as plural and singularizes plural as
+        singular, also at the end of longer words.'''
+        add_irregular(cls, singular, plural)
+
+    @classmethod
+    def add_uncountable(cls, word):
+        '''Leaves word, and the words ending with it, unchanged.'''
+        add_uncountable(cls, word)
+
+    @classmethod
+    def add_acronym(cls, acronym):
+        '''Keeps acronym, spelled as given, one word in camelize() and
+        underscore(), so "http_server" and "HTTPServer" convert to each
+        other once "HTTP" is added.'''
+        add_acronym(cls, acronym)
+
+    @classmethod
+    def add_plural_rule(cls, pattern, replacement):
+        add_rule(cls, 'plural', pattern, replacement)
+
+    @classmethod
+    def add_singular_rule(cls, pattern, replacement):
+        add_rule(cls, 'singular', pattern, replacement)
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software to deal in this software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of this software, and to permit
+# persons to whom this software is furnished to do so, subject to the following
+# condition:
+#
+# THIS SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THIS SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THIS SOFTWARE.
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# bermi a-t bermilabs - com
+# See the end of this file for the free software, open source license (BSD-style).
+
+'''Precomputed plurals and singulars of a known vocabulary, looked up in
+a memory mapped file instead of running the rules.
+
+build() pluralizes and singularizes every word of a list with a locale
+class and writes a lexicon file; Lexicon opens it with mmap, so the
+pages are shared by every process reading the same file and nothing is
+loaded into Python objects up front.
+
+The file holds, after a header, a minimal perfect hash of the lower
+cased words built with the hash, displace and compress (CHD) method:
+a word falls in bucket crc32(word) % buckets, and the pair of
+displacements stored for the bucket sends it to slot
+
+    (crc32(reversed word) + d0 * (crc32(word) // buckets) + d1) % words
+
+of its own, so a lookup reads two displacements, one record offset and
+the record, whatever the size of the vocabulary. Every record repeats
+its word, so words not in the lexicon are told apart. Results are
+stored for the lower cased word and given the case of the word looked
+up with engine.recase.
+
+    python rules/lexicon.py Rules.English English words.txt english.lexicon
+
+writes the lexicon of a word list with one word per line, which
+
+    Inflector(English, lexicon = 'english.lexicon')
+
+checks before running the rules. A lexicon records the module and name
+of the class it was built from, and an Inflector of any other refuses
+it.'''
+
+import importlib
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+try:
+    from .engine import compiled_rules, recase, translation
+except (ImportError, ValueError):
+    from engine import compiled_rules, recase, translation
+
+MAGIC = b'INFLEXCN'
+VERSION = 1
+
+# magic, version, words, buckets, capitals length, source length,
+# then the offsets of the displacements, record offsets and records.
+_header = struct.Struct('<8sIIIIIIII')
+_displacement = struct.Struct('<II')
+_offset = struct.Struct('<I')
+_record = struct.Struct('<HHH')
+
+# Average number of words per bucket.
+bucket_size = 3
+
+
+def _encode(word, encoding):
+    if isinstance(word, bytes):
+        return word
+    return word.encode(encoding)
+
+
+def _hashes(key, buckets):
+    '''Returns the bucket of key and the two hashes placing it in a slot.'''
+    first = zlib.crc32(key) & 0xffffffff
+    return first % buckets, zlib.crc32(key[::-1]) & 0xffffffff, first // buckets
+
+
+def _slot(hashes, d0, d1, size):
+    return (hashes[1] + d0 * hashes[2] + d1) % size
+
+
+def perfect_hash(keys, buckets):
+    '''Returns the displacements, one (d0, d1) pair per bucket, placing
+    each of keys in a slot of its own, and the key in every slot, or None
+    when two keys of a bucket can not be told apart.'''
+    size = len(keys)
+    grouped = [[] for bucket in range(buckets)]
+    for key in keys:
+        hashes = _hashes(key, buckets)
+        grouped[hashes[0]].append((key, hashes))
+    displacements = [(0, 0)] * buckets
+    slots = [None] * size
+    free = []
+    for bucket in sorted(range(buckets), key = lambda bucket: -len(grouped[bucket])):
+        entries = grouped[bucket]
+        if not entries:
+            break
+        if len(entries) == 1:
+            # Any free slot will do: d0 = 0 leaves d1 to reach it.
+            if not free:
+                free = [slot for slot in range(size) if slots[slot] is None]
+            slot = free.pop()
+            key, hashes = entries[0]
+            displacements[bucket] = (0, (slot - hashes[1]) % size)
+            slots[slot] = key
+            continue
+        attempt = 0
+        while True:
+            d0, d1 = attempt % size, attempt // size
+            if d1 == size:
+                return None
+            taken = []
+            for key, hashes in entries:
+                slot = (hashes[1] + d0 * hashes[2] + d1) % size
+                if slots[slot] is not None or slot in taken:
+                    break
+                taken.append(slot)
+            else:
+                break
+            attempt += 1
+        displacements[bucket] = (d0, d1)
+        for slot, (key, hashes) in zip(taken, entries):
+            slots[slot] = key
+    return displacements, slots
+
+
+def write(filename, entries, capitals = None, source = '', encoding = 'utf-8'):
+    '''Writes the lexicon for entries, a {word: (plural, singular)} dict
+    of lower cased words, to filename. capitals are stored for recase,
+    and source names where the entries came from.'''
+    records = {}
+    for word, (plural, singular) in entries.items():
+        record = [_encode(text, encoding) for text in (word, plural, singular)]
+        if max([len(text) for text in record]) > 0xffff:
+            raise ValueError('%r is too long for a lexicon' % (word,))
+        records[record[0]] = record
+    buckets = max(1, len(records) // bucket_size)
+    placed = perfect_hash(list(records), buckets)
+    while placed is None:
+        # Other buckets give every key other hashes.
+        buckets += 1
+        placed = perfect_hash(list(records), buckets)
+    displacements, slots = placed
+    capitals = capitals or {}
+    lower_cased = b''.join([_encode(character, encoding) for character in sorted(capitals)])
+    upper_cased = b''.join([_encode(capitals[character], encoding) for character in sorted(capitals)])
+    if len(lower_cased) != len(capitals) or len(upper_cased) != len(capitals):
+        # Only single byte characters can be mapped in byte strings.
+        lower_cased = upper_cased = b''
+    source = _encode(source, 'utf-8')
+    start = _header.size + 2 * len(lower_cased) + len(source)
+    offsets = start + _displacement.size * len(displacements)
+    data = offsets + _offset.size * len(slots)
+    chunks = [_displacement.pack(*pair) for pair in displacements]
+    position = data
+    record_chunks = []
+    for key in slots:
+        chunks.append(_offset.pack(position))
+        word, plural, singular = records[key]
+        record_chunks.append(_record.pack(len(word), len(plural), len(singular)) + word + plural + singular)
+        position += len(record_chunks[-1])
+    if position > 0xffffffff:
+        raise ValueError('the lexicon would exceed 4 GB')
+    header = _header.pack(MAGIC, VERSION, len(slots), len(displacements), len(lower_cased),
+                          len(source), start, offsets, data)
+    temporary = '%s.%d.tmp' % (filename, os.getpid())
+    lexicon_file = open(temporary, 'wb')
+    try:
+        lexicon_file.write(header + lower_cased + upper_cased + source)
+        lexicon_file.write(b''.join(chunks))
+        lexicon_file.write(b''.join(record_chunks))
+    finally:
+        lexicon_file.close()
+    os.rename(temporary, filename)
+    return len(slots)
+
+
+def locale_name(locale):
+    '''Returns the name build() records a lexicon of locale, a class,
+    was built from with.'''
+    return '%s.%s' % (locale.__module__, locale.__name__)
+
+
+def build(locale, words, filename, encoding = 'utf-8'):
+    '''Writes the lexicon of locale, a class with pluralize() and
+    singularize(), for words to filename and returns its number of
+    words.'''
+    inflector = locale()
+    entries = {}
+    for word in words:
+        word = word.lower()
+        if word and word not in entries:
+            entries[word] = (inflector.pluralize(word), inflector.singularize(word))
+    capitals = {}
+    for kind in ('plural', 'singular'):
+        if getattr(locale, kind + '_rules', None) is not None:
+            capitals.update(compiled_rules(locale, kind).capitals[2])
+    return write(filename, entries, capitals, locale_name(locale), encoding)
+
+
+class Lexicon(object):
+    '''A lexicon file written by build(), mapped into memory.'''
+
+    def __init__(self, filename, encoding = 'utf-8'):
+        self.filename = filename
+        self.encoding = encoding
+        lexicon_file = open(filename, 'rb')
+        try:
+            self.data = mmap.mmap(lexicon_file.fileno(), 0, access = mmap.ACCESS_READ)
+        finally:
+            lexicon_file.close()
+        magic, version, self.size, self.buckets, capitals, source, \
+            self.displacements, self.offsets, records = _header.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.data.close()
+            raise ValueError('%s is not a version %d lexicon' % (filename, VERSION))
+        start = _header.size
+        lower_cased = self.data[start:start + capitals]
+        upper_cased = self.data[start + capitals:start + 2 * capitals]
+        self.capitals = translation(dict(zip([lower_cased[index:index + 1] for index in range(capitals)],
+                                             [upper_cased[index:index + 1] for index in range(capitals)])))
+        self.source = self.data[start + 2 * capitals:start + 2 * capitals + source].decode('utf-8')
+
+    def check(self, locale):
+        '''Raises ValueError unless the lexicon was built from locale, a
+        class. Lexicons written with no source are taken for any.'''
+        if self.source and self.source != locale_name(locale):
+            raise ValueError('%s was built for %s, not %s' % (self.filename, self.source, locale_name(locale)))
+
+    def __len__(self):
+        return self.size
+
+    def close(self):
+        self.data.close()
+
+    def _lookup(self, key, fields):
+        '''Returns the fields, 1 for the plural and 2 for the singular, of
+        the record of key as bytes, or None.'''
+        if not self.size:
+            return None
+        data = self.data
+        hashes = _hashes(key, self.buckets)
+        d0, d1 = _displacement.unpack_from(data, self.displacements + _displacement.size * hashes[0])
+        offset = _offset.unpack_from(data, self.offsets + _offset.size * _slot(hashes, d0, d1, self.size))[0]
+        lengths = _record.unpack_from(data, offset)
+        start = offset + _record.size
+        if lengths[0] != len(key) or data[start:start + lengths[0]] != key:
+            return None
+        found = []
+        for field in fields:
+            begin = start + sum(lengths[:field])
+            found.append(data[begin:begin + lengths[field]])
+        return found
+
+    def _inflect(self, word, fields):
+        lower_cased_word = word.lower()
+        found = self._lookup(_encode(lower_cased_word, self.encoding), fields)
+        if found is None:
+            return None
+        if isinstance(word, bytes):
+            return [recase(word, lower_cased_word, result, self.capitals) for result in found]
+        return [recase(word, lower_cased_word, result.decode(self.encoding)) for result in found]
+
+    def get(self, word):
+        '''Returns (plural, singular) for word, cased as word is, or None
+        when word is not in the lexicon.'''
+        found = self._inflect(word, (1, 2))
+        return found and tuple(found)
+
+    def pluralize(self, word):
+        '''Returns the plural of word, or None when it is not listed.'''
+        found = self._inflect(word, (1,))
+        return found and found[0]
+
+    def singularize(self, word):
+        '''Returns the singular of word, or None when it is not listed.'''
+        found = self._inflect(word, (2,))
+        return found and found[0]
+
+if __name__ == '__main__':
+    if len(sys.argv) != 5:
+        sys.stderr.write('usage: python rules/lexicon.py <module> <class> <words> <lexicon>\n')
+        sys.exit(2)
+    # The module is named from the root of the package, as the lexicon
+    # records it, not from rules/, where this file is.
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    locale = getattr(importlib.import_module(sys.argv[1]), sys.argv[2])
+    words_file = open(sys.argv[3], 'rb')
+    try:
+        words = [line.strip() for line in words_file]
+    finally:
+        words_file.close()
+    if sys.version_info[0] >= 3:
+        words = [word.decode('utf-8') for word in words]
+    sys.stderr.write('%d words\n' % build(locale, words, sys.argv[4]))
+
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software to deal in this software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of this software, and to permit
+# persons to whom this software is furnished to do so, subject to the following
+# condition:
+#
+# THIS SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THIS SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THIS SOFTWARE.
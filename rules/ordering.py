@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# bermi a-t bermilabs - com
+# See the end of this file for the free software, open source license (BSD-style).
+
+'''Profile-guided ordering of the noun rules of a locale class.
+
+record() counts which rule inflects each word of a corpus, and reorder()
+moves the rules hit most often ahead of the others wherever that can not
+change a result: a rule only passes an earlier one when the two are
+exclusive, when their suffix_sets prove that no word matches both.
+verify() runs both orders over the corpus to check it.
+
+    python rules/ordering.py english English words.txt [profile.txt]
+
+reads a corpus with one word per line, records its profile, writing it
+to profile.txt when given, and prints the reordered rule tables ready to
+replace those of the class.'''
+
+import ast
+
+from engine import compiled_rules, rule_data, RuleSet
+
+kinds = ('plural', 'singular')
+
+
+def record(locale, kind, words, counts = None):
+    '''Returns counts updated with the number of words each rule of
+    locale inflects, keyed by (pattern, replacement).'''
+    if counts is None:
+        counts = {}
+    rule_set = compiled_rules(locale, kind, 'linear')
+    for word in words:
+        rule = rule_set.fired_rule(word)
+        if rule is not None:
+            key = (rule.pattern, rule.replacement)
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def save(profile, filename):
+    '''Writes {kind: counts} to filename, one repr()ed entry per line.'''
+    profile_file = open(filename, 'w')
+    try:
+        for kind in sorted(profile):
+            for (pattern, replacement), count in sorted(profile[kind].items()):
+                profile_file.write(repr((kind, pattern, replacement, count)) + '\n')
+    finally:
+        profile_file.close()
+
+
+def load(filename):
+    '''Reads the {kind: counts} written by save().'''
+    profile = {}
+    profile_file = open(filename)
+    try:
+        for line in profile_file:
+            if line.strip():
+                kind, pattern, replacement, count = ast.literal_eval(line)
+                profile.setdefault(kind, {})[(pattern, replacement)] = count
+    finally:
+        profile_file.close()
+    return profile
+
+
+def exclusive(rule, other):
+    '''True when no word can match both rules.'''
+    if rule.suffix[0] is None or other.suffix[0] is None:
+        return False
+    for characters, other_characters in zip(rule.suffix, other.suffix):
+        if characters is not None and other_characters is not None \
+                and not set(characters) & set(other_characters):
+            return True
+    return False
+
+
+def reorder(rules, counts):
+    '''Returns rules, compiled Rule objects, ordered so the ones with the
+    highest counts come first, without moving a rule ahead of an earlier
+    one it is not exclusive with. Rules that tie keep their order.'''
+    remaining = list(rules)
+    order = []
+    while remaining:
+        ready = [rule for position, rule in enumerate(remaining)
+                 if not [earlier for earlier in remaining[:position] if not exclusive(earlier, rule)]]
+        best = ready[0]
+        for rule in ready[1:]:
+            if counts.get((rule.pattern, rule.replacement), 0) > counts.get((best.pattern, best.replacement), 0):
+                best = rule
+        order.append(best)
+        remaining.remove(best)
+    return order
+
+
+def reordered_rules(locale, kind, counts):
+    '''Returns the <kind>_rules of locale, as (pattern, replacement) pairs,
+    in the order reorder() gives them for counts.'''
+    rules = compiled_rules(locale, kind, 'linear').rules
+    return tuple([(rule.pattern, rule.replacement) for rule in reorder(rules, counts)])
+
+
+def verify(locale, kind, rules, words):
+    '''Returns the words that rules, replacing the <kind>_rules of
+    locale, inflect differently.'''
+    original = RuleSet(*rule_data(locale, kind))
+    reordered = RuleSet(rules, *rule_data(locale, kind)[1:])
+    return [word for word in words if original.inflect(word) != reordered.inflect(word)]
+
+
+def source(kind, rules, counts):
+    '''Returns Python code declaring rules as <kind>_rules.'''
+    width = max([len(repr(pattern)) for pattern, replacement in rules] + [0])
+    lines = ['    %s_rules = (' % kind]
+    for pattern, replacement in rules:
+        lines.append('        (%s %s),  # %d hits' % ((repr(pattern) + ',').ljust(width + 1), repr(replacement),
+                                                  counts.get((pattern, replacement), 0)))
+    lines.append('    )')
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) not in (4, 5):
+        sys.stderr.write('usage: python rules/ordering.py <module> <class> <corpus> [profile]\n')
+        sys.exit(2)
+    locale = getattr(__import__(sys.argv[1]), sys.argv[2])
+    corpus_file = open(sys.argv[3])
+    words = [line.rstrip('\r\n') for line in corpus_file]
+    corpus_file.close()
+    profile = {}
+    failed = False
+    for kind in kinds:
+        counts = profile[kind] = record(locale, kind, words)
+        rules = reordered_rules(locale, kind, counts)
+        sys.stdout.write(source(kind, rules, counts))
+        changed = verify(locale, kind, rules, words)
+        if changed:
+            sys.stderr.write('%s rules change %d words of the corpus, %r first\n' % (kind, len(changed), changed[0]))
+            failed = True
+    if len(sys.argv) == 5:
+        save(profile, sys.argv[4])
+    sys.exit(failed and 1 or 0)
+
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software to deal in this software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of this software, and to permit
+# persons to whom this software is furnished to do so, subject to the following
+# condition:
+#
+# THIS SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THIS SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THIS SOFTWARE.
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# bermi a-t bermilabs - com
+# See the end of this file for the free software, open source license (BSD-style).
+
+'''Chains of inflector methods compiled once into a single function.
+
+    tableize = inflector.pipeline('underscore', 'pluralize')
+    tables = [tableize(name) for name in class_names]
+
+A step is the name of a method, a tuple of the name and the arguments
+following the word, like ('humanize', 'first'), or a function of the
+word. The compound methods, tableize, classify, modulize, titleize,
+demodulize and foreignKey, are expanded into their steps, and runs of
+steps doing redundant work are replaced by one function giving the
+same result:
+
+    underscore  of an underscored word returns it unchanged
+    humanize    of an underscored word needs no regex, as there is no
+                new line left for "_id$" to match before
+    underscore  of that only has to split the digits from the letters
+                title() capitalized after them
+
+Only the methods a class inherits from base are expanded or fused, so
+overriding any of them keeps it in the pipeline as it is.'''
+
+import re
+
+# What demodulize() drops of a module name.
+module_path = re.compile('^.*::')
+# Where underscore() splits a title cased underscored word.
+digit_letter = re.compile('(?<=[0-9])(?=[a-z])')
+
+
+def last_module(word):
+    return module_path.sub('', word)
+
+
+def humanize_underscored(word, uppercase = ''):
+    '''humanize() of a word underscore() returned.'''
+    if word.endswith('_id'):
+        word = word[:-3]
+    if uppercase == 'first':
+        return word.replace('_', ' ').capitalize()
+    return word.replace('_', ' ').title()
+
+
+def underscore_humanized(word, uppercase = ''):
+    '''underscore() of humanize(word, uppercase), word being a word
+    underscore() returned.'''
+    if word.endswith('_id'):
+        word = word[:-3]
+    if uppercase == 'first':
+        return word
+    return digit_letter.sub('_', word)
+
+
+def append(word, tail):
+    return word + tail
+
+
+def _function(cls, name):
+    method = getattr(cls, name, None)
+    return getattr(method, '__func__', method)
+
+
+def inherited(cls, base, name):
+    '''True when cls has the name method of base, not one overriding it.'''
+    return _function(cls, name) is _function(base, name) is not None
+
+
+def _expanded(steps, inherited):
+    '''Returns steps as (name or function, arguments) pairs, with the
+    inherited compound methods replaced by their steps.'''
+    expanded = []
+    for step in steps:
+        if isinstance(step, tuple):
+            name, arguments = step[0], tuple(step[1:])
+        else:
+            name, arguments = step, ()
+        if callable(name) or not inherited(name):
+            expanded.append((name, arguments))
+        elif name == 'tableize':
+            expanded += [('underscore', ()), ('pluralize', ())]
+        elif name in ('classify', 'modulize'):
+            expanded += [('singularize', ()), ('camelize', ())]
+        elif name == 'titleize':
+            # capitalize() and title() give the same of a title cased
+            # word as of the word.
+            expanded += [('underscore', ()), ('humanize', arguments)]
+        elif name == 'demodulize':
+            expanded += [(last_module, ()), ('underscore', ()), ('humanize', ())]
+        elif name == 'foreignKey':
+            if not arguments or arguments[0]:
+                tail = '_id'
+            else:
+                tail = 'id'
+            expanded += _expanded(['demodulize', 'underscore'], inherited) + [(append, (tail,))]
+        else:
+            expanded.append((name, arguments))
+    return expanded
+
+
+def _fused(steps, inherited):
+    '''Returns steps without the redundant ones, see the module
+    docstring.'''
+    fused = []
+    # What the word is known to be before the next step: 'underscored',
+    # 'humanized' from an underscored word, or None.
+    state = None
+    for name, arguments in steps:
+        if name == 'underscore' and inherited(name):
+            if state == 'underscored':
+                continue
+            if state == 'humanized':
+                fused[-1] = (underscore_humanized, fused[-1][1])
+            else:
+                fused.append((name, arguments))
+            state = 'underscored'
+        elif name == 'humanize' and inherited(name) and state == 'underscored':
+            fused.append((humanize_underscored, arguments))
+            state = 'humanized'
+        else:
+            fused.append((name, arguments))
+            state = None
+    return fused
+
+
+def compile_pipeline(inflector, steps, base):
+    '''Returns a function running a word through steps with the methods
+    of inflector, an instance of a subclass of base.'''
+    cls = inflector.__class__
+    inherits = lambda name: inherited(cls, base, name)
+    # The steps are called from one generated function, nesting the calls
+    # instead of looping over them.
+    namespace = {}
+    call = 'word'
+    for index, (name, arguments) in enumerate(_fused(_expanded(steps, inherits), inherits)):
+        if not callable(name):
+            name = getattr(inflector, name)
+        namespace['step%d' % index] = name
+        call = 'step%d(%s' % (index, call)
+        for position, argument in enumerate(arguments):
+            namespace['argument%d_%d' % (index, position)] = argument
+            call += ', argument%d_%d' % (index, position)
+        call += ')'
+    exec(compile('def pipeline(word):\n    return %s\n' % call, '<pipeline>', 'exec'), namespace)
+    return namespace['pipeline']
+
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software to deal in this software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of this software, and to permit
+# persons to whom this software is furnished to do so, subject to the following
+# condition:
+#
+# THIS SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THIS SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THIS SOFTWARE.
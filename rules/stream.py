@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# bermi a-t bermilabs - com
+# See the end of this file for the free software, open source license (BSD-style).
+
+'''underscore() and urlize() of text read in chunks, with bounded memory.
+
+    for piece in inflector.urlize_stream(open('article.txt')):
+        anchor.write(piece)
+
+writes what urlize() returns for the whole text, running the regex of
+underscore() once over every chunk. Only the end of the text read so
+far is held back until the next chunk comes:
+
+    the last character, as a capital before it starts a new word after
+    an acronym only when it is lower case ("HTMLP" + "arser")
+    the separators before it, which become a single underscore however
+    many more the next chunk adds, and of which only one is kept
+    a trailing ":", which may become "/" with the first character of
+    the next chunk
+
+Every other piece of the text is underscored with the character before
+it, which tells whether it starts a new word.'''
+
+# The characters underscore() keeps, every other one being a separator.
+word_characters = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789^/')
+
+
+def read_chunks(source, size = 65536):
+    '''Yields the text of source, a file like object read size characters
+    at a time, or an iterable of strings.'''
+    read = getattr(source, 'read', None)
+    if read is None:
+        for chunk in source:
+            yield chunk
+        return
+    chunk = read(size)
+    while chunk:
+        yield chunk
+        chunk = read(size)
+
+
+def _underscored(separators, context, text):
+    '''Returns underscore() of text but its last character, which is only
+    there for the boundary before it, text coming after context.'''
+    underscored = separators.sub('_', context + text)[len(context):-1]
+    if underscored.endswith('_'):
+        # Put there for a boundary before the last character, which the
+        # next piece starts with.
+        underscored = underscored[:-1]
+    return underscored.lower()
+
+
+def underscored_chunks(chunks, separators, unaccent = None, strip = False):
+    '''Yields the pieces of underscore(''.join(chunks)), separators being
+    the regex underscore() runs, unaccenting every chunk first with
+    unaccent when given. strip drops a leading and a trailing underscore
+    of the whole text, as urlize() does.'''
+    context = buffer = None
+    for chunk in chunks:
+        if unaccent is not None:
+            chunk = unaccent(chunk)
+        if buffer is None:
+            context = buffer = chunk[:0]
+        # Pairs of colons before the end of buffer were all replaced, so
+        # only its last one can pair with the chunk.
+        buffer = (buffer + chunk).replace('::', '/')
+        cut = len(buffer) - 1
+        while cut > 0 and buffer[cut - 1] not in word_characters:
+            cut -= 1
+        if cut > 0:
+            underscored = _underscored(separators, context, buffer[:cut + 1])
+            if strip and not context and underscored.startswith('_'):
+                underscored = underscored[1:]
+            if underscored:
+                yield underscored
+            context, buffer = buffer[cut - 1], buffer[cut:]
+        if len(buffer) > 2:
+            # All separators but the last character, which may be a ":".
+            buffer = buffer[:0] + '_' + buffer[-1:]
+    if buffer:
+        underscored = separators.sub('_', context + buffer)[len(context):].lower()
+        if strip and not context and underscored.startswith('_'):
+            underscored = underscored[1:]
+        if strip and underscored.endswith('_'):
+            underscored = underscored[:-1]
+        if underscored:
+            yield underscored
+
+
+# Copyright (c) 2006 Bermi Ferrer Martinez
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software to deal in this software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of this software, and to permit
+# persons to whom this software is furnished to do so, subject to the following
+# condition:
+#
+# THIS SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THIS SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THIS SOFTWARE.
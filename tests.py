@@ -5,8 +5,23 @@
 #
 # bermi a-t bermilabs - com
 #
+import io
+import marshal
+import os
+import re
+import tempfile
 import unittest
 from inflector import Inflector, English
+from rules.engine import compiled_rules, rule_data, RuleSet
+from rules.compiler import load
+import rules.english
+import rules.spanish
+import rules.ordering
+import rules.analyzer
+import rules.lexicon
+import rules.batch
+from Rules.English import English as LegacyEnglish
+from Inflector import Inflector as LegacyInflector
 
 class EnglishInflectorTestCase(unittest.TestCase):
     singular_to_plural = {
@@ -122,8 +137,351 @@ class EnglishInflectorTestCase(unittest.TestCase):
 
 
 
+class CustomEnglish(rules.english.English):
+    '''Gets runtime rules in RuleEngineTestCase, leaving English as it is.'''
+
+
+class RuleEngineTestCase(unittest.TestCase):
+    prefixes = ['', 'x', 'node_', 'Super', 'OVER']
+
+    def words(self):
+        words = []
+        for singular, plural in EnglishInflectorTestCase.singular_to_plural.items() :
+            for prefix in self.prefixes :
+                words += [prefix + singular, prefix + plural, (prefix + plural).upper()]
+        return words
+
+    def test_alternation_matches_linear_scan(self) :
+        for kind in ('plural', 'singular') :
+            linear = compiled_rules(rules.english.English, kind, 'linear')
+            alternation = compiled_rules(rules.english.English, kind, 'alternation')
+            for word in self.words() :
+                assert alternation.apply(word) == linear.apply(word), \
+                '%s alternation(%s) should produce "%s" and NOT "%s"' % (kind, word, linear.apply(word), alternation.apply(word))
+
+    def test_cached_rule_set_matches_compiled(self) :
+        for kind in ('plural', 'singular') :
+            for mode in RuleSet.modes :
+                compiled = RuleSet(*rule_data(rules.english.English, kind) + (mode,))
+                cached = RuleSet.thaw(marshal.loads(marshal.dumps(compiled.freeze())))
+                for word in self.words() :
+                    assert cached.apply(word) == compiled.apply(word), \
+                    '%s %s cached(%s) should produce "%s" and NOT "%s"' % (kind, mode, word, compiled.apply(word), cached.apply(word))
+
+    def test_custom_rules_match_rebuilt_rule_set(self) :
+        words = self.words() + ['octopus', 'octopodes', 'sheep', 'sheepdogs', 'Acme', 'BigAcmes']
+        rule_sets = [(kind, compiled_rules(CustomEnglish, kind, mode)) for kind in ('plural', 'singular') for mode in RuleSet.modes]
+        # Remember a result for every word before the rules change.
+        for kind, rule_set in rule_sets :
+            for word in words :
+                rule_set.apply(word)
+        CustomEnglish.add_irregular('sheep', 'sheepdogs')
+        CustomEnglish.add_uncountable('acme')
+        CustomEnglish.add_plural_rule('(?i)(octop)us$', '\\1odes')
+        CustomEnglish.add_singular_rule('(?i)(octop)odes$', '\\1us')
+        generated = load(CustomEnglish)()
+        methods = {'plural' : generated.pluralize, 'singular' : generated.singularize}
+        for kind, rule_set in rule_sets :
+            rebuilt = RuleSet(*rule_data(CustomEnglish, kind) + (rule_set.mode,))
+            for word in words :
+                expected = rebuilt.apply(word)
+                assert rule_set.apply(word) == expected and methods[kind](word) == expected, \
+                '%s %s updated(%s) should produce "%s" and NOT "%s"' % (kind, rule_set.mode, word, expected, rule_set.apply(word))
+        assert CustomEnglish().pluralize('octopus') == 'octopodes'
+        assert CustomEnglish().singularize('sheepdogs') == 'sheep'
+        assert rules.english.English().pluralize('octopus') == 'octopi'
+
+    def test_reordered_rules_match_original_order(self) :
+        words = self.words()
+        words += [head[:3] + tail for head in words[:120] for tail in words[:120]]
+        for kind in ('plural', 'singular') :
+            counts = rules.ordering.record(rules.english.English, kind, words)
+            reordered = rules.ordering.reordered_rules(rules.english.English, kind, counts)
+            original = [(rule.pattern, rule.replacement) for rule in compiled_rules(rules.english.English, kind).rules]
+            assert sorted(reordered) == sorted(original)
+            changed = rules.ordering.verify(rules.english.English, kind, reordered, words)
+            assert not changed, 'reordered %s rules should not change "%s"' % (kind, changed[:1])
+
+    def test_pruned_rules_match_every_rule(self) :
+        findings = [(attribute, problem, entry) for attribute, problem, entry, reason in rules.analyzer.analyze(LegacyEnglish)]
+        assert ('singular_rules', 'shadowed', '(?i)ies$') in findings
+        assert ('plural_uncountable_words', 'duplicate', 'species') in findings
+        words = self.words()
+        words += [head[:3] + tail for head in words[:120] for tail in words[:120]]
+        for kind in ('plural', 'singular') :
+            expected = RuleSet(*rule_data(LegacyEnglish, kind))
+            pruned = RuleSet(*rules.analyzer.pruned(LegacyEnglish, kind) + rule_data(LegacyEnglish, kind)[3:])
+            for word in words :
+                assert pruned.apply(word) == expected.apply(word), \
+                'pruned %s(%s) should produce "%s" and NOT "%s"' % (kind, word, expected.apply(word), pruned.apply(word))
+
+    def test_case_variants_share_results(self) :
+        rule_set = RuleSet(*rule_data(rules.english.English, 'plural'))
+        for word, plural in (('user', 'users'), ('User', 'Users'), ('USER', 'USERS'),
+                             ('person', 'people'), ('Person', 'People'), ('PERSON', 'PEOPLE'),
+                             ('SalesPerson', 'SalesPeople'), ('iPhone', 'iPhones')) :
+            assert rule_set.apply(word) == plural, \
+            'pluralize(%s) should produce "%s" and NOT "%s"' % (word, plural, rule_set.apply(word))
+        assert sorted(rule_set.results) == ['iphone', 'person', 'salesperson', 'user']
+        english = rules.english.English()
+        for method, word, expected in (('pluralize', 'Astatus_Code', 'Astatuses_Code'), ('singularize', 'aPEOPLE', 'aPERSON'),
+                                       ('pluralize', 'SalesPERSON', 'SalesPEOPLE'), ('pluralize', 'xMouse', 'xMice'),
+                                       ('singularize', 'HTMLPages', 'HTMLPage'), ('pluralize', 'MyBOX', 'MyBOXES')) :
+            assert getattr(english, method)(word) == expected, \
+            '%s(%s) should produce "%s" and NOT "%s"' % (method, word, expected, getattr(english, method)(word))
+        for word in ('box', u'box', 'Box', u'BOX') :
+            assert type(rule_set.apply(word)) is type(word), \
+            'pluralize(%r) should produce a %s' % (word, type(word).__name__)
+        assert not [rule for rule in rule_set.rules if rule.regex.flags & re.IGNORECASE]
+
+    def test_irregular_words_before_new_line(self) :
+        english = rules.english.English()
+        for method, word, expected in (('singularize', 'amoves\n', 'amove\n'), ('singularize', 'children\n', 'child\n'),
+                                       ('pluralize', 'person\n', 'people\n'), ('pluralize', 'Child\n', 'Children\n'),
+                                       ('pluralize', 'user\n', 'users\n')) :
+            assert getattr(english, method)(word) == expected, \
+            '%s(%r) should produce %r and NOT %r' % (method, word, expected, getattr(english, method)(word))
+
+    def test_lexicon_matches_rules(self) :
+        words = self.words()
+        handle, filename = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            assert rules.lexicon.build(LegacyEnglish, words, filename) == len(set([word.lower() for word in words]))
+            inflector = Inflector(LegacyEnglish, lexicon = filename)
+            english = LegacyEnglish()
+            for word in words :
+                assert inflector.lexicon.get(word) == (english.pluralize(word), english.singularize(word)), \
+                'lexicon(%s) should produce "%s" and NOT "%s"' % (word, english.pluralize(word), inflector.lexicon.get(word))
+            assert inflector.lexicon.get('unlisted') is None
+            assert inflector.pluralize('unlisted') == 'unlisteds'
+            inflector.lexicon.close()
+            self.assertRaises(ValueError, Inflector, rules.english.English, lexicon = filename)
+            self.assertRaises(ValueError, LegacyInflector, rules.spanish.Spanish, lexicon = rules.lexicon.Lexicon(filename))
+            rules.lexicon.write(filename, {'octopus' : ('octopodes', 'octopus')})
+            inflector = Inflector(LegacyEnglish, lexicon = filename)
+            assert inflector.pluralize('Octopus') == 'Octopodes'
+            assert inflector.singularize('OCTOPUS') == 'OCTOPUS'
+            inflector.lexicon.close()
+        finally:
+            os.remove(filename)
+
+    def test_generated_code_matches_rule_set(self) :
+        words = self.words()
+        # Every head of a word followed by every other word.
+        words += [head[:3] + tail for head in words[:120] for tail in words[:120]]
+        original = rules.english.English()
+        generated = load(rules.english.English)()
+        for word in words :
+            for method in ('pluralize', 'singularize') :
+                expected = getattr(original, method)(word)
+                assert getattr(generated, method)(word) == expected, \
+                'generated %s(%s) should produce "%s" and NOT "%s"' % (method, word, expected, getattr(generated, method)(word))
+
+    def test_tenses(self) :
+        english = LegacyEnglish()
+        for tenses in (['walk', 'walked', 'walked', 'walks', 'walking'],
+                       ['be', 'was', 'been', 'is', 'being'],
+                       ['go', 'went', 'gone', 'goes', 'going'],
+                       ['bring', 'brought', 'brought', 'brings', 'bringing'],
+                       ['hear', 'heard', 'heard', 'hears', 'hearing'],
+                       ['prove', 'proved', 'proven', 'proves', 'proving'],
+                       ['strut', 'strutted', 'strutted', 'struts', 'strutting'],
+                       ['Stop', 'Stopped', 'Stopped', 'Stops', 'Stopping']) :
+            assert english.get_all(tenses[0]) == tenses, \
+            'get_all(%s) should produce "%s" and NOT "%s"' % (tenses[0], tenses, english.get_all(tenses[0]))
+            assert [tenses[0]] + [english.get_tense(tenses[0], 1, tense) for tense in range(2, 6)] == tenses
+        assert list(english.conjugate_many(['go', 'hear', 'go'], 2)) == [english.get_all('go'), english.get_all('hear'), english.get_all('go')]
+        for method, word, present in (('from_past', 'went', 'go'), ('from_past', 'brought', 'bring'),
+                                      ('from_past', 'Stopped', 'Stop'), ('from_perfect', 'been', 'be'),
+                                      ('from_perfect', 'strutted', 'strut'), ('from_continuous', 'being', 'be'),
+                                      ('from_continuous', 'stopping', 'stop'), ('from_past', 'taught', 'teach'),
+                                      ('from_past', 'rang', 'ring'), ('from_past', 'Rang', 'Rang'),
+                                      ('from_past', 'walked', 'walk'), ('from_perfect', 'worked', 'work'),
+                                      ('from_continuous', 'walking', 'walk'), ('from_past', 'jumped', 'jump'),
+                                      ('from_past', 'opened', 'open'), ('from_past', 'kissed', 'kiss'),
+                                      ('from_past', 'proved', 'prove'), ('from_continuous', 'hoping', 'hope'),
+                                      ('from_past', 'danced', 'dance'), ('from_continuous', 'agreeing', 'agree'),
+                                      ('from_past', 'heard', 'hear'), ('from_singular', 'hears', 'hear'),
+                                      ('from_past', 'created', 'create'), ('from_perfect', 'created', 'create'),
+                                      ('from_past', 'decided', 'decide'), ('from_perfect', 'decided', 'decide'),
+                                      ('from_past', 'changed', 'change'), ('from_perfect', 'changed', 'change'),
+                                      ('from_past', 'defined', 'define'), ('from_perfect', 'defined', 'define'),
+                                      ('from_past', 'provided', 'provide'), ('from_perfect', 'provided', 'provide')) :
+            assert getattr(english, method)(word) == present, \
+            '%s(%s) should produce "%s" and NOT "%s"' % (method, word, present, getattr(english, method)(word))
+
+    def test_identifiers(self) :
+        english = rules.english.English()
+        for word, underscored, camelized, title in (
+                ('WelcomePage', 'welcome_page', 'WelcomePage', 'Welcome Page'),
+                ('HTMLParser', 'html_parser', 'HTMLParser', 'Html Parser'),
+                ('Admin::UserAccount', 'admin/user_account', 'Admin::UserAccount', 'Admin/User Account'),
+                ('sendEmail2Friends', 'send_email2_friends', 'SendEmail2Friends', 'Send Email2 Friends'),
+                ("who's online", 'who_s_online', 'WhoSOnline', 'Who S Online'),
+                ('user_id', 'user_id', 'UserId', 'User')) :
+            for method, expected in (('underscore', underscored), ('camelize', camelized), ('titleize', title)) :
+                assert getattr(english, method)(word) == expected, \
+                '%s(%s) should produce "%s" and NOT "%s"' % (method, word, expected, getattr(english, method)(word))
+            assert english.titleize(word, 'first') == title.capitalize()
+
+    def test_pipelines(self) :
+        english = rules.english.English()
+        for word in ('BlogPost', 'Admin::UserAccount', 'Post2Comment', 'user_id', 'HTMLParser') :
+            for steps in (('underscore', 'pluralize'), ('foreignKey',), ('demodulize', 'underscore'),
+                          ('underscore', 'underscore', ('humanize', 'first'), 'underscore'), ('titleize', 'camelize')) :
+                expected = word
+                for step in steps :
+                    if isinstance(step, tuple) :
+                        expected = getattr(english, step[0])(expected, *step[1:])
+                    else :
+                        expected = getattr(english, step)(expected)
+                assert english.pipeline(*steps)(word) == expected, \
+                'pipeline%r(%s) should produce "%s" and NOT "%s"' % (steps, word, expected, english.pipeline(*steps)(word))
+        class Shouting(rules.english.English) :
+            def humanize(self, word, uppercase = '') :
+                return word.upper()
+        assert Shouting().pipeline('underscore', 'humanize')('BlogPost') == 'BLOG_POST'
+        assert Shouting().demodulize('Admin::BlogPost') == 'BLOG_POST'
+
+    def test_unaccent(self) :
+        english = rules.english.English()
+        for text, unaccented in ((u'Cr\xe8me Br\xfbl\xe9e', u'Creme Brulee'), (u'\xc6\xde\xdf\xf0\xff', u'ATsey'),
+                                 (u'\xbd \xd7 \xaa', u'\xbd \xd7 \xaa'), (u'\u0141\xf3d\u017a', u'\u0141odz'),
+                                 (u'e\u0301t\xe9 \ufb01n \u01fc', u'ete fin A'), (u'\u304c\ud55c', u'\u304c\ud55c'),
+                                 ('plain', 'plain')) :
+            assert english.unaccent(text) == unaccented, \
+            'unaccent(%r) should produce %r and NOT %r' % (text, unaccented, english.unaccent(text))
+
+    def test_urlize_stream(self) :
+        english = rules.english.English()
+        for chunks in (['HTMLP', 'arser'], ['Admin:', ':User', 'Account'], ['  Caf', '\xe9 ', ' ', ' au', ' Lait! '],
+                       ['a::', ':b'], ['sendE', 'mail2', 'Friends'], ['_'], [], ['', 'x', '']) :
+            text = ''.join(chunks)
+            for method in ('underscore', 'urlize') :
+                streamed = ''.join(getattr(english, method + '_stream')(chunks))
+                assert streamed == getattr(english, method)(text), \
+                '%s_stream(%r) should produce "%s" and NOT "%s"' % (method, chunks, getattr(english, method)(text), streamed)
+        text = 'The HTMLParser of Admin::UserAccount -- ' * 50
+        assert ''.join(english.urlize_stream(io.StringIO(u'' + text), 7)) == english.urlize(text)
+
+    def test_unicode_identifiers(self) :
+        english = rules.english.English()
+        for word, underscored, camelized in ((u'\xdcberName', u'\xfcber_name', u'\xdcberName'),
+                                             (u'\u041f\u0440\u0438\u0432\u0435\u0442\u041c\u0438\u0440',
+                                              u'\u043f\u0440\u0438\u0432\u0435\u0442_\u043c\u0438\u0440',
+                                              u'\u041f\u0440\u0438\u0432\u0435\u0442\u041c\u0438\u0440'),
+                                             (u'\u0391\u0392\u0393\u0394\u03ad\u03bb\u03c4\u03b1',
+                                              u'\u03b1\u03b2\u03b3_\u03b4\u03ad\u03bb\u03c4\u03b1',
+                                              u'\u0391\u0392\u0393\u0394\u03ad\u03bb\u03c4\u03b1'),
+                                             (u'caf\xe9 \xe0 la_carte', u'caf\xe9_\xe0_la_carte', u'Caf\xe9\xc0LaCarte'),
+                                             (u'\u65e5\u672cName', u'\u65e5\u672c_name', u'\u65e5\u672cName'),
+                                             (u'Admin::\xdcberUser', u'admin/\xfcber_user', u'Admin::\xdcberUser'),
+                                             (u'e\u0301B', u'e\u0301_b', u'E\u0301B')) :
+            assert english.underscore_unicode(word) == underscored, \
+            'underscore_unicode(%r) should produce %r and NOT %r' % (word, underscored, english.underscore_unicode(word))
+            assert english.camelize_unicode(word) == camelized, \
+            'camelize_unicode(%r) should produce %r and NOT %r' % (word, camelized, english.camelize_unicode(word))
+        for word in ('HTMLParser', 'Admin::UserAccount', u'sendEmail2Friends', 'node_child') :
+            assert english.underscore_unicode(word) == english.underscore(word)
+            assert english.camelize_unicode(word) == english.camelize(word)
+
+    def test_default_inflector(self) :
+        inflector = LegacyInflector()
+        for method, arguments, expected in (
+                ('camelize', ('send_email',), 'SendEmail'),
+                ('underscore', ('HTMLParser',), 'html_parser'),
+                ('titleize', ('WelcomePage',), 'Welcome Page'),
+                ('tableize', ('Person',), 'people'),
+                ('classify', ('people',), 'Person'),
+                ('foreignKey', ('Admin::User',), 'user_id'),
+                ('camelize_unicode', (u'\xfcber_name',), u'\xdcberName'),
+                ('underscore_unicode', (u'\xdcberName',), u'\xfcber_name'),
+                ('ordinalize_batch', ([1, 2, 11],), ['1st', '2nd', '11th']),
+                ('conditionalPlural_batch', ([1, 2], ['box', 'child']), ['box', 'children'])) :
+            assert getattr(inflector, method)(*arguments) == expected, \
+            '%s%r should produce %r and NOT %r' % (method, arguments, expected, getattr(inflector, method)(*arguments))
+        assert inflector.pipeline('underscore', 'pluralize')('UserAccount') == 'user_accounts'
+        assert ''.join(inflector.urlize_stream(['Hello Wor', 'ld'], 4)) == 'hello_world'
+        assert ''.join(inflector.underscore_stream(['HelloW', 'orld'], 4)) == 'hello_world'
+
+    def test_acronyms(self) :
+        class Acronymic(rules.english.English) :
+            pass
+        english = Acronymic()
+        assert english.camelize('http_server') == 'HttpServer'
+        for acronym in ('HTTP', 'HTTPS', 'OAuth', 'IPv6', 'ID') :
+            Acronymic.add_acronym(acronym)
+        for word, underscored in (('HTTPServer', 'http_server'), ('HTTPSServer', 'https_server'),
+                                  ('OAuthToken', 'oauth_token'), ('IPv6Address', 'ipv6_address'),
+                                  ('UserID', 'user_id'), ('UUIDField', 'uuid_field'),
+                                  ('Admin::HTTPServer', 'admin/http_server'), ('HTMLParser', 'html_parser')) :
+            assert english.underscore(word) == underscored, \
+            'underscore(%s) should produce "%s" and NOT "%s"' % (word, underscored, english.underscore(word))
+        for word, camelized in (('http_server', 'HTTPServer'), ('oauth_token', 'OAuthToken'),
+                                ('ipv6_address', 'IPv6Address'), ('user_id', 'UserID'), ('html_parser', 'HtmlParser')) :
+            assert english.camelize(word) == camelized, \
+            'camelize(%s) should produce "%s" and NOT "%s"' % (word, camelized, english.camelize(word))
+        assert rules.english.English().camelize('http_server') == 'HttpServer'
+        assert rules.english.English().underscore('OAuthToken') == 'o_auth_token'
+
+    def test_batches(self) :
+        english = rules.english.English()
+        numbers = list(range(-250, 250)) + [1001, 1011, 123456789012, 2 ** 63 - 1]
+        assert english.ordinalize_batch(numbers) == [english.ordinalize(number) for number in numbers]
+        counts = [0, 1, 2, 3, 1, 7]
+        words = ['person', 'box', 'box', 'query', 'octopus', 'person']
+        assert english.conditionalPlural_batch(counts, 'item') == [english.conditionalPlural(count, 'item') for count in counts]
+        assert english.conditionalPlural_batch(counts, words) == \
+            [english.conditionalPlural(count, word) for count, word in zip(counts, words)]
+
+    @unittest.skipUnless(rules.batch.numpy, 'NumPy is not installed')
+    def test_array_batches(self) :
+        numpy = rules.batch.numpy
+        english = rules.english.English()
+        for numbers, dtype in ((list(range(-250, 250)) + [1001, 1011, 123456789012], numpy.int64),
+                               ([-2 ** 63, 2 ** 63 - 1, -1, 0], numpy.int64),
+                               ([-128, 127, 11, -11], numpy.int8),
+                               ([0, 1, 12, 2 ** 64 - 1, 2 ** 63], numpy.uint64),
+                               ([True, False], numpy.bool_),
+                               ([3, 12, 2 ** 70], object)) :
+            array = numpy.array(numbers, dtype)
+            assert english.ordinalize_batch(array).tolist() == english.ordinalize_batch(numbers), \
+            'ordinalize_batch(%r) should produce %r and NOT %r' % (array, english.ordinalize_batch(numbers), english.ordinalize_batch(array))
+        grid = numpy.arange(-6, 6).reshape(3, 4) * 7
+        assert english.ordinalize_batch(grid).tolist() == [english.ordinalize_batch(row) for row in grid.tolist()]
+        assert english.ordinalize_batch(numpy.array([True]))[0] == english.ordinalize(True)
+        counts = [0, 1, 2, 3, 1, 7]
+        words = ['person', 'box', 'box', 'query', 'octopus', 'person']
+        assert english.conditionalPlural_batch(numpy.array(counts), 'box').tolist() == english.conditionalPlural_batch(counts, 'box')
+        assert english.conditionalPlural_batch(numpy.array(counts), words).tolist() == english.conditionalPlural_batch(counts, words)
+        assert english.conditionalPlural_batch(numpy.array(counts), numpy.array(words)).tolist() == \
+            english.conditionalPlural_batch(counts, words)
+        assert english.conditionalPlural_batch(numpy.array(counts).reshape(2, 3), numpy.array(words).reshape(2, 3)).tolist() == \
+            [english.conditionalPlural_batch(counts[:3], words[:3]), english.conditionalPlural_batch(counts[3:], words[3:])]
+
+
 InflectorTestSuite = unittest.TestSuite()
 InflectorTestSuite.addTest(EnglishInflectorTestCase("test_pluralize"))
 InflectorTestSuite.addTest(EnglishInflectorTestCase("test_singularize"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_alternation_matches_linear_scan"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_cached_rule_set_matches_compiled"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_custom_rules_match_rebuilt_rule_set"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_reordered_rules_match_original_order"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_pruned_rules_match_every_rule"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_case_variants_share_results"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_irregular_words_before_new_line"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_lexicon_matches_rules"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_generated_code_matches_rule_set"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_tenses"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_identifiers"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_pipelines"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_unaccent"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_urlize_stream"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_unicode_identifiers"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_default_inflector"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_acronyms"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_batches"))
+InflectorTestSuite.addTest(RuleEngineTestCase("test_array_batches"))
 runner = unittest.TextTestRunner()
 runner.run(InflectorTestSuite)
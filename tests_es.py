@@ -8,6 +8,9 @@
 import unittest
 from inflector import Inflector
 from rules.spanish import Spanish
+from rules.engine import compiled_rules, rule_data, translate, translation, Accent, Rule, RuleSet
+import rules.analyzer
+from rules.compiler import load
 
 
 class SpanishInflectorTestCase(unittest.TestCase):
@@ -82,8 +85,98 @@ class SpanishInflectorTestCase(unittest.TestCase):
                     plural, singular, inflector_singularize)
 
 
+class SpanishRuleEngineTestCase(unittest.TestCase):
+    prefixes = ['', 'x', 'super', 'ANTI']
+
+    def words(self):
+        words = []
+        for singular, plural in SpanishInflectorTestCase.singular_to_plural.items():
+            for prefix in self.prefixes:
+                words += [prefix + singular, prefix + plural]
+        return words
+
+    def test_alternation_matches_linear_scan(self):
+        for kind in ('plural', 'singular'):
+            linear = compiled_rules(Spanish, kind, 'linear')
+            alternation = compiled_rules(Spanish, kind, 'alternation')
+            for word in self.words():
+                assert alternation.apply(word) == linear.apply(word), \
+                    '%s alternation(%s) should produce "%s" and NOT "%s"' % (
+                        kind, word, linear.apply(word), alternation.apply(word))
+
+    def test_pruned_rules_match_every_rule(self):
+        findings = [(attribute, problem, entry) for attribute, problem, entry, reason in rules.analyzer.analyze(Spanish)]
+        assert ('singular_rules', 'unreachable', '(?i)(ces)$/i') in findings
+        assert ('singular_irregular_words', 'duplicate', 'r\xe9gimen') in findings
+        words = self.words()
+        words += [head[:3] + tail for head in words[:120] for tail in words[:120]]
+        for kind in ('plural', 'singular'):
+            every_rule = [Rule(pattern, replacement) for pattern, replacement in getattr(Spanish, kind + '_rules')]
+            kept = [rule.pattern for rule in compiled_rules(Spanish, kind).rules]
+            pruned = RuleSet(*rules.analyzer.pruned(Spanish, kind) + rule_data(Spanish, kind)[3:])
+            for word in words:
+                fired = [rule for rule in every_rule if rule.regex.search(word)][:1]
+                assert not fired or fired[0].pattern in kept, \
+                    '%s rule %s fires on "%s" but was pruned' % (kind, fired[0].pattern, word)
+                assert pruned.apply(word) == compiled_rules(Spanish, kind).apply(word), \
+                    'pruned %s(%s) should produce "%s" and NOT "%s"' % (
+                        kind, word, compiled_rules(Spanish, kind).apply(word), pruned.apply(word))
+
+    def test_case_variants_keep_accents(self):
+        for word, plural in (('joven', 'j\xf3venes'), ('Joven', 'J\xf3venes'), ('JOVEN', 'J\xd3VENES')):
+            assert Spanish().pluralize(word) == plural, \
+                'pluralize(%s) should produce "%s" and NOT "%s"' % (word, plural, Spanish().pluralize(word))
+
+    def test_unicode_words_keep_accents(self):
+        for singular, plural in ((u'autobús', u'autobuses'), (u'camión', u'camiones'), (u'inglés', u'ingleses'),
+                                 (u'Camión', u'Camiones'), (u'papá', u'papás')):
+            for method, word, expected in (('pluralize', singular, plural), ('singularize', plural, singular)):
+                inflected = getattr(Spanish(), method)(word)
+                assert inflected == expected and type(inflected) is type(expected), \
+                    '%s(%r) should produce %r and NOT %r' % (method, word, expected, inflected)
+                assert inflected.encode('latin-1') == getattr(Spanish(), method)(word.encode('latin-1'))
+
+    def test_accent_tables_match_character_swaps(self):
+        for marker, (find, replace) in list(Spanish.plural_placeholders.items()) + list(Spanish.singular_placeholders.items()):
+            table = translation(dict(zip(find, replace)))
+            for word in self.words() + [find, replace]:
+                expected = Spanish().string_replace(word, find, replace)
+                assert translate(word, table) == expected, \
+                    'translate(%s) should produce "%s" and NOT "%s"' % (word, expected, translate(word, table))
+
+    def test_accent_suffix_check_matches_search(self):
+        searched = Accent(*Spanish.plural_accents[0])
+        searched.suffix = None
+        accent = Accent(*Spanish.plural_accents[0])
+        assert accent.suffix == 'nes'
+        for word in self.words():
+            for result in (word, word + 'es', word + 'nes', word + 'nes\n'):
+                expected = searched.apply(word, result)
+                assert accent.apply(word, result) == expected, \
+                    'apply(%s, %s) should produce "%s" and NOT "%s"' % (word, result, expected, accent.apply(word, result))
+
+    def test_generated_code_matches_rule_set(self):
+        words = self.words()
+        words += [head[:3] + tail for head in words[:120] for tail in words[:120]]
+        original = Spanish()
+        generated = load(Spanish)()
+        for word in words:
+            for method in ('pluralize', 'singularize'):
+                expected = getattr(original, method)(word)
+                assert getattr(generated, method)(word) == expected, \
+                    'generated %s(%s) should produce "%s" and NOT "%s"' % (
+                        method, word, expected, getattr(generated, method)(word))
+
+
 InflectorTestSuite = unittest.TestSuite()
 InflectorTestSuite.addTest(SpanishInflectorTestCase("test_pluralize"))
 InflectorTestSuite.addTest(SpanishInflectorTestCase("test_singularize"))
+InflectorTestSuite.addTest(SpanishRuleEngineTestCase("test_alternation_matches_linear_scan"))
+InflectorTestSuite.addTest(SpanishRuleEngineTestCase("test_pruned_rules_match_every_rule"))
+InflectorTestSuite.addTest(SpanishRuleEngineTestCase("test_case_variants_keep_accents"))
+InflectorTestSuite.addTest(SpanishRuleEngineTestCase("test_unicode_words_keep_accents"))
+InflectorTestSuite.addTest(SpanishRuleEngineTestCase("test_accent_tables_match_character_swaps"))
+InflectorTestSuite.addTest(SpanishRuleEngineTestCase("test_accent_suffix_check_matches_search"))
+InflectorTestSuite.addTest(SpanishRuleEngineTestCase("test_generated_code_matches_rule_set"))
 runner = unittest.TextTestRunner()
 runner.run(InflectorTestSuite)